@@ -0,0 +1,1143 @@
+# Offline benchmark of the full `root_agent` pipeline
+"""
+Runs a scripted campaign conversation through `root_agent`:
+
+    trend discovery -> research (`combined_research_pipeline`) -> ad copy -> visual concepts
+    -> visual generation -> final report
+
+Gemini, YouTube, BigQuery and Cloud Storage are replaced by local stand-ins. Each
+stand-in call sleeps for a duration drawn from a configurable latency distribution.
+The run reports:
+    *   per-stage wall time, across concurrent sessions
+    *   inclusive wall time per agent and per tool
+    *   event-loop blocking i.e., how late the loop woke a 5ms timer
+    *   peak Python memory (tracemalloc) and process max RSS
+    *   call counts per backend method, and LLM calls/tokens per model
+
+Usage:
+    python -m tests.benchmark --sessions 4 --time-scale 0.1
+    python -m tests.benchmark --latency llm.gemini-2.5-pro=lognormal:8,0.5 --json out.json
+
+Latency specs are "fixed:<s>", "uniform:<low>,<high>" or "lognormal:<median>,<sigma>".
+A key falls back to its dotted prefix e.g., "llm.gemini-2.5-pro" -> "llm".
+"""
+
+import os
+import io
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import datetime
+import resource
+import tempfile
+import functools
+import threading
+import tracemalloc
+import statistics
+import unittest
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Optional
+from unittest import mock
+
+os.environ.setdefault("BUCKET", "gs://benchmark-bucket")
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "benchmark-project")
+os.environ.setdefault("YT_SECRET_MNGR_NAME", "benchmark-secret")
+# sessions are created with their state already initialized; never load a profile
+os.environ.pop("SESSION_STATE_JSON_PATH", None)
+
+import cv2
+import numpy as np
+
+from google.genai import types
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import FunctionTool
+from google.adk.tools.agent_tool import AgentTool
+
+from trends_and_insights_agent.agent import root_agent
+from trends_and_insights_agent.shared_libraries import clients, youtube
+from trends_and_insights_agent.shared_libraries.config import config, setup_config
+from trends_and_insights_agent.shared_libraries.retry import BackoffClient
+from trends_and_insights_agent.common_agents.trend_assistant import (
+    tools as trend_tools,
+)
+from tests.storage import FakeBlob, FakeBucket, FakeStorageClient
+
+
+# ========================
+# latency distributions
+# ========================
+@dataclass(frozen=True)
+class Latency:
+    """A distribution of call latencies, in seconds.
+
+    Attributes:
+        kind (str): "fixed", "uniform" or "lognormal".
+        a (float): the fixed value, the lower bound or the median.
+        b (float): unused, the upper bound or the sigma of the underlying normal.
+    """
+
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """Parses "fixed:0.5", "uniform:0.1,0.3" or "lognormal:1.5,0.4"."""
+        kind, _, params = spec.partition(":")
+        values = [float(v) for v in params.split(",") if v.strip()]
+        if kind not in ("fixed", "uniform", "lognormal") or not values:
+            raise ValueError(f"Invalid latency spec: '{spec}'")
+        return cls(kind, values[0], values[1] if len(values) > 1 else 0.0)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        return self.a
+
+
+# roughly what the live services take; scale them down with `time_scale` for quick runs
+DEFAULT_LATENCIES = {
+    "llm": Latency("lognormal", 1.5, 0.5),
+    "llm.gemini-2.5-pro": Latency("lognormal", 5.0, 0.5),
+    "genai.generate_content": Latency("lognormal", 8.0, 0.4),
+    "genai.generate_images": Latency("lognormal", 6.0, 0.3),
+    "genai.generate_videos": Latency("lognormal", 0.8, 0.3),
+    "genai.operations.get": Latency("lognormal", 0.2, 0.3),
+    # time from submitting a video until its operation reports done
+    "genai.render_video": Latency("lognormal", 45.0, 0.3),
+    "youtube": Latency("lognormal", 0.25, 0.4),
+    "bigquery.get_table": Latency("lognormal", 0.15, 0.3),
+    "bigquery.query": Latency("lognormal", 1.5, 0.4),
+    "gcs.read": Latency("lognormal", 0.08, 0.5),
+    "gcs.write": Latency("lognormal", 0.12, 0.5),
+    "gcs.copy": Latency("lognormal", 0.3, 0.3),
+}
+
+
+class Backends:
+    """Latencies and call counts shared by every stand-in.
+
+    Args:
+        latencies (dict[str, Latency]): distributions keyed by call name, overriding `DEFAULT_LATENCIES`.
+        time_scale (float): multiplies every sampled latency; 0 makes every call instant.
+        seed (int): seeds the latency samples.
+    """
+
+    def __init__(
+        self,
+        latencies: Optional[dict[str, Latency]] = None,
+        time_scale: float = 1.0,
+        seed: int = 0,
+    ):
+        self.latencies = {**DEFAULT_LATENCIES, **(latencies or {})}
+        self.time_scale = time_scale
+        self.calls: Counter = Counter()
+        self.tokens: defaultdict = defaultdict(Counter)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def latency(self, name: str) -> Latency:
+        key = name
+        while key:
+            if key in self.latencies:
+                return self.latencies[key]
+            key = key.rpartition(".")[0]
+        return Latency()
+
+    def delay(self, name: str, count: bool = True) -> float:
+        """Counts a call to `name` and returns how long it should take, in seconds."""
+        with self._lock:
+            if count:
+                self.calls[name] += 1
+            return self.latency(name).sample(self._rng) * self.time_scale
+
+    def wait(self, name: str) -> None:
+        """A blocking call e.g., a synchronous client method."""
+        time.sleep(self.delay(name))
+
+    async def sleep(self, name: str) -> None:
+        """An awaited call e.g., an async client method."""
+        await asyncio.sleep(self.delay(name))
+
+    def count_tokens(self, model: str, prompt: int, output: int) -> None:
+        with self._lock:
+            self.tokens[model]["prompt"] += prompt
+            self.tokens[model]["output"] += output
+
+
+# ========================
+# backend stand-ins
+# ========================
+class _FakeRequest:
+    def __init__(self, backends: Backends, name: str, response: dict):
+        self._backends = backends
+        self._name = name
+        self._response = response
+        self.headers = {}
+
+    def execute(self, http=None, num_retries=0):
+        self._backends.wait(self._name)
+        return self._response
+
+
+def _fake_video(index: int) -> dict:
+    return {
+        "kind": "youtube#video",
+        "id": f"vid{index:05d}",
+        "snippet": {
+            "title": f"Trending video {index}",
+            "description": f"Description of trending video {index}",
+            "channelTitle": f"Channel {index % 7}",
+            "publishedAt": "2025-07-01T00:00:00Z",
+        },
+        "contentDetails": {"duration": f"PT{3 + index % 9}M{index % 60}S"},
+        "statistics": {"viewCount": str(100_000 * (index + 1))},
+    }
+
+
+def _fake_videos_response(max_results: int) -> dict:
+    return {"items": [_fake_video(i) for i in range(max_results)]}
+
+
+def _fake_search_response(max_results: int) -> dict:
+    items = [
+        {
+            "kind": "youtube#searchResult",
+            "id": {"kind": "youtube#video", "videoId": video["id"]},
+            "snippet": video["snippet"],
+        }
+        for video in map(_fake_video, range(max_results))
+    ]
+    return {"items": items}
+
+
+class _FakeVideos:
+    def __init__(self, backends: Backends):
+        self._backends = backends
+
+    def list(self, maxResults: int = 5, **kwargs) -> _FakeRequest:
+        return _FakeRequest(
+            self._backends, "youtube.videos.list", _fake_videos_response(maxResults)
+        )
+
+
+class _FakeSearch:
+    def __init__(self, backends: Backends):
+        self._backends = backends
+
+    def list(self, maxResults: int = 5, **kwargs) -> _FakeRequest:
+        return _FakeRequest(
+            self._backends, "youtube.search.list", _fake_search_response(maxResults)
+        )
+
+
+class FakeYouTube:
+    """Stand-in for the YouTube Data API `Resource`; `execute` blocks like the real client."""
+
+    def __init__(self, backends: Backends):
+        self._backends = backends
+
+    def videos(self) -> _FakeVideos:
+        return _FakeVideos(self._backends)
+
+    def search(self) -> _FakeSearch:
+        return _FakeSearch(self._backends)
+
+
+class FakeAsyncYouTube:
+    """Stand-in for `AsyncYouTubeClient`; requests await their latency."""
+
+    def __init__(self, backends: Backends):
+        self._backends = backends
+
+    async def search_list(self, maxResults: int = 5, **params) -> dict:
+        await self._backends.sleep("youtube.search.list")
+        return _fake_search_response(maxResults)
+
+    async def videos_list(self, etag=None, maxResults: int = 5, **params) -> dict:
+        await self._backends.sleep("youtube.videos.list")
+        return _fake_videos_response(maxResults)
+
+
+GTRENDS_REFRESH_DATE = datetime.date(2025, 7, 15)
+
+
+class FakeBigQuery:
+    """Stand-in for `bigquery.Client` serving the Google Trends `top_terms` table."""
+
+    def __init__(self, backends: Backends, num_terms: int = 25):
+        self._backends = backends
+        self.num_terms = num_terms
+
+    def get_table(self, table: str):
+        self._backends.wait("bigquery.get_table")
+        return SimpleNamespace(
+            modified=datetime.datetime(2025, 7, 15, 6, tzinfo=datetime.timezone.utc)
+        )
+
+    def query_and_wait(self, query: str, job_config=None) -> list:
+        """Returns rows as dicts, which index by column name like `bigquery.Row`."""
+        self._backends.wait("bigquery.query")
+        if "MAX(refresh_date)" in query:
+            return [{"max_date": GTRENDS_REFRESH_DATE}]
+        params = {p.name: p.value for p in job_config.query_parameters}
+        if params["refresh_date"] != GTRENDS_REFRESH_DATE:
+            return []
+        return [
+            {
+                "term": f"term {i + 1}",
+                "refresh_date": GTRENDS_REFRESH_DATE,
+                "x": [{"rank": i, "week": None}],
+            }
+            for i in range(self.num_terms)
+        ]
+
+
+class _TimedBlob(FakeBlob):
+    def __init__(self, backends: Backends, objects: dict, name: str):
+        super().__init__(objects, name)
+        self._backends = backends
+
+    def upload_from_string(self, data, content_type=None):
+        self._backends.wait("gcs.write")
+        super().upload_from_string(data, content_type)
+
+    def upload_from_filename(self, filename):
+        self._backends.wait("gcs.write")
+        super().upload_from_filename(filename)
+
+    def download_as_bytes(self):
+        self._backends.wait("gcs.read")
+        return super().download_as_bytes()
+
+    def download_to_filename(self, filename, start=None, end=None):
+        self._backends.wait("gcs.read")
+        super().download_to_filename(filename, start, end)
+
+
+class _TimedBucket(FakeBucket):
+    def __init__(self, backends: Backends, objects: dict):
+        super().__init__(objects)
+        self._backends = backends
+
+    def blob(self, name: str) -> _TimedBlob:
+        return _TimedBlob(self._backends, self.objects, name)
+
+    def copy_blob(self, blob, destination_bucket, new_name=None):
+        self._backends.wait("gcs.copy")
+        return super().copy_blob(blob, destination_bucket, new_name)
+
+
+class TimedStorageClient(FakeStorageClient):
+    """In-memory Cloud Storage whose blob reads, writes and copies block like the real client."""
+
+    def __init__(self, backends: Backends):
+        super().__init__()
+        self._backends = backends
+
+    def bucket(self, name: str) -> _TimedBucket:
+        return _TimedBucket(self._backends, self.buckets.setdefault(name, {}))
+
+
+def _encode_png(px: int) -> bytes:
+    # noise compresses about as badly as a photo, so the payload is a realistic size
+    pixels = np.random.default_rng(0).integers(0, 255, (px, px, 3), dtype=np.uint8)
+    return cv2.imencode(".png", pixels)[1].tobytes()
+
+
+def _encode_mp4(width: int = 320, height: int = 180, frames: int = 48) -> bytes:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.mp4")
+        writer = cv2.VideoWriter(
+            path, cv2.VideoWriter_fourcc(*"mp4v"), 24, (width, height)
+        )
+        rng = np.random.default_rng(0)
+        for _ in range(frames):
+            writer.write(rng.integers(0, 255, (height, width, 3), dtype=np.uint8))
+        writer.release()
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class _FakeAsyncModels:
+    def __init__(self, genai: "FakeGenai"):
+        self._genai = genai
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        await self._genai.backends.sleep("genai.generate_content")
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part(text=_filler("video analysis", 250))],
+                    )
+                )
+            ]
+        )
+
+    async def generate_images(self, *, model: str, prompt: str, config=None):
+        await self._genai.backends.sleep("genai.generate_images")
+        number_of_images = (config or {}).get("number_of_images", 1)
+        return types.GenerateImagesResponse(
+            generated_images=[
+                types.GeneratedImage(
+                    image=types.Image(
+                        image_bytes=self._genai.png, mime_type="image/png"
+                    )
+                )
+                for _ in range(number_of_images)
+            ]
+        )
+
+    async def generate_videos(
+        self, *, model: str, prompt: str, config=None, image=None
+    ):
+        await self._genai.backends.sleep("genai.generate_videos")
+        name = f"operations/{uuid.uuid4().hex}"
+        render_seconds = self._genai.backends.delay("genai.render_video", count=False)
+        self._genai.renders[name] = (
+            time.monotonic() + render_seconds,
+            config.output_gcs_uri,
+        )
+        return types.GenerateVideosOperation(name=name, done=False)
+
+
+class _FakeOperations:
+    def __init__(self, genai: "FakeGenai"):
+        self._genai = genai
+
+    async def get(self, operation):
+        await self._genai.backends.sleep("genai.operations.get")
+        ready_at, output_gcs_uri = self._genai.renders[operation.name]
+        if time.monotonic() < ready_at:
+            return types.GenerateVideosOperation(name=operation.name, done=False)
+
+        # the render lands in the bucket server-side, so it costs the caller nothing
+        video_name = f"{operation.name.split('/')[-1]}/sample_0.mp4"
+        bucket = output_gcs_uri.replace("gs://", "")
+        self._genai.storage.buckets.setdefault(bucket, {})[video_name] = self._genai.mp4
+        response = types.GenerateVideosResponse(
+            generated_videos=[
+                types.GeneratedVideo(
+                    video=types.Video(
+                        uri=f"{output_gcs_uri}/{video_name}", mime_type="video/mp4"
+                    )
+                )
+            ]
+        )
+        return types.GenerateVideosOperation(
+            name=operation.name, done=True, response=response, result=response
+        )
+
+
+class FakeGenai:
+    """Stand-in for `google.genai.Client`; only the async surface the tools use is implemented.
+
+    Args:
+        backends (Backends): latencies and call counts.
+        storage (TimedStorageClient): where finished video renders are written.
+        image_px (int): side of the square PNG returned for every generated image.
+    """
+
+    def __init__(self, backends: Backends, storage: FakeStorageClient, image_px: int):
+        self.backends = backends
+        self.storage = storage
+        self.png = _encode_png(image_px)
+        self.mp4 = _encode_mp4()
+        self.renders: dict[str, tuple[float, str]] = {}
+        self.models = SimpleNamespace()
+        self.aio = SimpleNamespace(
+            models=_FakeAsyncModels(self), operations=_FakeOperations(self)
+        )
+
+
+# ========================
+# scripted LLM
+# ========================
+_WORDS = (
+    "campaign audience trend pixel camera night sight travel concert music festival "
+    "insight creative video search youtube social engagement brand story moment"
+).split()
+
+
+def _filler(topic: str, num_words: int) -> str:
+    words = [_WORDS[(i * 7 + len(topic)) % len(_WORDS)] for i in range(num_words)]
+    sentences = [" ".join(words[i : i + 12]) for i in range(0, num_words, 12)]
+    return (
+        f"{topic.capitalize()}: " + ". ".join(s.capitalize() for s in sentences) + "."
+    )
+
+
+def _call(name: str, **args) -> types.Part:
+    return types.Part(function_call=types.FunctionCall(name=name, args=args))
+
+
+def _transfer(agent_name: str) -> list[types.Part]:
+    return [_call("transfer_to_agent", agent_name=agent_name)]
+
+
+def _cited_report(num_words: int, num_sources: int) -> str:
+    paragraphs = []
+    for i in range(0, num_words, 60):
+        source = f"src-{i // 60 % num_sources + 1}"
+        paragraphs.append(f'{_filler("finding", 60)} <cite source="{source}"/>')
+    return "# Research Report\n\n" + "\n\n".join(paragraphs)
+
+
+def _grounded(agent_name: str, num_words: int, num_chunks: int = 5) -> LlmResponse:
+    text = _filler(agent_name, num_words)
+    chunks = [
+        types.GroundingChunk(
+            web=types.GroundingChunkWeb(
+                uri=f"https://example.com/{agent_name}/{i}",
+                title=f"{agent_name} source {i}",
+                domain="example.com",
+            )
+        )
+        for i in range(num_chunks)
+    ]
+    supports = [
+        types.GroundingSupport(
+            segment=types.Segment(text=f"{agent_name} claim {i}"),
+            grounding_chunk_indices=[i % num_chunks, (i + 1) % num_chunks],
+            confidence_scores=[0.9 - i * 0.01, 0.6],
+        )
+        for i in range(num_chunks * 2)
+    ]
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        grounding_metadata=types.GroundingMetadata(
+            grounding_chunks=chunks, grounding_supports=supports
+        ),
+    )
+
+
+AD_COPIES = [
+    {
+        "name": f"Ad copy {i}",
+        "headline": f"Headline {i}",
+        "call_to_action": "Shop now",
+        "caption": f"Caption {i}",
+        "body_text": _filler("body", 40),
+        "trend_ref": "term 1",
+        "rationale": _filler("rationale", 20),
+    }
+    for i in range(1, 3)
+]
+
+VISUAL_CONCEPTS = [
+    {
+        "name": name,
+        "type": kind,
+        "trend_ref": "term 1",
+        "headline": f"{name} headline",
+        "call_to_action": "Shop now",
+        "caption": f"{name} caption",
+        "creative_explain": _filler("explain", 20),
+        "rationale": _filler("rationale", 20),
+        "prompt": _filler(f"{name} prompt", 40),
+    }
+    for name, kind in (
+        ("Night Sight Stage", "image"),
+        ("Festival Best Take", "image"),
+        ("Encore Live Translate", "video"),
+    )
+]
+
+
+def _artifact_entry(concept: dict, prompt_key: str) -> dict:
+    suffix = ".mp4" if concept["type"] == "video" else ".png"
+    return {
+        "artifact_key": f"{concept['name'].replace(' ', '_')}_0{suffix}",
+        prompt_key: concept["prompt"],
+        "concept": concept["creative_explain"],
+        "headline": concept["headline"],
+        "caption": concept["caption"],
+        "trend": concept["trend_ref"],
+        "rationale_perf": concept["rationale"],
+        "audience_appeal": _filler("appeal", 20),
+        "markets_product": _filler("markets", 20),
+    }
+
+
+# (stage, user message); every agent's script below is keyed by stage
+CONVERSATION = [
+    (
+        "trend_discovery",
+        "Let's plan a campaign for the Pixel 9 smartphone. Show me today's trends.",
+    ),
+    (
+        "research",
+        "Use the top search trend and the top YouTube video, then research them.",
+    ),
+    ("ad_copy", "Looks good. Draft some ad copy for the campaign."),
+    ("visual_concepts", "I like the first two ad copies; draft visual concepts."),
+    ("visual_generation", "Generate all three visual concepts."),
+    ("final_report", "Save the final report."),
+]
+_STAGE_BY_MESSAGE = {message: stage for stage, message in CONVERSATION}
+
+# agent -> stage -> replies, one per model call in that stage ("*" is any stage e.g., inside an `AgentTool`)
+SCRIPT: dict[str, dict[str, list]] = {
+    "root_agent": {
+        "trend_discovery": [_transfer("trends_and_insights_agent")],
+        "final_report": [
+            [_call("save_creatives_and_research_report")],
+            "The final report is saved.",
+        ],
+    },
+    "trends_and_insights_agent": {
+        "trend_discovery": [
+            [
+                _call("memorize", key="brand", value="Google Pixel"),
+                _call("memorize", key="target_product", value="Pixel 9 smartphone"),
+                _call("memorize", key="target_audience", value=_filler("audience", 30)),
+                _call("memorize", key="key_selling_points", value=_filler("ksp", 60)),
+            ],
+            [
+                _call("get_daily_gtrends", today_date="07/15/2025"),
+                _call("get_youtube_trends", region_code="US", max_results=45),
+            ],
+            "Here are today's Search and YouTube trends.",
+        ],
+        "research": [
+            [
+                _call(
+                    "save_search_trends_to_session_state",
+                    new_trends={
+                        "trend_title": "term 1",
+                        "trend_rank": 1,
+                        "trend_refresh_date": "07/15/2025",
+                    },
+                ),
+                _call(
+                    "save_yt_trends_to_session_state",
+                    selected_trends={
+                        "video_title": "Trending video 0",
+                        "video_duration": "PT3M0S",
+                        "video_url": "https://www.youtube.com/watch?v=vid00000",
+                    },
+                ),
+            ],
+            _transfer("research_orchestrator"),
+        ],
+    },
+    "research_orchestrator": {
+        "research": [
+            [_call("combined_research_pipeline", request="Research the campaign.")],
+            [_call("save_draft_report_artifact")],
+            "The research report is ready.",
+        ],
+        "ad_copy": [_transfer("ad_content_generator_agent")],
+    },
+    "ad_content_generator_agent": {
+        "ad_copy": [
+            [_call("ad_creative_pipeline", request="Draft ad copy.")],
+            "Here are the ad copies.",
+        ],
+        "visual_concepts": [
+            [_call("save_select_ad_copy", select_ad_copy_dict=c) for c in AD_COPIES],
+            [_call("visual_generation_pipeline", request="Draft visual concepts.")],
+            "Here are the visual concepts.",
+        ],
+        "visual_generation": [
+            [
+                _call("save_select_visual_concept", select_vis_concept_dict=c)
+                for c in VISUAL_CONCEPTS
+            ],
+            [_call("visual_generator", request="Generate the selected concepts.")],
+            [
+                (
+                    _call(
+                        "save_vid_artifact_key",
+                        artifact_key_dict=_artifact_entry(c, "vid_prompt"),
+                    )
+                    if c["type"] == "video"
+                    else _call(
+                        "save_img_artifact_key",
+                        artifact_key_dict=_artifact_entry(c, "img_prompt"),
+                    )
+                )
+                for c in VISUAL_CONCEPTS
+            ],
+            "The creatives are generated.",
+        ],
+        "final_report": [_transfer("root_agent")],
+    },
+    "yt_analysis_generator_agent": {
+        "*": [
+            [
+                _call(
+                    "analyze_youtube_videos",
+                    prompt="Summarize this video for a marketer.",
+                    youtube_url="https://www.youtube.com/watch?v=vid00000",
+                )
+            ],
+            _filler("video analysis summary", 200),
+        ]
+    },
+    "yt_web_planner": {"*": [_filler("youtube queries", 80)]},
+    "gs_web_planner": {"*": [_filler("search queries", 80)]},
+    "campaign_web_planner": {"*": [_filler("campaign queries", 80)]},
+    "yt_web_searcher": {"*": [lambda: _grounded("yt_web_searcher", 400)]},
+    "gs_web_searcher": {"*": [lambda: _grounded("gs_web_searcher", 400)]},
+    "campaign_web_searcher": {"*": [lambda: _grounded("campaign_web_searcher", 400)]},
+    "enhanced_combined_searcher": {
+        "*": [lambda: _grounded("enhanced_combined_searcher", 600, num_chunks=8)]
+    },
+    "combined_web_evaluator": {
+        "*": [
+            json.dumps(
+                {
+                    "comment": _filler("evaluation", 60),
+                    "follow_up_queries": [
+                        {"search_query": f"follow up query {i}"} for i in range(5)
+                    ],
+                }
+            )
+        ]
+    },
+    "combined_report_composer": {"*": [lambda: _cited_report(1500, num_sources=20)]},
+    "ad_copy_drafter": {"*": [_filler("ad copy drafts", 500)]},
+    "ad_copy_critic": {"*": [_filler("ad copy critique", 500)]},
+    "visual_concept_drafter": {"*": [_filler("visual concept drafts", 500)]},
+    "visual_concept_critic": {"*": [_filler("visual concept critique", 500)]},
+    "visual_concept_finalizer": {"*": [_filler("final visual concepts", 400)]},
+    "visual_generator": {
+        "*": [[_call("generate_selected_visuals")], "All concepts generated."]
+    },
+}
+
+
+def _request_text(llm_request: LlmRequest) -> int:
+    chars = sum(
+        len(part.text or "")
+        for content in llm_request.contents or []
+        for part in content.parts or []
+    )
+    system_instruction = llm_request.config and llm_request.config.system_instruction
+    if isinstance(system_instruction, str):
+        chars += len(system_instruction)
+    return chars
+
+
+def _script_position(llm_request: LlmRequest) -> tuple[str, int]:
+    # the stage is set by the latest conversation message; the step is how many
+    # times this agent has already answered since
+    step = 0
+    for content in reversed(llm_request.contents or []):
+        if content.role == "model":
+            step += 1
+            continue
+        for part in content.parts or []:
+            if part.text and part.text.strip() in _STAGE_BY_MESSAGE:
+                return _STAGE_BY_MESSAGE[part.text.strip()], step
+    return "*", step
+
+
+class FakeLlm(BaseLlm):
+    """Scripted stand-in for a Gemini model, bound to one agent.
+
+    Keeps the agent's model name, so model-specific behavior (e.g., the `google_search`
+    built-in and the rate limiter's per-model budgets) is unchanged.
+
+    Attributes:
+        agent_name (str): the agent whose replies are read from `SCRIPT`.
+        backends (Backends): latencies and call counts.
+    """
+
+    agent_name: str
+    backends: Any
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await self.backends.sleep(f"llm.{self.model}")
+        stage, step = _script_position(llm_request)
+        replies = SCRIPT.get(self.agent_name, {})
+        replies = replies.get(stage, replies.get("*", []))
+        reply = replies[step] if step < len(replies) else "Done."
+
+        if callable(reply):
+            reply = reply()
+        if isinstance(reply, LlmResponse):
+            response = reply
+        elif isinstance(reply, str):
+            response = LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=reply)])
+            )
+        else:
+            response = LlmResponse(content=types.Content(role="model", parts=reply))
+
+        prompt_tokens = _request_text(llm_request) // 4
+        output_tokens = (
+            sum(len(p.text or "") for p in response.content.parts or []) // 4
+        )
+        self.backends.count_tokens(self.model, prompt_tokens, output_tokens)
+        response.usage_metadata = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+        yield response
+
+
+def _walk_agents(agent: BaseAgent, seen: Optional[set] = None):
+    # every agent in the tree, including those only reachable through an `AgentTool`
+    seen = set() if seen is None else seen
+    if id(agent) in seen:
+        return
+    seen.add(id(agent))
+    yield agent
+    for tool in getattr(agent, "tools", []):
+        if isinstance(tool, AgentTool):
+            yield from _walk_agents(tool.agent, seen)
+    for sub_agent in agent.sub_agents:
+        yield from _walk_agents(sub_agent, seen)
+
+
+# ========================
+# instrumentation
+# ========================
+class Metrics:
+    """Wall times, event-loop lag and backend calls collected during a run."""
+
+    # lag beyond this counts as the event loop being blocked
+    STALL_SECONDS = 0.05
+
+    def __init__(self):
+        self.stages: defaultdict = defaultdict(list)
+        self.agents: defaultdict = defaultdict(list)
+        self.tools: defaultdict = defaultdict(list)
+        self.lags: list[float] = []
+        self.errors: list[str] = []
+
+    def record_lag(self, lag: float) -> None:
+        self.lags.append(lag)
+
+
+async def _monitor_event_loop(metrics: Metrics, interval: float = 0.005) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        metrics.record_lag(max(loop.time() - start - interval, 0.0))
+
+
+@contextmanager
+def _instrumented(metrics: Metrics):
+    """Times every agent run and tool call, process-wide, until the block exits."""
+    run_agent = BaseAgent.run_async
+
+    async def timed_run_async(self, parent_context):
+        start = time.perf_counter()
+        try:
+            async for event in run_agent(self, parent_context):
+                yield event
+        finally:
+            metrics.agents[self.name].append(time.perf_counter() - start)
+
+    def timed_tool(run_tool):
+        @functools.wraps(run_tool)
+        async def run_async(self, *, args, tool_context):
+            start = time.perf_counter()
+            try:
+                return await run_tool(self, args=args, tool_context=tool_context)
+            finally:
+                metrics.tools[self.name].append(time.perf_counter() - start)
+
+        return run_async
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(BaseAgent, "run_async", timed_run_async))
+        for tool_class in (FunctionTool, AgentTool):
+            stack.enter_context(
+                mock.patch.object(
+                    tool_class, "run_async", timed_tool(tool_class.run_async)
+                )
+            )
+        yield
+
+
+@contextmanager
+def _offline(backends: Backends, image_px: int):
+    """Swaps every model and shared client for a stand-in until the block exits."""
+    storage = TimedStorageClient(backends)
+    fakes = {
+        "youtube": FakeYouTube(backends),
+        "youtube_async": FakeAsyncYouTube(backends),
+        "bigquery": FakeBigQuery(backends),
+        "storage": storage,
+        "genai": BackoffClient(FakeGenai(backends, storage, image_px)),
+        "video_analysis_cache": None,
+    }
+    models = []
+    for agent in _walk_agents(root_agent):
+        if isinstance(agent, LlmAgent) and isinstance(agent.model, str):
+            models.append((agent, agent.model))
+            agent.model = FakeLlm(
+                model=agent.model, agent_name=agent.name, backends=backends
+            )
+
+    scale = backends.time_scale
+    try:
+        with mock.patch.multiple(
+            config,
+            video_poll_initial_seconds=config.video_poll_initial_seconds * scale,
+            video_poll_max_seconds=config.video_poll_max_seconds * scale,
+        ):
+            for name, fake in fakes.items():
+                clients.override(name, fake)
+            trend_tools._gtrends_cache.clear()
+            youtube.trending_charts.clear()
+            yield storage
+    finally:
+        for agent, model in models:
+            agent.model = model
+        for name in fakes:
+            clients.reset(name)
+        trend_tools._gtrends_cache.clear()
+        youtube.trending_charts.clear()
+
+
+async def _run_session(runner: InMemoryRunner, index: int, metrics: Metrics) -> str:
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name,
+        user_id=f"user-{index}",
+        state={
+            **json.loads(json.dumps(setup_config.empty_session_state["state"])),
+            setup_config.state_init: True,
+            "gcs_folder": f"benchmark/session_{index}",
+        },
+    )
+    for stage, message in CONVERSATION:
+        start = time.perf_counter()
+        async for event in runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+        ):
+            if event.error_code:
+                metrics.errors.append(
+                    f"{stage}: {event.error_code} {event.error_message}"
+                )
+        metrics.stages[stage].append(time.perf_counter() - start)
+    return session.id
+
+
+def _summary(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(values),
+        "total": sum(values),
+        "mean": statistics.fmean(values),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+        "max": ordered[-1],
+    }
+
+
+async def run_benchmark(
+    sessions: int = 1,
+    time_scale: float = 1.0,
+    latencies: Optional[dict[str, Latency]] = None,
+    seed: int = 0,
+    image_px: int = 512,
+    trace_memory: bool = True,
+) -> dict:
+    """
+    Runs `CONVERSATION` through `root_agent` in `sessions` concurrent sessions, fully offline.
+
+    Args:
+        sessions (int): number of concurrent sessions.
+        time_scale (float): multiplies every backend latency; 0 measures only local work.
+        latencies (Optional[dict[str, Latency]]): overrides for `DEFAULT_LATENCIES`.
+        seed (int): seeds the latency samples.
+        image_px (int): side of the PNG returned for each generated image.
+        trace_memory (bool): track peak Python memory with `tracemalloc` (slows the run).
+
+    Returns:
+        dict: the report; see `format_report`.
+    """
+    backends = Backends(latencies, time_scale=time_scale, seed=seed)
+    metrics = Metrics()
+    with _offline(backends, image_px) as storage, _instrumented(metrics):
+        runner = InMemoryRunner(agent=root_agent, app_name="benchmark")
+        if trace_memory:
+            tracemalloc.start()
+        monitor = asyncio.create_task(_monitor_event_loop(metrics))
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(_run_session(runner, i, metrics) for i in range(sessions))
+            )
+        finally:
+            wall_seconds = time.perf_counter() - start
+            monitor.cancel()
+            peak_bytes = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+            if trace_memory:
+                tracemalloc.stop()
+
+    stalls = [lag for lag in metrics.lags if lag > Metrics.STALL_SECONDS]
+    return {
+        "sessions": sessions,
+        "time_scale": time_scale,
+        "wall_seconds": wall_seconds,
+        "stages": {stage: _summary(metrics.stages[stage]) for stage, _ in CONVERSATION},
+        "agents": {name: _summary(v) for name, v in sorted(metrics.agents.items())},
+        "tools": {name: _summary(v) for name, v in sorted(metrics.tools.items())},
+        "event_loop": {
+            "lag_total_seconds": sum(metrics.lags),
+            "lag_max_seconds": max(metrics.lags, default=0.0),
+            "stalls": len(stalls),
+            "stalled_seconds": sum(stalls),
+        },
+        "memory": {
+            "tracemalloc_peak_mb": peak_bytes / 2**20,
+            # ru_maxrss is in KiB on Linux
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        },
+        "calls": dict(sorted(backends.calls.items())),
+        "tokens": {model: dict(counts) for model, counts in backends.tokens.items()},
+        "gcs_objects": {
+            bucket: len([k for k in objects if k != "__downloads__"])
+            for bucket, objects in storage.buckets.items()
+        },
+        "errors": metrics.errors,
+    }
+
+
+def format_report(report: dict) -> str:
+    """Renders a `run_benchmark` report as plain-text tables."""
+    out = io.StringIO()
+    out.write(
+        f"sessions: {report['sessions']}  time scale: {report['time_scale']}  "
+        f"wall: {report['wall_seconds']:.2f}s\n"
+    )
+
+    def table(title: str, rows: dict) -> None:
+        out.write(
+            f"\n{title:<36}{'n':>6}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}\n"
+        )
+        for name, s in rows.items():
+            if s["count"]:
+                out.write(
+                    f"{name:<36}{s['count']:>6}{s['mean']:>10.3f}{s['p50']:>10.3f}"
+                    f"{s['p95']:>10.3f}{s['max']:>10.3f}\n"
+                )
+
+    table("stage (s)", report["stages"])
+    table("agent, inclusive (s)", report["agents"])
+    table("tool (s)", report["tools"])
+
+    loop = report["event_loop"]
+    out.write(
+        f"\nevent loop: lag total {loop['lag_total_seconds']:.3f}s, "
+        f"max {loop['lag_max_seconds'] * 1000:.1f}ms, "
+        f"{loop['stalls']} stalls > {Metrics.STALL_SECONDS * 1000:.0f}ms "
+        f"({loop['stalled_seconds']:.3f}s)\n"
+    )
+    memory = report["memory"]
+    out.write(
+        f"memory: tracemalloc peak {memory['tracemalloc_peak_mb']:.1f}MB, "
+        f"max RSS {memory['max_rss_mb']:.1f}MB\n"
+    )
+    out.write("\ncalls:\n")
+    for name, count in report["calls"].items():
+        out.write(f"  {name:<34}{count:>6}\n")
+    out.write("\ntokens:\n")
+    for model, counts in report["tokens"].items():
+        out.write(
+            f"  {model:<34}prompt {counts['prompt']:>9}  output {counts['output']:>8}\n"
+        )
+    if report["errors"]:
+        out.write(f"\nerrors ({len(report['errors'])}):\n")
+        for error in report["errors"]:
+            out.write(f"  {error}\n")
+    return out.getvalue()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--time-scale", type=float, default=0.1)
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="NAME=SPEC",
+        help='e.g., "llm=lognormal:1.5,0.5" or "gcs.read=fixed:0.05"',
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--image-px", type=int, default=512)
+    parser.add_argument("--no-tracemalloc", action="store_true")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    latencies = {}
+    for item in args.latency:
+        name, _, spec = item.partition("=")
+        latencies[name] = Latency.parse(spec)
+
+    report = asyncio.run(
+        run_benchmark(
+            sessions=args.sessions,
+            time_scale=args.time_scale,
+            latencies=latencies,
+            seed=args.seed,
+            image_px=args.image_px,
+            trace_memory=not args.no_tracemalloc,
+        )
+    )
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+class Offline_Benchmark(unittest.TestCase):
+
+    def test_full_pipeline_runs_offline(self):
+        report = asyncio.run(
+            run_benchmark(sessions=2, time_scale=0, image_px=64, trace_memory=False)
+        )
+        self.assertEqual(report["errors"], [])
+        for stage, _ in CONVERSATION:
+            self.assertEqual(report["stages"][stage]["count"], 2, stage)
+        self.assertEqual(report["calls"]["genai.generate_images"], 4)
+        self.assertEqual(report["calls"]["genai.generate_videos"], 2)
+        self.assertEqual(
+            report["tools"]["save_creatives_and_research_report"]["count"], 2
+        )
+        # Google Trends results are cached across sessions
+        self.assertEqual(report["calls"]["bigquery.query"], 2)
+
+    def test_latency_specs(self):
+        rng = random.Random(0)
+        self.assertEqual(Latency.parse("fixed:0.5").sample(rng), 0.5)
+        self.assertTrue(0.1 <= Latency.parse("uniform:0.1,0.3").sample(rng) <= 0.3)
+        self.assertGreater(Latency.parse("lognormal:1.5,0.4").sample(rng), 0)
+        with self.assertRaises(ValueError):
+            Latency.parse("normal:1")
+        backends = Backends({"llm": Latency("fixed", 2.0)}, time_scale=0.5)
+        self.assertEqual(backends.delay("llm.gemini-2.5-flash"), 1.0)
+        self.assertEqual(backends.calls["llm.gemini-2.5-flash"], 1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
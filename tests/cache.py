@@ -0,0 +1,167 @@
+# Unit tests for the in-process caches
+import os
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from trends_and_insights_agent import tools
+from trends_and_insights_agent.shared_libraries import clients
+from trends_and_insights_agent.shared_libraries.cache import (
+    TTLCache,
+    ResultCache,
+    ResultCacheBackend,
+    SQLiteBackend,
+    make_cache_key,
+)
+
+
+class TTL_Cache(unittest.TestCase):
+    def test_entry_expires(self):
+        cache = TTLCache(ttl_seconds=0.05)
+        cache.set("key", "value")
+        self.assertEqual(cache.get("key"), "value")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("key"))
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+
+    def test_single_flight(self):
+        cache = TTLCache(ttl_seconds=60)
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(1)
+            return "result"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_compute("key", compute))
+            )
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["result"] * 5)
+
+    def test_errors_are_not_cached(self):
+        cache = TTLCache(ttl_seconds=60)
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            cache.get_or_compute("key", fail)
+        self.assertEqual(cache.get_or_compute("key", lambda: "ok"), "ok")
+
+
+class Result_Cache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "results.sqlite3")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_hit_miss_metrics(self):
+        cache = ResultCache(SQLiteBackend(self.path, max_bytes=1024))
+        key = make_cache_key(youtube_url="https://www.youtube.com/watch?v=abc")
+        self.assertIsNone(cache.get(key))
+        cache.set(key, "analysis")
+        self.assertEqual(cache.get(key), "analysis")
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["writes"], 1)
+
+    def test_persists_across_instances(self):
+        ResultCache(SQLiteBackend(self.path, max_bytes=1024)).set("key", "value")
+        cache = ResultCache(SQLiteBackend(self.path, max_bytes=1024))
+        self.assertEqual(cache.get("key"), "value")
+
+    def test_lru_eviction_by_size(self):
+        backend = SQLiteBackend(self.path, max_bytes=25)
+        cache = ResultCache(backend)
+        cache.set("a", "x" * 10)
+        cache.set("b", "x" * 10)
+        cache.get("a")
+        cache.set("c", "x" * 10)
+
+        self.assertEqual(cache.get("a"), "x" * 10)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(backend.evictions(), 1)
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class GetOnly(ResultCacheBackend):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+
+class ThreadRecordingBackend(ResultCacheBackend):
+    """In-memory backend that records the thread each call runs on."""
+
+    def __init__(self):
+        self.values: dict = {}
+        self.threads: list = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.threads.append(threading.get_ident())
+        self.values[key] = value
+
+
+class Video_Analysis_Cache(unittest.TestCase):
+    def setUp(self):
+        self.backend = ThreadRecordingBackend()
+        clients.override("video_analysis_cache", ResultCache(self.backend))
+        genai = mock.MagicMock()
+        genai.aio.models.generate_content = mock.AsyncMock(
+            return_value=mock.MagicMock(text="analysis")
+        )
+        clients.override("genai", genai)
+        self.genai = genai
+
+    def tearDown(self):
+        clients.reset("video_analysis_cache")
+        clients.reset("genai")
+
+    def test_cache_io_runs_off_the_event_loop(self):
+        url = "https://www.youtube.com/watch?v=abc"
+
+        async def analyze_twice():
+            loop_thread = threading.get_ident()
+            first = await tools.analyze_youtube_videos("summarize", url)
+            second = await tools.analyze_youtube_videos("summarize", url)
+            return loop_thread, first, second
+
+        loop_thread, first, second = asyncio.run(analyze_twice())
+        self.assertEqual((first, second), ("analysis", "analysis"))
+        self.assertEqual(self.genai.aio.models.generate_content.await_count, 1)
+        # miss, store, hit
+        self.assertEqual(len(self.backend.threads), 3)
+        self.assertNotIn(loop_thread, self.backend.threads)
@@ -0,0 +1,36 @@
+# Unit tests for the shared client registry
+import unittest
+
+from trends_and_insights_agent.shared_libraries import clients
+
+
+class Clients(unittest.TestCase):
+    def tearDown(self):
+        clients.reset("test_client")
+
+    def test_client_built_once_on_first_use(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return object()
+
+        clients.register("test_client", factory)
+        self.assertEqual(calls, [])
+
+        first = clients.get("test_client")
+        second = clients.get("test_client")
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_override_and_reset(self):
+        clients.register("test_client", lambda: "real")
+        clients.override("test_client", "fake")
+        self.assertEqual(clients.get("test_client"), "fake")
+
+        clients.reset("test_client")
+        self.assertEqual(clients.get("test_client"), "real")
+
+    def test_unknown_client(self):
+        with self.assertRaises(KeyError):
+            clients.get("not_registered")
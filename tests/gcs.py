@@ -6,7 +6,7 @@ BUCKET = os.environ.get("BUCKET")  # get this after validation
 
 
 # set envs before package imports
-from trends_and_insights_agent.common_agents.ad_content_generator.tools import (
+from trends_and_insights_agent.shared_libraries.utils import (
     download_blob,
     upload_file_to_gcs,
 )
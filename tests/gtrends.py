@@ -0,0 +1,77 @@
+# Unit tests for the Google Search Trends tool
+import datetime
+import unittest
+from types import SimpleNamespace
+
+from trends_and_insights_agent.shared_libraries import clients
+from trends_and_insights_agent.common_agents.trend_assistant import (
+    tools as trend_tools,
+)
+
+REFRESH_DATE = datetime.date(2025, 7, 15)
+
+
+class FakeBigQuery:
+    """Serves `top_terms` rows through `query_and_wait`, recording each query and its parameters."""
+
+    def __init__(self):
+        self.queries: list = []
+
+    def get_table(self, table: str):
+        return SimpleNamespace(modified=datetime.datetime(2025, 7, 15, 6))
+
+    def query_and_wait(self, query: str, job_config=None) -> list:
+        params = {p.name: p for p in job_config.query_parameters} if job_config else {}
+        self.queries.append((query, params))
+        if "MAX(refresh_date)" in query:
+            return [{"max_date": REFRESH_DATE}]
+        return [
+            {"term": term, "refresh_date": params["refresh_date"].value, "x": []}
+            for term in ("pixel 9", "heat wave", "the longest trending term")
+        ]
+
+
+class Daily_Gtrends(unittest.TestCase):
+    def setUp(self):
+        self.bq = FakeBigQuery()
+        clients.override("bigquery", self.bq)
+        trend_tools._gtrends_cache.clear()
+
+    def tearDown(self):
+        clients.reset("bigquery")
+        trend_tools._gtrends_cache.clear()
+
+    def test_markdown_table(self):
+        response = trend_tools.get_daily_gtrends()
+        self.assertEqual(response["status"], "ok")
+        self.assertEqual(
+            response["markdown_table"],
+            "\n".join(
+                [
+                    "|    | term                      |   rank | refresh_date   |",
+                    "|---:|:--------------------------|-------:|:---------------|",
+                    "|  1 | pixel 9                   |      1 | 2025-07-15     |",
+                    "|  2 | heat wave                 |      2 | 2025-07-15     |",
+                    "|  3 | the longest trending term |      3 | 2025-07-15     |",
+                ]
+            ),
+        )
+
+    def test_refresh_date_is_a_query_parameter(self):
+        trend_tools.get_daily_gtrends()
+        query, params = self.bq.queries[-1]
+        self.assertIn("@refresh_date", query)
+        self.assertNotIn("07/15/2025", query)
+        self.assertEqual(params["refresh_date"].type_, "DATE")
+        self.assertEqual(params["refresh_date"].value, REFRESH_DATE)
+
+    def test_results_are_cached_per_refresh_date(self):
+        first = trend_tools.get_daily_gtrends()
+        self.assertEqual(trend_tools.get_daily_gtrends(), first)
+        self.assertEqual(len(self.bq.queries), 2)
+
+    def test_empty_table(self):
+        self.assertEqual(
+            trend_tools._markdown_table(["term", "rank"], []),
+            "|    | term   | rank   |\n|:---|:-------|:-------|",
+        )
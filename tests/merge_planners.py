@@ -0,0 +1,53 @@
+# Unit tests for the deterministic merge of parallel research findings
+import asyncio
+import unittest
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from trends_and_insights_agent.common_agents.staged_researcher.agent import (
+    merge_planners,
+)
+
+
+class Merge_Planners(unittest.TestCase):
+
+    def test_writes_combined_insights_from_state(self):
+        async def run():
+            runner = InMemoryRunner(agent=merge_planners, app_name="test")
+            session = await runner.session_service.create_session(
+                app_name="test",
+                user_id="user",
+                state={
+                    "campaign_web_search_insights": "campaign notes",
+                    "gs_web_search_insights": "search notes",
+                    "yt_web_search_insights": "youtube notes",
+                },
+            )
+            events = [
+                event
+                async for event in runner.run_async(
+                    user_id="user",
+                    session_id=session.id,
+                    new_message=types.Content(
+                        role="user", parts=[types.Part(text="go")]
+                    ),
+                )
+            ]
+            session = await runner.session_service.get_session(
+                app_name="test", user_id="user", session_id=session.id
+            )
+            return events, session.state
+
+        events, state = asyncio.run(run())
+        combined = state["combined_web_search_insights"]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].content.parts[0].text, combined)
+        self.assertTrue(combined.startswith("# Summary of Campaign and Trend Research"))
+        self.assertLess(
+            combined.index("campaign notes"), combined.index("## Search Trend")
+        )
+        self.assertLess(
+            combined.index("search notes"), combined.index("## YouTube Trends Findings")
+        )
+        self.assertIn("youtube notes", combined)
@@ -0,0 +1,71 @@
+# Unit tests for initial-state profile loading
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from trends_and_insights_agent.shared_libraries import callbacks
+from trends_and_insights_agent.shared_libraries.config import config, setup_config
+
+
+def _response(status_code: int, text: str = "", etag: str = None):
+    return SimpleNamespace(
+        status_code=status_code,
+        text=text,
+        headers={"ETag": etag} if etag else {},
+        raise_for_status=lambda: None,
+    )
+
+
+class Profile_Loading(unittest.TestCase):
+
+    def setUp(self):
+        callbacks._remote_profiles.clear()
+        self.addCleanup(callbacks._remote_profiles.clear)
+
+    def test_bundled_profile_is_read_without_network(self):
+        with mock.patch.object(callbacks.requests, "get") as get:
+            profile = callbacks.load_profile("example_state_pixel.json")
+        get.assert_not_called()
+        self.assertIn("state", profile)
+
+    def test_remote_profile_revalidated_with_etag(self):
+        url = f"{callbacks.PROFILE_PATH}/remote.json"
+        responses = [
+            _response(200, '{"state": {"brand": "x"}}', etag='"v1"'),
+            _response(304),
+        ]
+        with mock.patch.object(
+            callbacks.requests, "get", side_effect=responses
+        ) as get, mock.patch.object(config, "profile_cache_ttl_seconds", 0):
+            first = callbacks.load_profile("remote.json")
+            second = callbacks.load_profile("remote.json")
+        self.assertEqual(first, second)
+        self.assertEqual(get.call_args_list[0].args, (url,))
+        self.assertEqual(
+            get.call_args_list[1].kwargs["headers"], {"If-None-Match": '"v1"'}
+        )
+
+    def test_remote_profile_cached_within_ttl(self):
+        with mock.patch.object(
+            callbacks.requests,
+            "get",
+            return_value=_response(200, '{"state": {}}', etag='"v1"'),
+        ) as get:
+            callbacks.load_profile("remote.json")
+            callbacks.load_profile("remote.json")
+        self.assertEqual(get.call_count, 1)
+
+    def test_initialized_session_skips_loading(self):
+        context = SimpleNamespace(state={setup_config.state_init: True})
+        with mock.patch.object(callbacks, "load_profile") as load:
+            asyncio.run(callbacks._load_session_state(context))
+        load.assert_not_called()
+
+    def test_sessions_do_not_share_profile_objects(self):
+        first = SimpleNamespace(state={})
+        second = SimpleNamespace(state={})
+        asyncio.run(callbacks._load_session_state(first))
+        asyncio.run(callbacks._load_session_state(second))
+        first.state["img_artifact_keys"]["img_artifact_keys"].append("a")
+        self.assertEqual(second.state["img_artifact_keys"]["img_artifact_keys"], [])
@@ -0,0 +1,100 @@
+# Unit tests for the process-wide LLM rate limiter
+import os
+import time
+import asyncio
+import tempfile
+import unittest
+
+from trends_and_insights_agent.shared_libraries.rate_limiter import (
+    Budget,
+    LocalQuotaBackend,
+    QuotaBackend,
+    SQLiteQuotaBackend,
+    SlidingWindowLimiter,
+)
+
+
+class Rate_Limiter(unittest.TestCase):
+    def test_limit_per_key(self):
+        limiter = SlidingWindowLimiter(limit=2, window_seconds=60)
+        self.assertEqual(limiter.try_acquire("gemini-2.5-flash"), 0)
+        self.assertEqual(limiter.try_acquire("gemini-2.5-flash"), 0)
+        self.assertGreater(limiter.try_acquire("gemini-2.5-flash"), 0)
+        # other models have their own budget
+        self.assertEqual(limiter.try_acquire("gemini-2.5-pro"), 0)
+
+    def test_acquire_awaits_without_blocking_loop(self):
+        limiter = SlidingWindowLimiter(limit=1, window_seconds=0.2)
+        ticks = []
+
+        async def ticker():
+            for _ in range(4):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.03)
+
+        async def run():
+            await limiter.acquire("model")
+            start = time.monotonic()
+            _, waited = await asyncio.gather(ticker(), limiter.acquire("model"))
+            return start, waited
+
+        start, waited = asyncio.run(run())
+        self.assertGreater(waited, 0)
+        # the ticker kept running while the limiter was waiting
+        self.assertEqual(len(ticks), 4)
+        self.assertLess(ticks[-1] - start, 0.2)
+
+    def test_token_budget(self):
+        limiter = SlidingWindowLimiter(limit=100, window_seconds=60, token_limit=1000)
+        self.assertEqual(limiter.try_acquire("model", tokens=600), 0)
+        self.assertGreater(limiter.try_acquire("model", tokens=600), 0)
+        self.assertEqual(limiter.try_acquire("model", tokens=300), 0)
+
+    def test_oversized_request_allowed_when_window_empty(self):
+        limiter = SlidingWindowLimiter(limit=100, window_seconds=60, token_limit=10)
+        self.assertEqual(limiter.try_acquire("model", tokens=50), 0)
+
+    def test_reservation_is_all_or_nothing(self):
+        backend = LocalQuotaBackend()
+        backend.reserve([Budget("tokens", 10, 10)], window_seconds=60)
+        wait = backend.reserve(
+            [Budget("requests", 5), Budget("tokens", 10, 1)], window_seconds=60
+        )
+        self.assertGreater(wait, 0)
+        # the request budget was not charged for the rejected call
+        for _ in range(5):
+            self.assertEqual(backend.reserve([Budget("requests", 5)], 60), 0)
+
+    def test_backend_must_implement_reserve(self):
+        with self.assertRaises(TypeError):
+            QuotaBackend()
+
+
+class SQLite_Quota_Backend(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "quota.sqlite3")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_budget_shared_between_limiters(self):
+        # two limiters over one file stand in for two processes on a host
+        first = SlidingWindowLimiter(
+            limit=2, window_seconds=60, backend=SQLiteQuotaBackend(self.path)
+        )
+        second = SlidingWindowLimiter(
+            limit=2, window_seconds=60, backend=SQLiteQuotaBackend(self.path)
+        )
+        self.assertEqual(first.try_acquire("model"), 0)
+        self.assertEqual(second.try_acquire("model"), 0)
+        self.assertGreater(first.try_acquire("model"), 0)
+        self.assertGreater(second.try_acquire("model"), 0)
+
+    def test_window_expires(self):
+        limiter = SlidingWindowLimiter(
+            limit=1, window_seconds=0.1, backend=SQLiteQuotaBackend(self.path)
+        )
+        self.assertEqual(limiter.try_acquire("model"), 0)
+        waited = asyncio.run(limiter.acquire("model"))
+        self.assertGreater(waited, 0)
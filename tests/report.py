@@ -0,0 +1,303 @@
+# Unit tests for the final creatives report
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import cv2
+import numpy as np
+from google.adk.artifacts import GcsArtifactService
+
+from trends_and_insights_agent.shared_libraries import clients
+from trends_and_insights_agent.common_agents.ad_content_generator import tools
+from tests.storage import FakeStorageClient
+
+
+def _encode_png() -> bytes:
+    return cv2.imencode(".png", np.full((32, 32, 3), 200, np.uint8))[1].tobytes()
+
+
+def _encode_mp4() -> bytes:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.mp4")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 8, (64, 64))
+        rng = np.random.default_rng(0)
+        for _ in range(16):
+            writer.write(rng.integers(0, 255, (64, 64, 3), dtype=np.uint8))
+        writer.release()
+        with open(path, "rb") as f:
+            return f.read()
+
+
+def _entry(artifact_key: str, prompt_key: str) -> dict:
+    return {
+        "artifact_key": artifact_key,
+        "headline": "headline",
+        "caption": "caption",
+        "trend": "trend",
+        "concept": "concept",
+        "markets_product": "markets",
+        "audience_appeal": "appeal",
+        "rationale_perf": "rationale",
+        prompt_key: "prompt",
+    }
+
+
+class FakeToolContext:
+    def __init__(self, state: dict):
+        self.state = state
+        self.artifacts = {}
+
+    async def save_artifact(self, filename, artifact):
+        self.artifacts[filename] = artifact
+        return 0
+
+
+class Creatives_Report(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = FakeStorageClient()
+        clients.override("storage", self.storage)
+        self.addCleanup(clients.reset, "storage")
+        objects = self.storage.bucket(tools.GCS_BUCKET.replace("gs://", "")).objects
+        self.tool_context = FakeToolContext(
+            {
+                "final_report_with_citations": "# Research",
+                "gcs_folder": "session",
+                "img_artifact_keys": {
+                    "img_artifact_keys": [
+                        _entry(f"img_{i}.png", "img_prompt") for i in range(4)
+                    ]
+                },
+                "vid_artifact_keys": {
+                    "vid_artifact_keys": [
+                        _entry(f"vid_{i}.mp4", "vid_prompt") for i in range(2)
+                    ]
+                },
+            }
+        )
+        for i in range(4):
+            objects[f"session/img_{i}.png"] = _encode_png()
+        for i in range(2):
+            objects[f"session/vid_{i}.mp4"] = _encode_mp4()
+        self.objects = objects
+
+    def test_downloads_creatives_concurrently(self):
+        real_download = tools.download_image_from_gcs
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def slow_download(**kwargs):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.05)
+            try:
+                return real_download(**kwargs)
+            finally:
+                with lock:
+                    state["in_flight"] -= 1
+
+        with mock.patch.object(tools, "download_image_from_gcs", slow_download):
+            response = asyncio.run(
+                tools.save_creatives_and_research_report(self.tool_context)
+            )
+
+        self.assertEqual(response["status"], "ok", response)
+        self.assertGreater(state["peak"], 1)
+        self.assertIn(
+            "final_trends_and_creatives_report.pdf", self.tool_context.artifacts
+        )
+        self.assertIn("session/final_trends_and_creatives_report.pdf", self.objects)
+
+    def test_failed_download_joins_workers_before_cleanup(self):
+        written = []
+
+        def fetch_image(gcs_folder, artifact_key, local_dir):
+            if artifact_key == "img_0.png":
+                raise ValueError("download failed")
+            time.sleep(0.1)
+            path = os.path.join(local_dir, artifact_key)
+            with open(path, "wb") as f:
+                f.write(b"image")
+            written.append(path)
+            return path
+
+        ticks = []
+
+        async def report_with_ticker():
+            async def ticker():
+                while True:
+                    ticks.append(time.monotonic())
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            try:
+                return await tools.save_creatives_and_research_report(
+                    self.tool_context
+                )
+            finally:
+                ticking.cancel()
+
+        with mock.patch.object(tools, "_fetch_report_image", fetch_image):
+            response = asyncio.run(report_with_ticker())
+
+        self.assertEqual(response["status"], "failed", response)
+        self.assertTrue(written)
+        # the event loop kept running while the other downloads finished
+        self.assertGreater(len(ticks), 3)
+        # every worker finished before the scratch dir was removed
+        self.assertFalse(any(os.path.exists(path) for path in written))
+
+    def _fetch_thumbnail(self, artifact_key: str) -> str:
+        tmp = tempfile.mkdtemp()
+        return tools._fetch_video_thumbnail("session", artifact_key, tmp)
+
+    def test_prefers_thumbnail_stored_at_creation(self):
+        self.objects["session/vid_0_thumbnail.png"] = _encode_png()
+        path = self._fetch_thumbnail("vid_0.mp4")
+        self.assertEqual(open(path, "rb").read(), _encode_png())
+        self.assertEqual(
+            [name for name, _ in self.objects["__downloads__"]],
+            ["session/vid_0_thumbnail.png"],
+        )
+
+    def test_reads_leading_bytes_then_whole_video(self):
+        video_size = len(self.objects["session/vid_0.mp4"])
+        with mock.patch.object(tools.config, "video_thumbnail_range_kb", 1):
+            path = self._fetch_thumbnail("vid_0.mp4")
+        self.assertTrue(os.path.exists(path))
+        # cv2's mp4v writer puts the index at the end, so 1 KB is not enough
+        self.assertEqual(
+            [size for _, size in self.objects["__downloads__"]], [1024, video_size]
+        )
+
+    def test_thumbnail_uploaded_next_to_video(self):
+        bucket = self.storage.bucket(tools.GCS_BUCKET.replace("gs://", ""))
+        with tempfile.TemporaryDirectory() as tmp:
+            tools._store_video_thumbnail(
+                bucket.blob("session/vid_0.mp4"),
+                tmp,
+                tools._thumbnail_blob_name("session/vid_0.mp4"),
+            )
+        self.assertIn("session/vid_0_thumbnail.png", self.objects)
+
+    def test_thumbnail_at_creation_never_downloads_whole_video(self):
+        bucket = self.storage.bucket(tools.GCS_BUCKET.replace("gs://", ""))
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(
+            tools.config, "video_thumbnail_range_kb", 1
+        ):
+            stored = tools._store_video_thumbnail(
+                bucket.blob("session/vid_0.mp4"),
+                tmp,
+                tools._thumbnail_blob_name("session/vid_0.mp4"),
+            )
+        self.assertIsNone(stored)
+        self.assertNotIn("session/vid_0_thumbnail.png", self.objects)
+        self.assertEqual(
+            [size for _, size in self.objects["__downloads__"]], [1024]
+        )
+
+
+class InlineOnlyToolContext(FakeToolContext):
+    """Runs with `GcsArtifactService`, which only stores inline data."""
+
+    def __init__(self, state: dict):
+        super().__init__(state)
+        self._invocation_context = SimpleNamespace(
+            artifact_service=object.__new__(GcsArtifactService)
+        )
+
+    async def save_artifact(self, filename, artifact):
+        if artifact.inline_data is None:
+            raise AttributeError("'NoneType' object has no attribute 'data'")
+        return await super().save_artifact(filename, artifact)
+
+
+class NoFileDataToolContext(InlineOnlyToolContext):
+    """An artifact service that is not detected as inline-only."""
+
+    def __init__(self, state: dict):
+        FakeToolContext.__init__(self, state)
+
+
+class Generated_Video(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = FakeStorageClient()
+        clients.override("storage", self.storage)
+        self.addCleanup(clients.reset, "storage")
+        self.objects = self.storage.bucket(
+            tools.GCS_BUCKET.replace("gs://", "")
+        ).objects
+        self.objects["veo/sample_0.mp4"] = _encode_mp4()
+        video = SimpleNamespace(uri=f"{tools.GCS_BUCKET}/veo/sample_0.mp4")
+        self.operation = SimpleNamespace(
+            error=None,
+            response=True,
+            result=SimpleNamespace(generated_videos=[SimpleNamespace(video=video)]),
+        )
+
+    def test_artifact_references_gcs_object(self):
+        tool_context = FakeToolContext({"gcs_folder": "session"})
+        response = asyncio.run(
+            tools._save_generated_video(self.operation, "concept", tool_context)
+        )
+        self.assertEqual(response, {"status": "ok", "artifact_key": "concept_0.mp4"})
+        part = tool_context.artifacts["concept_0.mp4"]
+        self.assertEqual(
+            part.file_data.file_uri, f"{tools.GCS_BUCKET}/veo/sample_0.mp4"
+        )
+        self.assertIsNone(part.inline_data)
+        self.assertIn("session/concept_0.mp4", self.objects)
+        self.assertIn("session/concept_0_thumbnail.png", self.objects)
+
+    def test_inline_only_service_gets_bytes(self):
+        tool_context = InlineOnlyToolContext({"gcs_folder": "session"})
+        asyncio.run(
+            tools._save_generated_video(self.operation, "concept", tool_context)
+        )
+        part = tool_context.artifacts["concept_0.mp4"]
+        # the downloaded bytes are kept as they are, not copied
+        self.assertIs(part.inline_data.data, self.objects["veo/sample_0.mp4"])
+
+    def test_rejected_reference_falls_back_with_warning(self):
+        tool_context = NoFileDataToolContext({"gcs_folder": "session"})
+        with self.assertLogs(level="WARNING"):
+            asyncio.run(
+                tools._save_generated_video(self.operation, "concept", tool_context)
+            )
+        part = tool_context.artifacts["concept_0.mp4"]
+        self.assertEqual(part.inline_data.data, self.objects["veo/sample_0.mp4"])
+
+    def test_storage_mode_from_config(self):
+        tool_context = FakeToolContext({"gcs_folder": "session"})
+        with mock.patch.object(tools.config, "video_artifact_storage", "inline"):
+            asyncio.run(
+                tools._save_generated_video(self.operation, "concept", tool_context)
+            )
+        self.assertIsNotNone(tool_context.artifacts["concept_0.mp4"].inline_data)
+
+    def test_save_errors_are_not_swallowed(self):
+        tool_context = FakeToolContext({"gcs_folder": "session"})
+
+        async def denied(filename, artifact):
+            raise PermissionError("denied")
+
+        tool_context.save_artifact = denied
+        blob = self.storage.bucket("b").blob("veo/sample_0.mp4")
+        blob.download_as_bytes = mock.Mock(side_effect=AssertionError)
+        with self.assertRaises(PermissionError):
+            asyncio.run(
+                tools._save_video_artifact(
+                    tool_context,
+                    "concept_0.mp4",
+                    f"{tools.GCS_BUCKET}/veo/sample_0.mp4",
+                    blob,
+                )
+            )
+        blob.download_as_bytes.assert_not_called()
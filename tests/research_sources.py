@@ -0,0 +1,141 @@
+# Unit tests for research source collection and citation replacement
+import json
+import unittest
+from types import SimpleNamespace
+
+from unittest import mock
+
+from google.genai import types
+
+from trends_and_insights_agent.shared_libraries import callbacks
+from trends_and_insights_agent.shared_libraries.config import config
+
+
+def _grounded_event(claims: list[tuple[str, str, float]]) -> SimpleNamespace:
+    """An event grounded on one web chunk per (url, text_segment, confidence)."""
+    chunks, supports = [], []
+    for idx, (url, text_segment, confidence) in enumerate(claims):
+        chunks.append(
+            types.GroundingChunk(
+                web=types.GroundingChunkWeb(
+                    uri=url, title=f"title of {url}", domain="example.com"
+                )
+            )
+        )
+        supports.append(
+            types.GroundingSupport(
+                segment=types.Segment(text=text_segment),
+                grounding_chunk_indices=[idx],
+                confidence_scores=[confidence],
+            )
+        )
+    return SimpleNamespace(
+        grounding_metadata=types.GroundingMetadata(
+            grounding_chunks=chunks, grounding_supports=supports
+        )
+    )
+
+
+def _callback_context(session_id: str, events: list, state: dict) -> SimpleNamespace:
+    return SimpleNamespace(
+        _invocation_context=SimpleNamespace(
+            session=SimpleNamespace(id=session_id, events=events)
+        ),
+        state=state,
+    )
+
+
+class Collect_Research_Sources(unittest.TestCase):
+
+    def test_only_new_events_are_processed(self):
+        state = {}
+        events = [_grounded_event([("https://a", "claim a", 0.9)])]
+        callbacks.collect_research_sources_callback(
+            _callback_context("s1", events, state)
+        )
+        self.assertEqual(
+            state["sources_event_cursor"], {"session_id": "s1", "index": 1}
+        )
+
+        # a processed event that is seen again must not be re-read
+        events[0] = _grounded_event([("https://stale", "stale", 0.9)])
+        events.append(_grounded_event([("https://b", "claim b", 0.8)]))
+        callbacks.collect_research_sources_callback(
+            _callback_context("s1", events, state)
+        )
+        self.assertEqual(
+            sorted(source["url"] for source in state["sources"].values()),
+            ["https://a", "https://b"],
+        )
+        self.assertEqual(state["sources_event_cursor"]["index"], 2)
+
+    def test_cursor_restarts_in_a_new_session(self):
+        state = {"sources_event_cursor": {"session_id": "parent", "index": 5}}
+        events = [_grounded_event([("https://a", "claim a", 0.9)])]
+        callbacks.collect_research_sources_callback(
+            _callback_context("agent_tool", events, state)
+        )
+        self.assertEqual(state["sources"]["src-1"]["url"], "https://a")
+
+    def test_claims_are_deduplicated(self):
+        state = {}
+        events = [
+            _grounded_event([("https://a", "claim a", 0.6)]),
+            _grounded_event([("https://a", "claim a", 0.9)]),
+        ]
+        # a second session replays the same events
+        for session_id in ("s1", "s2"):
+            callbacks.collect_research_sources_callback(
+                _callback_context(session_id, events, state)
+            )
+        claims = state["sources"]["src-1"]["supported_claims"]
+        self.assertEqual(claims, [{"text_segment": "claim a", "confidence": 0.9}])
+
+
+class Compact_Sources(unittest.TestCase):
+
+    def test_keeps_top_claims_per_source(self):
+        state = {}
+        events = [
+            _grounded_event([("https://a", f"claim {i}", i / 10) for i in range(8)])
+        ]
+        with mock.patch.object(config, "sources_max_claims", 3):
+            callbacks.collect_research_sources_callback(
+                _callback_context("s1", events, state)
+            )
+        claims = state["sources"]["src-1"]["supported_claims"]
+        self.assertEqual([c["confidence"] for c in claims], [0.7, 0.6, 0.5])
+
+    def test_drops_least_confident_claims_to_fit_budget(self):
+        state = {}
+        events = [
+            _grounded_event(
+                [(f"https://{i}", f"{'x' * 400} {i}", (i % 10) / 10) for i in range(10)]
+            )
+        ]
+        with mock.patch.object(config, "sources_state_max_kb", 2):
+            callbacks.collect_research_sources_callback(
+                _callback_context("s1", events, state)
+            )
+        sources = state["sources"]
+        self.assertLessEqual(len(json.dumps(sources)), 2 * 1024)
+        # every source stays citable; only claims are dropped, weakest first
+        self.assertEqual(len(sources), 10)
+        kept = [
+            c["confidence"] for s in sources.values() for c in s["supported_claims"]
+        ]
+        dropped = {i / 10 for i in range(10)} - set(kept)
+        self.assertTrue(kept and dropped and max(dropped) < min(kept))
+
+    def test_citation_replacement_reads_compact_sources(self):
+        state = {}
+        events = [_grounded_event([("https://a", "claim a", 0.9)])]
+        callbacks.collect_research_sources_callback(
+            _callback_context("s1", events, state)
+        )
+        state["combined_final_cited_report"] = 'A claim<cite source="src-1" />.'
+        callbacks.citation_replacement_callback(_callback_context("s1", events, state))
+        self.assertEqual(
+            state["final_report_with_citations"],
+            "A claim [title of https://a](https://a).",
+        )
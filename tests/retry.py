@@ -0,0 +1,92 @@
+# Unit tests for genai retry with backoff
+import asyncio
+import unittest
+from unittest import mock
+
+from google.genai import errors
+
+from trends_and_insights_agent.shared_libraries import clients, retry
+from trends_and_insights_agent.shared_libraries.config import config
+from trends_and_insights_agent.shared_libraries.rate_limiter import (
+    SlidingWindowLimiter,
+)
+
+
+def _quota_error(retry_delay: str = "0.01s") -> errors.APIError:
+    return errors.ClientError(
+        429,
+        {
+            "error": {
+                "code": 429,
+                "status": "RESOURCE_EXHAUSTED",
+                "message": "Quota exceeded",
+                "details": [
+                    {
+                        "@type": "type.googleapis.com/google.rpc.RetryInfo",
+                        "retryDelay": retry_delay,
+                    }
+                ],
+            }
+        },
+    )
+
+
+class _FakeModels:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def generate_images(self, model: str, prompt: str, config=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise _quota_error()
+        return "images"
+
+
+class Backoff(unittest.TestCase):
+    def setUp(self):
+        self.limiter = SlidingWindowLimiter(limit=100, window_seconds=60)
+        clients.override("llm_rate_limiter", self.limiter)
+
+    def tearDown(self):
+        clients.reset("llm_rate_limiter")
+
+    def _client(self, failures: int) -> retry.BackoffClient:
+        fake = mock.MagicMock()
+        fake.aio.models = _FakeModels(failures)
+        return retry.BackoffClient(fake)
+
+    def test_retry_after_hint(self):
+        self.assertAlmostEqual(retry.retry_after_seconds(_quota_error("30s")), 30)
+
+    def test_retries_then_succeeds_and_adjusts_limiter(self):
+        client = self._client(failures=2)
+        result = asyncio.run(
+            client.aio.models.generate_images(model="test-imagen", prompt="a cat")
+        )
+        self.assertEqual(result, "images")
+        self.assertEqual(client.aio.models._models.calls, 3)
+        # halved twice, then one additive step back up
+        self.assertAlmostEqual(self.limiter.scale("test-imagen"), 0.3)
+
+        metrics = retry.get_retry_metrics()["test-imagen"]
+        self.assertEqual(metrics["throttled"], 2)
+        self.assertEqual(metrics["retries"], 2)
+
+    def test_gives_up_after_max_attempts(self):
+        client = self._client(failures=config.genai_max_attempts)
+        with self.assertRaises(errors.APIError):
+            asyncio.run(
+                client.aio.models.generate_images(model="test-veo", prompt="a dog")
+            )
+        self.assertEqual(retry.get_retry_metrics()["test-veo"]["gave_up"], 1)
+
+    def test_other_errors_are_not_retried(self):
+        fake = mock.MagicMock()
+        fake.models.generate_content.side_effect = errors.ClientError(
+            400, {"error": {"code": 400, "status": "INVALID_ARGUMENT"}}
+        )
+        client = retry.BackoffClient(fake)
+        with self.assertRaises(errors.ClientError):
+            client.models.generate_content(model="test-gemini", contents="hi")
+        self.assertEqual(fake.models.generate_content.call_count, 1)
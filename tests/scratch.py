@@ -0,0 +1,42 @@
+# Unit tests for per-invocation scratch directories
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from trends_and_insights_agent.shared_libraries import scratch
+from trends_and_insights_agent.shared_libraries.config import config
+
+
+class Scratch_Dir(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        patcher = mock.patch.object(config, "scratch_root", self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(setattr, scratch, "_root", None)
+        scratch._root = None
+
+    def test_directories_are_private_and_removed(self):
+        with scratch.scratch_dir(prefix="a_") as first, scratch.scratch_dir(
+            prefix="a_"
+        ) as second:
+            self.assertNotEqual(first, second)
+            self.assertTrue(first.startswith(self.root))
+            with open(os.path.join(first, "file.txt"), "w") as f:
+                f.write("x")
+        self.assertFalse(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+
+    def test_removed_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with scratch.scratch_dir() as path:
+                raise RuntimeError("boom")
+        self.assertFalse(os.path.exists(path))
+
+    def test_falls_back_to_temp_dir_without_tmpfs_room(self):
+        with mock.patch.object(config, "scratch_root", ""), mock.patch.object(
+            scratch, "_tmpfs_has_room", return_value=False
+        ):
+            self.assertTrue(scratch.scratch_root().startswith(tempfile.gettempdir()))
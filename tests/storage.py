@@ -0,0 +1,98 @@
+# Unit tests for the shared, pooled Cloud Storage client
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from google.api_core.exceptions import NotFound
+from google.auth.credentials import AnonymousCredentials
+
+from trends_and_insights_agent.shared_libraries import clients, utils
+from trends_and_insights_agent.shared_libraries.config import config
+
+
+class FakeBlob:
+    def __init__(self, objects: dict, name: str):
+        self.objects = objects
+        self.name = name
+        self.downloads: list = objects.setdefault("__downloads__", [])
+
+    def _data(self) -> bytes:
+        if self.name not in self.objects:
+            raise NotFound(self.name)
+        return self.objects[self.name]
+
+    def upload_from_string(self, data, content_type=None):
+        self.objects[self.name] = data if isinstance(data, bytes) else data.encode()
+
+    def upload_from_filename(self, filename):
+        with open(filename, "rb") as f:
+            self.objects[self.name] = f.read()
+
+    def download_as_bytes(self):
+        return self._data()
+
+    def download_to_filename(self, filename, start=None, end=None):
+        data = self._data()
+        if start is not None or end is not None:
+            data = data[start or 0 : None if end is None else end + 1]
+        self.downloads.append((self.name, len(data)))
+        with open(filename, "wb") as f:
+            f.write(data)
+
+
+class FakeBucket:
+    def __init__(self, objects: dict):
+        self.objects = objects
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self.objects, name)
+
+    def copy_blob(self, blob, destination_bucket, new_name=None):
+        destination_bucket.objects[new_name] = blob._data()
+        return destination_bucket.blob(new_name)
+
+
+class FakeStorageClient:
+    """In-memory stand-in for `google.cloud.storage.Client`; one dict of objects per bucket."""
+
+    def __init__(self):
+        self.buckets: dict[str, dict] = {}
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(self.buckets.setdefault(name, {}))
+
+
+class Shared_Storage_Client(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeStorageClient()
+        clients.override("storage", self.fake)
+        self.addCleanup(clients.reset, "storage")
+
+    def test_helpers_use_the_shared_client(self):
+        uri = utils.upload_bytes_to_gcs(
+            b"png-bytes", "folder/a.png", gcs_bucket="gs://my-bucket"
+        )
+        self.assertEqual(uri, "gs://my-bucket/folder/a.png")
+        self.assertEqual(utils.download_blob("my-bucket", "folder/a.png"), b"png-bytes")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            local_path = os.path.join(tmp, "a.png")
+            utils.download_image_from_gcs(
+                "folder/a.png", local_path, gcs_bucket="gs://my-bucket"
+            )
+            utils.upload_blob_to_gcs(
+                local_path, "folder/b.png", gcs_bucket="gs://my-bucket"
+            )
+        self.assertEqual(self.fake.buckets["my-bucket"]["folder/b.png"], b"png-bytes")
+
+    def test_factory_mounts_a_sized_connection_pool(self):
+        clients.reset("storage")
+        with mock.patch(
+            "google.auth.default", return_value=(AnonymousCredentials(), "test")
+        ):
+            client = clients.get_storage_client()
+        adapter = client._http.get_adapter("https://storage.googleapis.com")
+        self.assertEqual(adapter._pool_maxsize, config.gcs_http_pool_size)
+        self.assertIs(clients.get_storage_client(), client)
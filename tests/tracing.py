@@ -0,0 +1,127 @@
+# Unit tests for OpenTelemetry tracing of tools, callbacks and backend calls
+import os
+import json
+import asyncio
+import inspect
+import tempfile
+import unittest
+from unittest import mock
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from google.adk.tools import FunctionTool
+
+from trends_and_insights_agent import tools
+from trends_and_insights_agent.shared_libraries import clients, retry, tracing, utils
+from trends_and_insights_agent.shared_libraries.rate_limiter import (
+    SlidingWindowLimiter,
+)
+from tests.storage import FakeStorageClient
+
+exporter = InMemorySpanExporter()
+
+
+def setUpModule():
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+
+def _spans(name: str) -> list:
+    return [span for span in exporter.get_finished_spans() if span.name == name]
+
+
+class _FakeModels:
+    async def generate_content(self, model: str, contents: str, config=None):
+        return mock.MagicMock(
+            usage_metadata=mock.MagicMock(
+                prompt_token_count=12,
+                candidates_token_count=3,
+                cached_content_token_count=None,
+            )
+        )
+
+
+class Tracing(unittest.TestCase):
+    def setUp(self):
+        exporter.clear()
+
+    def test_traced_tool_keeps_declaration(self):
+        self.assertTrue(inspect.iscoroutinefunction(tools.analyze_youtube_videos))
+        traced = FunctionTool(tools.analyze_youtube_videos)._get_declaration()
+        plain = FunctionTool(tools.analyze_youtube_videos.__wrapped__)._get_declaration()
+        self.assertEqual(traced, plain)
+
+    def test_span_carries_agent_name(self):
+        @tracing.traced_tool
+        def echo(text: str, tool_context) -> str:
+            return text
+
+        tool_context = mock.MagicMock(agent_name="trend_assistant", invocation_id="e-1")
+        self.assertEqual(echo("hi", tool_context=tool_context), "hi")
+
+        (span,) = _spans("tool echo")
+        self.assertEqual(span.attributes["agent.name"], "trend_assistant")
+        self.assertEqual(span.attributes["invocation.id"], "e-1")
+
+    def test_gcs_span_records_bytes(self):
+        clients.override("storage", FakeStorageClient())
+        try:
+            utils.upload_bytes_to_gcs(
+                b"0123456789", "folder/data.bin", gcs_bucket="gs://bucket"
+            )
+        finally:
+            clients.reset("storage")
+
+        (span,) = _spans("gcs upload")
+        self.assertEqual(span.attributes["gcs.bucket"], "bucket")
+        self.assertEqual(span.attributes["gcs.object"], "folder/data.bin")
+        self.assertEqual(span.attributes["gcs.bytes"], 10)
+
+    def test_genai_span_records_usage_and_waits(self):
+        clients.override(
+            "llm_rate_limiter", SlidingWindowLimiter(limit=100, window_seconds=60)
+        )
+        try:
+            fake = mock.MagicMock()
+            fake.aio.models = _FakeModels()
+            client = retry.BackoffClient(fake)
+            asyncio.run(
+                client.aio.models.generate_content(model="test-gemini", contents="hi")
+            )
+        finally:
+            clients.reset("llm_rate_limiter")
+
+        (span,) = _spans("genai generate_content")
+        self.assertEqual(span.attributes["gen_ai.request.model"], "test-gemini")
+        self.assertEqual(span.attributes["gen_ai.usage.input_tokens"], 12)
+        self.assertEqual(span.attributes["gen_ai.usage.output_tokens"], 3)
+        self.assertNotIn("gen_ai.usage.cached_tokens", span.attributes)
+        self.assertEqual(span.attributes["genai.attempts"], 1)
+        self.assertIn("rate_limiter.wait_seconds", span.attributes)
+
+    def test_jsonl_exporter_writes_one_line_per_span(self):
+        with tracing.tracer.start_as_current_span("parent"):
+            with tracing.tracer.start_as_current_span("child", attributes={"k": 1}):
+                pass
+        spans = exporter.get_finished_spans()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nested", "traces.jsonl")
+            tracing.JsonlSpanExporter(path).export(spans)
+            with open(path) as f:
+                rows = [json.loads(line) for line in f]
+
+        self.assertEqual([row["name"] for row in rows], ["child", "parent"])
+        self.assertEqual(rows[0]["parent_id"], rows[1]["span_id"])
+        self.assertEqual(rows[0]["attributes"], {"k": 1})
+        self.assertIsNone(rows[1]["parent_id"])
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(tracing.setup_tracing(exporter=""))
@@ -0,0 +1,98 @@
+# Unit tests for non-blocking video generation polling
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from trends_and_insights_agent.shared_libraries import clients
+from trends_and_insights_agent.common_agents.ad_content_generator import tools
+
+
+class _FakeOperations:
+    def __init__(self, polls_until_done: int):
+        self.polls_until_done = polls_until_done
+        self.calls = 0
+
+    async def get(self, operation):
+        self.calls += 1
+        return SimpleNamespace(
+            name=operation.name, done=self.calls >= self.polls_until_done
+        )
+
+
+class Video_Polling(unittest.TestCase):
+
+    def setUp(self):
+        self.operations = _FakeOperations(polls_until_done=3)
+        clients.override(
+            "genai", SimpleNamespace(aio=SimpleNamespace(operations=self.operations))
+        )
+        self.addCleanup(clients.reset, "genai")
+        patcher = mock.patch.multiple(
+            tools.config, video_poll_initial_seconds=0.01, video_poll_max_seconds=0.02
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_polls_until_done(self):
+        operation = SimpleNamespace(name="op", done=False)
+        result = asyncio.run(tools._poll_video_operation(operation, timeout_seconds=5))
+        self.assertTrue(result.done)
+        self.assertEqual(self.operations.calls, 3)
+
+    def test_times_out(self):
+        self.operations.polls_until_done = 10**6
+        operation = SimpleNamespace(name="op", done=False)
+        with self.assertRaises(TimeoutError):
+            asyncio.run(tools._poll_video_operation(operation, timeout_seconds=0.05))
+
+    def test_gathers_concurrently(self):
+        operations = [SimpleNamespace(name=f"op{i}", done=False) for i in range(3)]
+        results = asyncio.run(
+            tools._gather_video_operations(operations, timeout_seconds=5)
+        )
+        self.assertTrue(all(result.done for result in results))
+
+
+class Generate_Selected_Visuals(unittest.TestCase):
+
+    def test_bounds_concurrency_per_model_and_reports_each_item(self):
+        in_flight = {"image": 0, "video": 0}
+        peak = {"image": 0, "video": 0}
+
+        def fake(kind, fail_on=None):
+            async def generate(prompt, concept_name, tool_context):
+                in_flight[kind] += 1
+                peak[kind] = max(peak[kind], in_flight[kind])
+                await asyncio.sleep(0.01)
+                in_flight[kind] -= 1
+                if concept_name == fail_on:
+                    raise RuntimeError("boom")
+                return {"status": "ok", "artifact_key": f"{concept_name}.out"}
+
+            return generate
+
+        concepts = [
+            {"name": f"img{i}", "type": "image", "prompt": "p"} for i in range(5)
+        ]
+        concepts += [
+            {"name": f"vid{i}", "type": "video", "prompt": "p"} for i in range(3)
+        ]
+        tool_context = SimpleNamespace(
+            state={"final_select_vis_concepts": {"final_select_vis_concepts": concepts}}
+        )
+        with mock.patch.object(
+            tools, "generate_image", fake("image")
+        ), mock.patch.object(
+            tools, "generate_video", fake("video", fail_on="vid1")
+        ), mock.patch.multiple(
+            tools.config, image_gen_concurrency=2, video_gen_concurrency=1
+        ):
+            response = asyncio.run(tools.generate_selected_visuals(tool_context))
+
+        self.assertEqual(response["status"], "partial")
+        self.assertEqual(len(response["results"]), 8)
+        self.assertEqual(peak, {"image": 2, "video": 1})
+        failed = [r["name"] for r in response["results"] if r["status"] != "ok"]
+        self.assertEqual(failed, ["vid1"])
+        self.assertEqual(len(tool_context.state["visual_generation_results"]), 8)
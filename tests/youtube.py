@@ -0,0 +1,307 @@
+# Unit tests for the YouTube trending chart cache and batched search
+import time
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from trends_and_insights_agent import tools
+from trends_and_insights_agent.shared_libraries import clients, youtube
+from trends_and_insights_agent.shared_libraries.config import config
+from trends_and_insights_agent.shared_libraries.youtube import TrendingChartCache
+from trends_and_insights_agent.common_agents.trend_assistant import (
+    tools as trend_tools,
+)
+
+
+def _http_error(status: int) -> HttpError:
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+class _FakeRequest:
+    def __init__(self, api: "FakeYouTube", params: dict):
+        self.api = api
+        self.params = params
+        self.headers = {}
+
+    def execute(self, http=None, num_retries=0):
+        return self.api.execute(self)
+
+
+class _FakeSearch:
+    def __init__(self, api: "FakeYouTube"):
+        self.api = api
+
+    def list(self, **params):
+        return _FakeRequest(self.api, dict(params, endpoint="search"))
+
+
+class FakeYouTube:
+    """Serves one chart per region whose ETag changes with `version`, and
+    `num_search_results` search results per query in pages of `maxResults`."""
+
+    def __init__(self, num_search_results: int = 120):
+        self.version = 1
+        self.num_search_results = num_search_results
+        self.requests: list = []
+        self.fail = False
+        self.fail_queries: set = set()
+        self._lock = threading.Lock()
+
+    def videos(self):
+        return self
+
+    def search(self):
+        return _FakeSearch(self)
+
+    def list(self, **params):
+        return _FakeRequest(self, params)
+
+    def execute(self, request: _FakeRequest) -> dict:
+        with self._lock:
+            self.requests.append(request)
+        if self.fail:
+            raise _http_error(403)
+        if request.params.get("endpoint") == "search":
+            return self._search(request.params)
+        if "id" in request.params:
+            return {
+                "items": [
+                    {"id": video_id, "statistics": {"viewCount": "1"}}
+                    for video_id in request.params["id"].split(",")
+                ]
+            }
+        region = request.params["regionCode"]
+        etag = f'"{region}-{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            raise _http_error(304)
+        return {
+            "etag": etag,
+            "items": [
+                {
+                    "id": f"{region}{i}-v{self.version}",
+                    "snippet": {"title": f"{region} video {i}"},
+                    "contentDetails": {"duration": "PT3M"},
+                }
+                for i in range(request.params["maxResults"])
+            ],
+        }
+
+    def _search(self, params: dict) -> dict:
+        if params["q"] in self.fail_queries:
+            raise _http_error(400)
+        start = int(params.get("pageToken") or 0)
+        end = min(start + params["maxResults"], self.num_search_results)
+        response = {
+            "items": [
+                {
+                    "id": {"kind": "youtube#video", "videoId": f"{params['q']}-{i}"},
+                    "snippet": {"title": f"{params['q']} result {i}"},
+                }
+                for i in range(start, end)
+            ]
+        }
+        if end < self.num_search_results:
+            response["nextPageToken"] = str(end)
+        return response
+
+
+class FakeAsyncYouTube:
+    """Serves `FakeYouTube`'s responses through the `AsyncYouTubeClient` interface."""
+
+    def __init__(self, api: FakeYouTube):
+        self.api = api
+
+    async def search_list(self, **params) -> dict:
+        return self.api.search().list(**params).execute()
+
+    async def videos_list(self, etag=None, **params):
+        # yield to the event loop, as a real request would
+        await asyncio.sleep(0)
+        request = self.api.list(**params)
+        if etag:
+            request.headers["If-None-Match"] = etag
+        try:
+            return request.execute()
+        except HttpError as e:
+            if e.resp.status == 304:
+                return None
+            raise
+
+
+class Trending_Chart_Cache(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeYouTube()
+        clients.override("youtube", self.api)
+        clients.override("youtube_async", FakeAsyncYouTube(self.api))
+        # the trend tools start the shared refresh loop
+        self.addCleanup(youtube.trending_charts.stop_refresh_loop)
+
+    def tearDown(self):
+        clients.reset("youtube")
+        clients.reset("youtube_async")
+
+    def test_fresh_chart_is_served_from_memory(self):
+        cache = TrendingChartCache(ttl_seconds=60)
+        first = cache.get("us", 3)
+        self.assertEqual(cache.get("US", 3), first)
+        self.assertEqual(len(self.api.requests), 1)
+        # a different key is a different chart
+        cache.get("US", 5)
+        self.assertEqual(len(self.api.requests), 2)
+
+    def test_stale_chart_is_revalidated_with_etag(self):
+        cache = TrendingChartCache(ttl_seconds=0)
+        first = cache.get("US", 3)
+        self.assertEqual(cache.get("US", 3), first)
+        self.assertEqual(self.api.requests[1].headers["If-None-Match"], '"US-1"')
+        self.assertEqual(cache.stats()["not_modified"], 1)
+
+        self.api.version = 2
+        self.assertEqual(cache.get("US", 3)[0]["id"], "US0-v2")
+        self.assertEqual(cache.stats()["fetched"], 2)
+
+    def test_failed_refresh_serves_cached_copy(self):
+        cache = TrendingChartCache(ttl_seconds=0)
+        first = cache.get("US", 3)
+        self.api.fail = True
+        self.assertEqual(cache.get("US", 3), first)
+        self.assertEqual(cache.stats()["stale"], 1)
+        with self.assertRaises(HttpError):
+            cache.get("GB", 3)
+
+    def test_concurrent_async_lookups_share_one_request(self):
+        cache = TrendingChartCache(ttl_seconds=60)
+
+        async def lookups():
+            return await asyncio.gather(*(cache.aget("US", 3) for _ in range(5)))
+
+        charts = asyncio.run(lookups())
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertTrue(all(chart == charts[0] for chart in charts))
+
+    def test_get_many(self):
+        cache = TrendingChartCache(ttl_seconds=60)
+        charts = cache.get_many(["US", "gb", "GB", "DE"], 2)
+        self.assertEqual(list(charts), ["US", "GB", "DE"])
+        self.assertEqual(charts["GB"][0]["id"], "GB0-v1")
+        self.assertEqual(len(self.api.requests), 3)
+
+    def test_refresh_loop(self):
+        cache = TrendingChartCache(ttl_seconds=60)
+        cache.start_refresh_loop(["US"], interval_seconds=0.01, max_results=2)
+        try:
+            deadline = time.monotonic() + 5
+            while len(self.api.requests) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            cache.stop_refresh_loop()
+        self.assertGreaterEqual(len(self.api.requests), 2)
+        # the warmed chart is served without a request
+        count = len(self.api.requests)
+        cache.get("US", 2)
+        self.assertEqual(len(self.api.requests), count)
+
+    def test_idle_refresh_loop_stops(self):
+        cache = TrendingChartCache(ttl_seconds=60)
+        thread = cache.start_refresh_loop(
+            ["US"], interval_seconds=0.01, max_results=2, idle_seconds=0.05
+        )
+        thread.join(timeout=5)
+        self.assertFalse(cache.refresh_loop_running())
+
+    def test_trend_tools_start_refresh_loop_on_first_use(self):
+        charts = youtube.trending_charts
+        charts.stop_refresh_loop()
+        self.assertFalse(charts.refresh_loop_running())
+        with mock.patch.object(config, "yt_trends_refresh_seconds", 60):
+            asyncio.run(trend_tools.get_youtube_trends(region_code="US", max_results=2))
+            self.assertTrue(charts.refresh_loop_running())
+            # later calls leave the running loop as it is
+            self.assertIsNone(youtube.start_trends_refresh())
+
+    def test_trend_tools_keep_row_format(self):
+        trend_tools.trending_charts.clear()
+        try:
+            rows = asyncio.run(
+                trend_tools.get_youtube_trends(region_code="US", max_results=2)
+            )
+            by_region = asyncio.run(
+                trend_tools.get_youtube_trends_by_region(["US", "GB"], 2)
+            )
+        finally:
+            trend_tools.trending_charts.clear()
+        self.assertEqual(
+            rows["row_1"],
+            {
+                "videoId": "US0-v1",
+                "videoTitle": "US video 0",
+                "duration": "PT3M",
+                "videoURL": "https://www.youtube.com/watch?v=US0-v1",
+            },
+        )
+        self.assertEqual(by_region["US"], rows)
+        self.assertEqual(list(by_region["GB"]), ["row_1", "row_2"])
+
+
+class Batched_Search(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeYouTube(num_search_results=120)
+        clients.override("youtube", self.api)
+
+    def tearDown(self):
+        clients.reset("youtube")
+
+    def _requests(self, endpoint: str) -> list:
+        return [
+            request.params
+            for request in self.api.requests
+            if (request.params.get("endpoint") == "search") == (endpoint == "search")
+        ]
+
+    def test_pages_then_enriches_in_chunks(self):
+        response = asyncio.run(
+            tools.batch_query_youtube_api(
+                queries=["cats", "dogs", "cats"],
+                video_duration="any",
+                num_video_results=70,
+            )
+        )
+        self.assertEqual(response["status"], "ok")
+        self.assertEqual(list(response["results"]), ["cats", "dogs"])
+        self.assertEqual(len(response["results"]["cats"]), 70)
+        self.assertEqual(response["results"]["dogs"][0]["id"], "dogs-0")
+        self.assertIn("statistics", response["results"]["dogs"][0])
+
+        searches = self._requests("search")
+        # two pages per query: 50 + 20
+        self.assertEqual(sorted(p["maxResults"] for p in searches), [20, 20, 50, 50])
+        self.assertEqual(searches[0]["videoDuration"], "any")
+        # 140 unique ids in requests of at most 50
+        sizes = sorted(len(p["id"].split(",")) for p in self._requests("videos"))
+        self.assertEqual(sizes, [40, 50, 50])
+
+    def test_stops_when_results_run_out(self):
+        self.api.num_search_results = 30
+        response = asyncio.run(
+            tools.batch_query_youtube_api(
+                queries=["cats"], video_duration="any", num_video_results=100
+            )
+        )
+        self.assertEqual(len(response["results"]["cats"]), 30)
+        self.assertEqual(len(self._requests("search")), 1)
+
+    def test_failed_query_is_reported(self):
+        self.api.fail_queries = {"dogs"}
+        response = asyncio.run(
+            tools.batch_query_youtube_api(
+                queries=["cats", "dogs"], video_duration="any", num_video_results=5
+            )
+        )
+        self.assertEqual(response["status"], "ok")
+        self.assertEqual(response["results"]["dogs"], [])
+        self.assertIn("dogs", response["errors"])
+        self.assertEqual(len(response["results"]["cats"]), 5)
@@ -0,0 +1,215 @@
+# Unit tests for the async YouTube Data API client
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from trends_and_insights_agent import tools
+from trends_and_insights_agent.shared_libraries import clients
+from trends_and_insights_agent.shared_libraries.youtube import TrendingChartCache
+from trends_and_insights_agent.shared_libraries.youtube_async import (
+    AsyncYouTubeClient,
+    YouTubeApiError,
+)
+from trends_and_insights_agent.shared_libraries.youtube_quota import QuotaLedger
+
+
+class FakeYouTubeServer:
+    """A local YouTube Data API serving `search` and `videos` and recording each request."""
+
+    def __init__(self):
+        self.requests: list = []
+        self.connections: set = set()
+        self.etag = '"chart-1"'
+        self.delay = 0.0
+        self.error = None
+        app = web.Application()
+        app.router.add_get("/youtube/v3/search", self.search)
+        app.router.add_get("/youtube/v3/videos", self.videos)
+        self.server = TestServer(app)
+
+    def _record(self, request: web.Request) -> None:
+        self.requests.append(request)
+        self.connections.add(request.transport.get_extra_info("peername"))
+
+    async def search(self, request: web.Request) -> web.Response:
+        self._record(request)
+        if isinstance(self.error, str):
+            return web.Response(status=502, text=self.error, content_type="text/html")
+        if self.error:
+            return web.json_response(self.error[1], status=self.error[0])
+        await asyncio.sleep(self.delay)
+        count = int(request.query["maxResults"])
+        return web.json_response(
+            {
+                "kind": "youtube#searchListResponse",
+                "items": [
+                    {"id": {"kind": "youtube#video", "videoId": f"v{i}"}}
+                    for i in range(count)
+                ],
+            }
+        )
+
+    async def videos(self, request: web.Request) -> web.Response:
+        self._record(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304)
+        count = int(request.query["maxResults"])
+        return web.json_response(
+            {
+                "etag": self.etag,
+                "items": [
+                    {
+                        "id": f"{request.query['regionCode']}{i}",
+                        "snippet": {"title": f"video {i}"},
+                        "contentDetails": {"duration": "PT1M"},
+                    }
+                    for i in range(count)
+                ],
+            }
+        )
+
+
+class Async_YouTube_Client(unittest.TestCase):
+    def setUp(self):
+        self.ledger = QuotaLedger(daily_units=1000)
+        clients.override("youtube_quota", self.ledger)
+
+    def tearDown(self):
+        clients.reset("youtube_quota")
+        clients.reset("youtube_async")
+
+    def _run(self, test, timeout_seconds: float = 5):
+        """Runs `test(fake, client)` against a fresh server and client on one event loop."""
+
+        async def main():
+            fake = FakeYouTubeServer()
+            await fake.server.start_server()
+            client = AsyncYouTubeClient(
+                api_key=lambda: "test-key",
+                timeout_seconds=timeout_seconds,
+                base_url=str(fake.server.make_url("/youtube/v3")),
+            )
+            clients.override("youtube_async", client)
+            try:
+                return await test(fake, client)
+            finally:
+                await client.close()
+                await fake.server.close()
+
+        return asyncio.run(main())
+
+    def test_search_list(self):
+        async def test(fake, client):
+            response = await client.search_list(
+                part="id,snippet", q="cats", maxResults=3, channelId=None
+            )
+            self.assertEqual(len(response["items"]), 3)
+            query = fake.requests[0].query
+            self.assertEqual(query["key"], "test-key")
+            self.assertEqual(query["q"], "cats")
+            self.assertNotIn("channelId", query)
+
+        self._run(test)
+        self.assertEqual(self.ledger.stats()["spent"], {"search.list": 100})
+
+    def test_connections_are_reused(self):
+        async def test(fake, client):
+            for _ in range(3):
+                await client.search_list(part="id", q="cats", maxResults=1)
+            # sequential requests share one keep-alive connection
+            self.assertEqual(len(fake.connections), 1)
+            await asyncio.gather(
+                *(
+                    client.search_list(part="id", q="dogs", maxResults=1)
+                    for _ in range(3)
+                )
+            )
+            return fake.connections
+
+        connections = self._run(test)
+        self.assertLessEqual(len(connections), 3)
+
+    def test_etag_revalidation(self):
+        async def test(fake, client):
+            first = await client.videos_list(
+                part="snippet", chart="mostPopular", regionCode="US", maxResults=2
+            )
+            again = await client.videos_list(
+                etag=first["etag"],
+                part="snippet",
+                chart="mostPopular",
+                regionCode="US",
+                maxResults=2,
+            )
+            self.assertIsNone(again)
+
+            cache = TrendingChartCache(ttl_seconds=0)
+            chart = await cache.aget("US", 2)
+            self.assertEqual(await cache.aget("US", 2), chart)
+            self.assertEqual(cache.stats()["not_modified"], 1)
+            self.assertEqual(fake.requests[-1].headers["If-None-Match"], fake.etag)
+
+        self._run(test)
+
+    def test_quota_exceeded_error(self):
+        async def test(fake, client):
+            fake.error = (
+                403,
+                {
+                    "error": {
+                        "message": "quota",
+                        "errors": [{"reason": "quotaExceeded"}],
+                    }
+                },
+            )
+            with self.assertRaises(YouTubeApiError) as raised:
+                await client.search_list(part="id", q="cats", maxResults=1)
+            self.assertEqual(raised.exception.status, 403)
+
+        self._run(test)
+        self.assertEqual(self.ledger.remaining(), 0)
+
+    def test_non_json_error_body(self):
+        async def test(fake, client):
+            fake.error = "<html>502 Bad Gateway</html>"
+            with self.assertRaises(YouTubeApiError) as raised:
+                await client.search_list(part="id", q="cats", maxResults=1)
+            self.assertEqual(raised.exception.status, 502)
+            self.assertIn("Bad Gateway", str(raised.exception))
+
+        self._run(test)
+
+    def test_sessions_of_closed_loops_are_closed(self):
+        client = AsyncYouTubeClient(api_key=lambda: "test-key")
+        first = asyncio.run(client._session())
+        self.assertFalse(first.closed)
+        second = asyncio.run(client._session())
+        self.assertTrue(first.closed)
+        self.assertEqual(list(client._sessions.values()), [second])
+        client.close_all()
+        self.assertTrue(second.closed)
+        self.assertEqual(client._sessions, {})
+
+    def test_timeout(self):
+        async def test(fake, client):
+            fake.delay = 1
+            with self.assertRaises(asyncio.TimeoutError):
+                await client.search_list(part="id", q="cats", maxResults=1)
+
+        self._run(test, timeout_seconds=0.1)
+
+    def test_aquery_youtube_api_matches_search_response(self):
+        async def test(fake, client):
+            response = await tools.aquery_youtube_api(
+                query="cats", video_duration="medium", num_video_results=4
+            )
+            self.assertEqual(response["kind"], "youtube#searchListResponse")
+            self.assertEqual(len(response["items"]), 4)
+            query = fake.requests[0].query
+            self.assertEqual(query["type"], "video")
+            self.assertEqual(query["videoDuration"], "medium")
+            self.assertIn("publishedAfter", query)
+
+        self._run(test)
@@ -0,0 +1,114 @@
+# Unit tests for YouTube Data API quota accounting
+import datetime
+import unittest
+from unittest import mock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from trends_and_insights_agent import tools
+from trends_and_insights_agent.shared_libraries import clients, youtube_quota
+from trends_and_insights_agent.shared_libraries.youtube import (
+    TrendingChartCache,
+    search_videos,
+)
+from trends_and_insights_agent.shared_libraries.youtube_quota import (
+    QuotaExceeded,
+    QuotaLedger,
+    QuotaTrackedYouTube,
+)
+from tests.youtube import FakeYouTube
+
+
+class Quota_Ledger(unittest.TestCase):
+    def test_charges_unit_costs(self):
+        ledger = QuotaLedger(daily_units=1000)
+        ledger.charge("search.list")
+        ledger.charge("videos.list")
+        self.assertEqual(ledger.remaining(), 899)
+        self.assertEqual(
+            ledger.stats()["spent"], {"search.list": 100, "videos.list": 1}
+        )
+
+    def test_searches_may_not_dip_into_reserve(self):
+        ledger = QuotaLedger(daily_units=250, reserve_units=100)
+        ledger.charge("search.list")
+        with self.assertRaises(QuotaExceeded):
+            ledger.charge("search.list")
+        # list calls can still spend the reserve
+        for _ in range(150):
+            ledger.charge("videos.list")
+        with self.assertRaises(QuotaExceeded):
+            ledger.charge("videos.list")
+        self.assertEqual(
+            ledger.stats()["refused"], {"search.list": 1, "videos.list": 1}
+        )
+
+    def test_budget_resets_daily(self):
+        ledger = QuotaLedger(daily_units=100)
+        ledger.mark_exhausted()
+        self.assertEqual(ledger.remaining(), 0)
+        tomorrow = youtube_quota._quota_day() + datetime.timedelta(days=1)
+        with mock.patch.object(youtube_quota, "_quota_day", return_value=tomorrow):
+            self.assertEqual(ledger.remaining(), 100)
+
+    def test_low_budget_shrinks_searches(self):
+        ledger = QuotaLedger(daily_units=1000, low_fraction=0.2)
+        self.assertEqual(ledger.max_search_results(120), 120)
+        for _ in range(9):
+            ledger.charge("search.list")
+        self.assertTrue(ledger.is_low())
+        self.assertEqual(ledger.max_search_results(120), 25)
+        self.assertEqual(ledger.max_search_results(5), 2)
+
+
+class Quota_Tracked_Client(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeYouTube(num_search_results=120)
+        self.ledger = QuotaLedger(daily_units=1000, reserve_units=50, low_fraction=0.2)
+        clients.override("youtube", QuotaTrackedYouTube(self.api))
+        clients.override("youtube_quota", self.ledger)
+
+    def tearDown(self):
+        clients.reset("youtube")
+        clients.reset("youtube_quota")
+
+    def test_requests_are_charged(self):
+        search_videos("cats", max_results=70)
+        TrendingChartCache(ttl_seconds=60).get("US", 5)
+        self.assertEqual(
+            self.ledger.stats()["spent"], {"search.list": 200, "videos.list": 1}
+        )
+
+    def test_reported_exhaustion_zeroes_budget(self):
+        error = HttpError(
+            httplib2.Response({"status": 403}),
+            b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}',
+        )
+        with mock.patch.object(self.api, "execute", side_effect=error):
+            with self.assertRaises(HttpError):
+                clients.get("youtube").videos().list(chart="mostPopular").execute()
+        self.assertEqual(self.ledger.remaining(), 0)
+
+    def test_degrades_as_budget_runs_low(self):
+        cache = TrendingChartCache(ttl_seconds=0)
+        chart = cache.get("US", 5)
+
+        # 8 pages leave 199 units, below the 200 that count as low
+        self.api.num_search_results = 400
+        self.assertEqual(len(search_videos("cats", max_results=400)), 400)
+        self.assertTrue(self.ledger.is_low())
+
+        # cached trends are served without a request
+        requests = len(self.api.requests)
+        self.assertEqual(cache.get("US", 5), chart)
+        self.assertEqual(len(self.api.requests), requests)
+
+        # a smaller search still fits, then the next one would dip into the reserve
+        response = tools.query_youtube_api(
+            query="dogs", video_duration="any", num_video_results=10
+        )
+        self.assertEqual(len(response["items"]), 5)
+        response = tools.query_youtube_api(query="dogs", video_duration="any")
+        self.assertEqual(response["status"], "error")
+        self.assertIn("quota", response["error_message"])
@@ -6,13 +6,16 @@ from .common_agents.staged_researcher.agent import research_orchestrator
 from .common_agents.ad_content_generator.agent import ad_content_generator_agent
 from .common_agents.ad_content_generator.tools import save_creatives_and_research_report
 
-from .shared_libraries import callbacks
+from .shared_libraries import callbacks, tracing
 from .shared_libraries.config import config
 from .prompts import (
     GLOBAL_INSTR,
     ROOT_AGENT_INSTR,
 )
 
+# exports agent, tool and callback spans when `config.trace_exporter` is set
+tracing.setup_tracing()
+
 root_agent = Agent(
     model=config.worker_model,
     name="root_agent",
@@ -9,6 +9,7 @@ from trends_and_insights_agent.shared_libraries import callbacks
 from .tools import (
     generate_image,
     generate_video,
+    generate_selected_visuals,
     save_img_artifact_key,
     save_vid_artifact_key,
     save_select_ad_copy,
@@ -287,11 +288,13 @@ visual_generator = Agent(
     **Objective:** Generate visual content options (images and videos) based on the user-selected visual concepts.
 
     **Available Tools:**
+    - `generate_selected_visuals`: Generate every user-selected visual concept at once, concurrently.
     - `generate_image`: Generate images using Google's Imagen model.
     - `generate_video`: Generate videos using Google's Veo model.
 
     **Instructions:**
-    1. For each user-selected visual concept in the 'final_select_vis_concepts' state key, generate the creative visual using the appropriate tool (`generate_image` or `generate_video`).
+    1. Call `generate_selected_visuals` once to generate every user-selected visual concept in the 'final_select_vis_concepts' state key.
+    2. To retry a concept that failed, or to revise a concept's prompt, generate that creative visual using the appropriate tool (`generate_image` or `generate_video`).
         - For images, follow the instructions in the <IMAGE_GENERATION/> block, 
         - For videos, follow the instructions in the <VIDEO_GENERATION/> block and consider prompting best practices in the <PROMPTING_BEST_PRACTICES/> block,
 
@@ -314,6 +317,7 @@ visual_generator = Agent(
     </PROMPTING_BEST_PRACTICES>
     """,
     tools=[
+        generate_selected_visuals,
         generate_image,
         generate_video,
     ],
@@ -1,22 +1,25 @@
 import cv2
 import logging
-from PIL import Image
+import uuid, os
 from io import BytesIO
-import uuid, shutil, time, os
+import asyncio
+from typing import Optional
 from markdown_pdf import MarkdownPdf, Section
 
 logging.basicConfig(level=logging.INFO)
 
-from google import genai
 from google.genai import types
-from google.cloud import storage
 from google.adk.tools import ToolContext
+from google.adk.artifacts import GcsArtifactService
+from google.api_core.exceptions import NotFound
 from google.genai.types import GenerateVideosConfig
 
 from ...shared_libraries.config import config
+from ...shared_libraries.clients import get_genai_client, get_storage_client
+from ...shared_libraries.scratch import scratch_dir
+from ...shared_libraries.tracing import gcs_span, traced_tool
 from ...shared_libraries.utils import (
-    download_blob,
-    upload_blob_to_gcs,
+    upload_bytes_to_gcs,
     download_image_from_gcs,
 )
 
@@ -26,10 +29,8 @@ try:
 except KeyError:
     raise Exception("BUCKET environment variable not set")
 
-client = genai.Client()
-storage_client = storage.Client()
-
 
+@traced_tool
 def save_select_ad_copy(select_ad_copy_dict: dict, tool_context: ToolContext) -> dict:
     """
     Tool to save `select_ad_copy_dict` to the 'final_select_ad_copies' state key.
@@ -56,6 +57,7 @@ def save_select_ad_copy(select_ad_copy_dict: dict, tool_context: ToolContext) ->
     return {"status": "ok"}
 
 
+@traced_tool
 def save_select_visual_concept(
     select_vis_concept_dict: dict, tool_context: ToolContext
 ) -> dict:
@@ -88,6 +90,7 @@ def save_select_visual_concept(
     return {"status": "ok"}
 
 
+@traced_tool
 async def generate_image(
     prompt: str,
     tool_context: ToolContext,
@@ -106,7 +109,7 @@ async def generate_image(
         dict: Status and the artifact_key of the generated image.
 
     """
-    response = client.models.generate_images(
+    response = await get_genai_client().aio.models.generate_images(
         model=config.image_gen_model,
         prompt=prompt,
         config={"number_of_images": number_of_images},
@@ -120,11 +123,7 @@ async def generate_image(
     else:
         filename_prefix = f"{str(uuid.uuid4())[:8]}"
 
-    DIR = "session_media"
-    SUBDIR = f"{DIR}/imgs"
-    if not os.path.exists(SUBDIR):
-        os.makedirs(SUBDIR)
-
+    gcs_folder = tool_context.state["gcs_folder"]
     for index, image_results in enumerate(response.generated_images):
         if image_results.image is not None:
             if image_results.image.image_bytes is not None:
@@ -138,85 +137,185 @@ async def generate_image(
                         data=image_bytes, mime_type="image/png"
                     ),
                 )
-                local_filepath = f"{SUBDIR}/{artifact_key}"
 
-                # save the file locally for gcs upload
-                image = Image.open(BytesIO(image_bytes))
-                image.save(local_filepath)
-                gcs_folder = tool_context.state["gcs_folder"]
+                # Imagen already returns PNG bytes; upload them as-is
                 artifact_path = os.path.join(gcs_folder, artifact_key)
-                logging.info(f"\n\n `generate_image` listdir: {os.listdir('.')}\n\n")
-
-                upload_blob_to_gcs(
-                    source_file_name=local_filepath,
+                await asyncio.to_thread(
+                    upload_bytes_to_gcs,
+                    data=image_bytes,
                     destination_blob_name=artifact_path,
+                    content_type="image/png",
                 )
                 logging.info(
                     f"Saved image artifact '{artifact_key}' to folder '{gcs_folder}'"
                 )
 
-    try:
-        shutil.rmtree(DIR)
-        logging.info(f"Directory '{DIR}' and its contents removed successfully")
-    except FileNotFoundError:
-        logging.exception(f"Directory '{DIR}' not found")
-    except OSError as e:
-        logging.exception(f"Error removing directory '{DIR}': {e}")
-
     return {"status": "ok", "artifact_key": f"{artifact_key}"}
 
 
-async def generate_video(
+async def _submit_video_operation(
     prompt: str,
-    concept_name: str,
-    tool_context: ToolContext,
     number_of_videos: int = 1,
-    # aspect_ratio: str = "16:9",
     negative_prompt: str = "",
     existing_image_filename: str = "",
-):
-    f"""Generates a video based on the prompt for {config.video_gen_model}.
-
-    Args:
-        prompt (str): The prompt to generate the video from.
-        concept_name (str, optional): The name of the creative/visual concept.
-        tool_context (ToolContext): The tool context.
-        number_of_videos (int, optional): The number of videos to generate. Defaults to 1.
-        negative_prompt (str, optional): The negative prompt to use. Defaults to "".
-
-    Returns:
-        dict: Status and the `artifact_key` of the generated video.
-    """
-    # Create output filename
-    if concept_name:
-        filename_prefix = f"{concept_name.replace(",", "").replace(" ", "_")}"
-    else:
-        filename_prefix = f"{str(uuid.uuid4())[:8]}"
-
+) -> types.GenerateVideosOperation:
+    """Starts a video generation and returns its long-running operation without waiting on it."""
     gen_config = GenerateVideosConfig(
         aspect_ratio="16:9",
         number_of_videos=number_of_videos,
         output_gcs_uri=os.environ["BUCKET"],
         negative_prompt=negative_prompt,
     )
+    client = get_genai_client()
     if existing_image_filename != "":
         gcs_location = f"{os.environ['BUCKET']}/{existing_image_filename}"
         existing_image = types.Image(gcs_uri=gcs_location, mime_type="image/png")
-        operation = client.models.generate_videos(
+        return await client.aio.models.generate_videos(
             model=config.video_gen_model,
             prompt=prompt,
             image=existing_image,
             config=gen_config,
         )
-    else:
-        operation = client.models.generate_videos(
-            model=config.video_gen_model, prompt=prompt, config=gen_config
+    return await client.aio.models.generate_videos(
+        model=config.video_gen_model, prompt=prompt, config=gen_config
+    )
+
+
+async def _poll_video_operation(
+    operation: types.GenerateVideosOperation,
+    timeout_seconds: float = config.video_gen_timeout_seconds,
+) -> types.GenerateVideosOperation:
+    """
+    Awaits a video operation, polling quickly at first and backing off while it renders.
+
+    Raises `TimeoutError` after `timeout_seconds`. Cancelling the awaiting task stops
+    polling; the render itself still completes server-side.
+    """
+    client = get_genai_client()
+    delay = config.video_poll_initial_seconds
+    async with asyncio.timeout(timeout_seconds):
+        while not operation.done:
+            await asyncio.sleep(delay)
+            operation = await client.aio.operations.get(operation)
+            logging.info(f"video operation {operation.name} done: {operation.done}")
+            delay = min(delay * 1.5, config.video_poll_max_seconds)
+    return operation
+
+
+async def _gather_video_operations(
+    operations: list[types.GenerateVideosOperation],
+    timeout_seconds: float = config.video_gen_timeout_seconds,
+) -> list[types.GenerateVideosOperation | BaseException]:
+    """Polls several video operations concurrently; failures are returned in place rather than raised."""
+    return await asyncio.gather(
+        *(_poll_video_operation(op, timeout_seconds) for op in operations),
+        return_exceptions=True,
+    )
+
+
+def _thumbnail_blob_name(video_blob_name: str) -> str:
+    # the thumbnail lives next to its video e.g., "folder/concept_0_thumbnail.png"
+    return f"{os.path.splitext(video_blob_name)[0]}_thumbnail.png"
+
+
+def _extract_frame_from_blob(
+    video_blob,
+    local_vid_path: str,
+    local_frame_path: str,
+    allow_full_download: bool = True,
+) -> str:
+    """
+    Extracts frame 1 of a GCS video to `local_frame_path`, downloading as little of the video as possible.
+
+    Reads only the leading `config.video_thumbnail_range_kb` of the video first, and downloads
+    the whole video only if those bytes can't be decoded (e.g., the MP4 index is at the end of the file)
+    and `allow_full_download` is set.
+    """
+    with gcs_span("download", GCS_BUCKET, video_blob.name) as span:
+        video_blob.download_to_filename(
+            local_vid_path, start=0, end=config.video_thumbnail_range_kb * 1024 - 1
         )
-    while not operation.done:
-        time.sleep(15)
-        operation = client.operations.get(operation)
-        logging.info(operation)
+        span.set_attribute("gcs.bytes", os.path.getsize(local_vid_path))
+    extract_single_frame(local_vid_path, 1, local_frame_path)
+    if os.path.exists(local_frame_path) or not allow_full_download:
+        return local_frame_path
+
+    logging.info(f"Leading bytes of '{video_blob.name}' not enough; downloading it all")
+    with gcs_span("download", GCS_BUCKET, video_blob.name) as span:
+        video_blob.download_to_filename(local_vid_path)
+        span.set_attribute("gcs.bytes", os.path.getsize(local_vid_path))
+    return extract_single_frame(local_vid_path, 1, local_frame_path)
+
+
+def _store_video_thumbnail(
+    video_blob, local_dir: str, destination_blob_name: str
+) -> Optional[str]:
+    """
+    Extracts the report thumbnail of a GCS video from its leading bytes and uploads it to `destination_blob_name`.
 
+    Returns None, storing nothing, if the leading bytes can't be decoded: generation never downloads
+    the whole video, and the report extracts the thumbnail itself when none was stored.
+    """
+    local_vid_path = os.path.join(local_dir, os.path.basename(video_blob.name))
+    frame_path = f"{os.path.splitext(local_vid_path)[0]}_thumbnail.png"
+    _extract_frame_from_blob(
+        video_blob, local_vid_path, frame_path, allow_full_download=False
+    )
+    if not os.path.exists(frame_path):
+        logging.info(
+            f"No frame in the leading bytes of {video_blob.name}; the report will extract its thumbnail"
+        )
+        return None
+    with open(frame_path, "rb") as f:
+        return upload_bytes_to_gcs(
+            data=f.read(),
+            destination_blob_name=destination_blob_name,
+            content_type="image/png",
+        )
+
+
+def _artifacts_by_reference(tool_context: ToolContext) -> bool:
+    """Whether the session's artifact service can store a `file_data` reference to the video."""
+    if config.video_artifact_storage != "auto":
+        return config.video_artifact_storage == "reference"
+    invocation_context = getattr(tool_context, "_invocation_context", None)
+    service = getattr(invocation_context, "artifact_service", None)
+    # `GcsArtifactService` only stores `inline_data`
+    return not isinstance(service, GcsArtifactService)
+
+
+async def _save_video_artifact(
+    tool_context: ToolContext, artifact_key: str, video_uri: str, video_blob
+) -> None:
+    # reference the video in GCS rather than holding its bytes, where the artifact service allows it
+    if _artifacts_by_reference(tool_context):
+        try:
+            await tool_context.save_artifact(
+                filename=artifact_key,
+                artifact=types.Part.from_uri(file_uri=video_uri, mime_type="video/mp4"),
+            )
+            return
+        except (AttributeError, TypeError, ValueError) as e:
+            # a service that cannot store `file_data`; set `video_artifact_storage` to skip this attempt
+            logging.warning(
+                f"Artifact service rejected a file reference for '{artifact_key}'; saving inline bytes: {e}"
+            )
+    with gcs_span("download", GCS_BUCKET, video_blob.name) as span:
+        # `download_as_bytes` returns its buffer without a copy, and the `Part` keeps those bytes
+        video_bytes = await asyncio.to_thread(video_blob.download_as_bytes)
+        span.set_attribute("gcs.bytes", len(video_bytes))
+    await tool_context.save_artifact(
+        filename=artifact_key,
+        artifact=types.Part.from_bytes(data=video_bytes, mime_type="video/mp4"),
+    )
+
+
+async def _save_generated_video(
+    operation: types.GenerateVideosOperation,
+    filename_prefix: str,
+    tool_context: ToolContext,
+) -> dict:
+    """Saves the first video of a finished operation as an artifact and copies it to the session's GCS folder."""
     if operation.error:
         return {"status": f"failed due to error: {operation.error}"}
 
@@ -239,38 +338,159 @@ async def generate_video(
                         BUCKET_NAME = BUCKET.replace("gs://", "")
                         SOURCE_BLOB = video_uri.replace(BUCKET, "")[1:]
 
-                        video_bytes = download_blob(
-                            bucket_name=BUCKET_NAME, source_blob_name=SOURCE_BLOB
-                        )
                         logging.info(
                             f"The artifact key for this video is: {artifact_key}"
                         )
-                        await tool_context.save_artifact(
-                            filename=artifact_key,
-                            artifact=types.Part.from_bytes(
-                                data=video_bytes, mime_type="video/mp4"
-                            ),
+                        # `bucket()` builds a reference without the metadata request `get_bucket()` makes
+                        bucket = get_storage_client().bucket(BUCKET_NAME)
+                        source_blob = bucket.blob(SOURCE_BLOB)
+                        await _save_video_artifact(
+                            tool_context, artifact_key, video_uri, source_blob
                         )
 
-                        # save to common gcs location
+                        # server-side copy to common gcs location
                         DESTINATION_BLOB_NAME = (
                             f"{tool_context.state["gcs_folder"]}/{artifact_key}"
                         )
-                        bucket = storage_client.get_bucket(BUCKET_NAME)
-                        source_blob = bucket.blob(SOURCE_BLOB)
-                        destination_bucket = storage_client.get_bucket(BUCKET_NAME)
-                        new_blob = bucket.copy_blob(
-                            source_blob,
-                            destination_bucket,
-                            new_name=DESTINATION_BLOB_NAME,
-                        )
+                        # server-side: no bytes pass through this process
+                        with gcs_span("copy", BUCKET_NAME, DESTINATION_BLOB_NAME):
+                            new_blob = await asyncio.to_thread(
+                                bucket.copy_blob,
+                                source_blob,
+                                bucket,
+                                new_name=DESTINATION_BLOB_NAME,
+                            )
                         logging.info(
-                            f"Blob {source_blob} copied to {destination_bucket}/{new_blob.name}"
+                            f"Blob {source_blob.name} copied to {BUCKET_NAME}/{new_blob.name}"
                         )
 
+                        # store the report thumbnail now, reading as little of the video as possible
+                        try:
+                            with scratch_dir(prefix="video_") as tmp:
+                                await asyncio.to_thread(
+                                    _store_video_thumbnail,
+                                    source_blob,
+                                    tmp,
+                                    _thumbnail_blob_name(DESTINATION_BLOB_NAME),
+                                )
+                        except Exception as e:
+                            logging.warning(
+                                f"Could not store thumbnail for '{artifact_key}': {e}"
+                            )
+
                     return {"status": "ok", "artifact_key": f"{artifact_key}"}
 
+    return {"status": "failed"}
+
+
+@traced_tool
+async def generate_video(
+    prompt: str,
+    concept_name: str,
+    tool_context: ToolContext,
+    number_of_videos: int = 1,
+    # aspect_ratio: str = "16:9",
+    negative_prompt: str = "",
+    existing_image_filename: str = "",
+):
+    f"""Generates a video based on the prompt for {config.video_gen_model}.
+
+    Args:
+        prompt (str): The prompt to generate the video from.
+        concept_name (str, optional): The name of the creative/visual concept.
+        tool_context (ToolContext): The tool context.
+        number_of_videos (int, optional): The number of videos to generate. Defaults to 1.
+        negative_prompt (str, optional): The negative prompt to use. Defaults to "".
+
+    Returns:
+        dict: Status and the `artifact_key` of the generated video.
+    """
+    # Create output filename
+    if concept_name:
+        filename_prefix = f"{concept_name.replace(",", "").replace(" ", "_")}"
+    else:
+        filename_prefix = f"{str(uuid.uuid4())[:8]}"
+
+    try:
+        operation = await _submit_video_operation(
+            prompt=prompt,
+            number_of_videos=number_of_videos,
+            negative_prompt=negative_prompt,
+            existing_image_filename=existing_image_filename,
+        )
+        operation = await _poll_video_operation(operation)
+    except TimeoutError:
+        return {
+            "status": f"failed due to timeout after {config.video_gen_timeout_seconds} seconds"
+        }
+
+    return await _save_generated_video(operation, filename_prefix, tool_context)
+
+
+async def _generate_visual_concept(
+    concept: dict, tool_context: ToolContext, semaphores: dict
+) -> dict:
+    # one selected visual concept -> one image or video, bounded by its model's semaphore
+    concept_name = concept.get("name", "")
+    if str(concept.get("type", "")).lower() == "video":
+        model, generate = config.video_gen_model, generate_video
+    else:
+        model, generate = config.image_gen_model, generate_image
+    try:
+        async with semaphores[model]:
+            result = await generate(
+                prompt=concept["prompt"],
+                concept_name=concept_name,
+                tool_context=tool_context,
+            )
+    except Exception as e:
+        logging.exception(f"generation failed for visual concept '{concept_name}'")
+        result = {"status": f"failed due to error: {e}"}
+    return {"name": concept_name, "type": concept.get("type", "image"), **result}
+
+
+@traced_tool
+async def generate_selected_visuals(tool_context: ToolContext) -> dict:
+    """
+    Generates every visual concept in the 'final_select_vis_concepts' state key at once.
+
+    Images and videos are generated concurrently, with at most `config.image_gen_concurrency`
+    images and `config.video_gen_concurrency` videos in flight. Results are listed in the
+    order they completed and written to the 'visual_generation_results' state key when the tool returns.
+
+    Args:
+        tool_context (ToolContext): The tool context.
 
+    Returns:
+        dict: Status and, for each concept, its name, type, status and `artifact_key`.
+    """
+    concepts = tool_context.state.get(
+        "final_select_vis_concepts", {"final_select_vis_concepts": []}
+    )["final_select_vis_concepts"]
+    if not concepts:
+        return {"status": "failed: no visual concepts in 'final_select_vis_concepts'"}
+
+    semaphores = {
+        config.image_gen_model: asyncio.Semaphore(config.image_gen_concurrency),
+        config.video_gen_model: asyncio.Semaphore(config.video_gen_concurrency),
+    }
+    tasks = [
+        _generate_visual_concept(concept, tool_context, semaphores)
+        for concept in concepts
+    ]
+    results = []
+    for next_done in asyncio.as_completed(tasks):
+        result = await next_done
+        logging.info(f"visual concept '{result['name']}': {result['status']}")
+        results.append(result)
+    # ADK applies a tool's state changes when it returns, so the state is written once
+    tool_context.state["visual_generation_results"] = results
+
+    status = "ok" if all(r["status"] == "ok" for r in results) else "partial"
+    return {"status": status, "results": results}
+
+
+@traced_tool
 async def save_img_artifact_key(
     artifact_key_dict: dict,
     tool_context: ToolContext,
@@ -295,12 +515,15 @@ async def save_img_artifact_key(
     Returns:
         dict: the status of this functions overall outcome.
     """
-    existing_img_artifact_keys = tool_context.state.get("img_artifact_keys", {"img_artifact_keys": []})
+    existing_img_artifact_keys = tool_context.state.get(
+        "img_artifact_keys", {"img_artifact_keys": []}
+    )
     existing_img_artifact_keys["img_artifact_keys"].append(artifact_key_dict)
     tool_context.state["img_artifact_keys"] = existing_img_artifact_keys
     return {"status": "ok"}
 
 
+@traced_tool
 async def save_vid_artifact_key(
     artifact_key_dict: dict,
     tool_context: ToolContext,
@@ -325,7 +548,9 @@ async def save_vid_artifact_key(
     Returns:
         dict: the status of this functions overall outcome.
     """
-    existing_vid_artifact_keys = tool_context.state.get("vid_artifact_keys", {"vid_artifact_keys": []})
+    existing_vid_artifact_keys = tool_context.state.get(
+        "vid_artifact_keys", {"vid_artifact_keys": []}
+    )
     existing_vid_artifact_keys["vid_artifact_keys"].append(artifact_key_dict)
     tool_context.state["vid_artifact_keys"] = existing_vid_artifact_keys
     return {"status": "ok"}
@@ -361,11 +586,84 @@ def extract_single_frame(video_path, frame_number, output_image_path) -> str:
         logging.info(f"Error: Could not read frame {frame_number} from {video_path}")
 
     cap.release()
-    cv2.destroyAllWindows()
 
     return output_image_path
 
 
+def _fetch_report_image(gcs_folder: str, artifact_key: str, local_dir: str) -> str:
+    # downloads an image creative for the report; returns its local path
+    local_path = os.path.join(local_dir, artifact_key)
+    download_image_from_gcs(
+        source_blob_name=os.path.join(gcs_folder, artifact_key),
+        destination_file_name=local_path,
+    )
+    return local_path
+
+
+async def _run_in_threads(calls: list, limit: int) -> list:
+    """
+    Runs blocking `(fn, *args)` calls in threads, at most `limit` at once, without blocking the event loop.
+
+    If a call fails, calls not yet started are skipped and the running ones are awaited before the
+    error is raised, so no thread outlives the caller's scratch dir. The same holds on cancellation.
+
+    Returns:
+        list: each call's result, in the order of `calls`.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    failed = False
+
+    async def run(fn, *args):
+        nonlocal failed
+        async with semaphore:
+            if failed:
+                return None
+            thread_call = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+            try:
+                return await asyncio.shield(thread_call)
+            except asyncio.CancelledError:
+                # a running thread cannot be stopped; let it finish first
+                await asyncio.wait([thread_call])
+                raise
+            except Exception:
+                failed = True
+                raise
+
+    results = await asyncio.gather(
+        *(run(*call) for call in calls), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def _fetch_video_thumbnail(gcs_folder: str, artifact_key: str, local_dir: str) -> str:
+    """
+    Fetches a video creative's thumbnail for the report; returns its local path.
+
+    Uses the thumbnail stored by `generate_video` when there is one, otherwise extracts
+    one from as little of the video as possible.
+    """
+    bucket = get_storage_client().bucket(GCS_BUCKET.replace("gs://", ""))
+    video_blob_name = os.path.join(gcs_folder, artifact_key)
+    local_frame_path = os.path.join(local_dir, artifact_key.replace(".mp4", ".png"))
+    thumbnail_blob_name = _thumbnail_blob_name(video_blob_name)
+    try:
+        with gcs_span("download", GCS_BUCKET, thumbnail_blob_name) as span:
+            bucket.blob(thumbnail_blob_name).download_to_filename(local_frame_path)
+            span.set_attribute("gcs.bytes", os.path.getsize(local_frame_path))
+        return local_frame_path
+    except NotFound:
+        logging.info(f"No stored thumbnail for '{artifact_key}'; reading the video")
+
+    local_vid_path = os.path.join(local_dir, artifact_key)
+    return _extract_frame_from_blob(
+        bucket.blob(video_blob_name), local_vid_path, local_frame_path
+    )
+
+
+@traced_tool
 async def save_creatives_and_research_report(tool_context: ToolContext) -> dict:
     """
     Saves generated PDF report bytes as an artifact.
@@ -380,175 +678,175 @@ async def save_creatives_and_research_report(tool_context: ToolContext) -> dict:
     gcs_folder = tool_context.state["gcs_folder"]
 
     try:
-
-        DIR = f"report_creatives"
-
-        # ==================== #
-        # get image creatives
-        # ==================== #
-        IMG_SUBDIR = f"{DIR}/imgs"
-        if not os.path.exists(IMG_SUBDIR):
-            os.makedirs(IMG_SUBDIR)
-
-        # get artifact details
-        img_artifact_state_dict = tool_context.state.get("img_artifact_keys")
-        img_artifact_list = img_artifact_state_dict["img_artifact_keys"]
-
-        IMG_CREATIVE_STRING = ""
-        for entry in img_artifact_list:
-            logging.info(entry)
-            LOCAL_FILE_PATH = os.path.join(IMG_SUBDIR, entry["artifact_key"])
-            ARTIFACT_KEY_NAME = entry["artifact_key"].replace(".png", "")
-            # download locally
-            download_image_from_gcs(
-                source_blob_name=os.path.join(gcs_folder, entry["artifact_key"]),
-                destination_file_name=LOCAL_FILE_PATH,
-            )
-            # TODO: optimize
-            path_str = f"![Example Image]({LOCAL_FILE_PATH})\n"
-            str_1 = f"## {entry["headline"]}\n"
-            str_2 = (
-                f"*{os.path.join(GCS_BUCKET, gcs_folder, entry["artifact_key"])}*\n\n"
-            )
-            str_3 = f"{path_str}\n\n"
-            str_4 = f"**{entry["caption"]}**\n\n"
-            str_5 = f"**Trend(s):** {entry["trend"]}\n\n"
-            str_6 = f"**Visual Concept:** {entry["concept"]}\n\n"
-            str_7 = f"**How it markets target product:** {entry["markets_product"]}\n\n"
-            str_8 = f"**Target audience appeal:** {entry["audience_appeal"]}\n\n"
-            str_9 = f"**Why this will perform well:** {entry["rationale_perf"]}\n\n"
-            str_10 = f"**Prompt:** {entry["img_prompt"]}\n\n"
-            result = (
-                str_1
-                + " "
-                + str_2
-                + " "
-                + str_3
-                + " "
-                + str_4
-                + " "
-                + str_5
-                + " "
-                + str_6
-                + " "
-                + str_7
-                + " "
-                + str_8
-                + " "
-                + str_9
-                + " "
-                + str_10
-            )
-
-            IMG_CREATIVE_STRING += result
-
-        # ==================== #
-        # get video creatives
-        # ==================== #
-        VID_SUBDIR = f"{DIR}/vids"
-        if not os.path.exists(VID_SUBDIR):
-            os.makedirs(VID_SUBDIR)
-
-        # get artifact details
-        vid_artifact_state_dict = tool_context.state.get("vid_artifact_keys")
-        vid_artifact_list = vid_artifact_state_dict["vid_artifact_keys"]
-
-        VID_CREATIVE_STRING = ""
-        for entry in vid_artifact_list:
-            logging.info(entry)
-            LOCAL_VID_PATH = os.path.join(VID_SUBDIR, entry["artifact_key"])
-            ARTIFACT_KEY_NAME = entry["artifact_key"].replace(".mp4", "")
-            # download locally
-            download_image_from_gcs(
-                source_blob_name=os.path.join(gcs_folder, entry["artifact_key"]),
-                destination_file_name=LOCAL_VID_PATH,
+        # private to this call; removed with its contents when the block exits
+        with scratch_dir(prefix="report_creatives_") as DIR:
+
+            IMG_SUBDIR = os.path.join(DIR, "imgs")
+            VID_SUBDIR = os.path.join(DIR, "vids")
+            os.makedirs(IMG_SUBDIR, exist_ok=True)
+            os.makedirs(VID_SUBDIR, exist_ok=True)
+
+            # get artifact details
+            img_artifact_state_dict = tool_context.state.get("img_artifact_keys")
+            img_artifact_list = img_artifact_state_dict["img_artifact_keys"]
+            vid_artifact_state_dict = tool_context.state.get("vid_artifact_keys")
+            vid_artifact_list = vid_artifact_state_dict["vid_artifact_keys"]
+
+            # ==================== #
+            # fetch creatives concurrently
+            # ==================== #
+            # a video's thumbnail is extracted by the worker that downloaded it,
+            # overlapping frame extraction with the remaining downloads
+            fetched = await _run_in_threads(
+                [
+                    (_fetch_report_image, gcs_folder, entry["artifact_key"], IMG_SUBDIR)
+                    for entry in img_artifact_list
+                ]
+                + [
+                    (_fetch_video_thumbnail, gcs_folder, entry["artifact_key"], VID_SUBDIR)
+                    for entry in vid_artifact_list
+                ],
+                limit=config.report_download_workers,
             )
-            LOCAL_FRAME_PATH = os.path.join(VID_SUBDIR, f"{ARTIFACT_KEY_NAME}.png")
-            LOCAL_VID_FRAME = extract_single_frame(LOCAL_VID_PATH, 1, LOCAL_FRAME_PATH)
+            img_paths = fetched[: len(img_artifact_list)]
+            vid_frames = fetched[len(img_artifact_list) :]
+
+            # ==================== #
+            # get image creatives
+            # ==================== #
+            IMG_CREATIVE_STRING = ""
+            for entry, LOCAL_FILE_PATH in zip(img_artifact_list, img_paths):
+                logging.info(entry)
+                path_str = (
+                    f"![Example Image]({os.path.relpath(LOCAL_FILE_PATH, DIR)})\n"
+                )
+                str_1 = f"## {entry["headline"]}\n"
+                str_2 = f"*{os.path.join(GCS_BUCKET, gcs_folder, entry["artifact_key"])}*\n\n"
+                str_3 = f"{path_str}\n\n"
+                str_4 = f"**{entry["caption"]}**\n\n"
+                str_5 = f"**Trend(s):** {entry["trend"]}\n\n"
+                str_6 = f"**Visual Concept:** {entry["concept"]}\n\n"
+                str_7 = (
+                    f"**How it markets target product:** {entry["markets_product"]}\n\n"
+                )
+                str_8 = f"**Target audience appeal:** {entry["audience_appeal"]}\n\n"
+                str_9 = f"**Why this will perform well:** {entry["rationale_perf"]}\n\n"
+                str_10 = f"**Prompt:** {entry["img_prompt"]}\n\n"
+                result = (
+                    str_1
+                    + " "
+                    + str_2
+                    + " "
+                    + str_3
+                    + " "
+                    + str_4
+                    + " "
+                    + str_5
+                    + " "
+                    + str_6
+                    + " "
+                    + str_7
+                    + " "
+                    + str_8
+                    + " "
+                    + str_9
+                    + " "
+                    + str_10
+                )
 
-            path_str = f"![Thumbnail Image]({LOCAL_VID_FRAME})\n"
-            str_1 = f"## {entry["headline"]}\n"
-            str_2 = (
-                f"*{os.path.join(GCS_BUCKET, gcs_folder, entry["artifact_key"])}*\n\n"
-            )
-            str_3 = f"{path_str}\n\n"
-            str_4 = f"**{entry["caption"]}**\n\n"
-            str_5 = f"**Trend(s):** {entry["trend"]}\n\n"
-            str_6 = f"**Visual Concept:** {entry["concept"]}\n\n"
-            str_7 = f"**How it markets target product:** {entry["markets_product"]}\n\n"
-            str_8 = f"**Target audience appeal:** {entry["audience_appeal"]}\n\n"
-            str_9 = f"**Why this will perform well:** {entry["rationale_perf"]}\n\n"
-            str_10 = f"**Prompt:** {entry["vid_prompt"]}\n\n"
-
-            result = (
-                str_1
-                + " "
-                + str_2
-                + " "
-                + str_3
-                + " "
-                + str_4
-                + " "
-                + str_5
-                + " "
-                + str_6
-                + " "
-                + str_7
-                + " "
-                + str_8
-                + " "
-                + str_9
-                + " "
-                + str_10
-            )
+                IMG_CREATIVE_STRING += result
 
-            VID_CREATIVE_STRING += result
+            # ==================== #
+            # get video creatives
+            # ==================== #
+            VID_CREATIVE_STRING = ""
+            for entry, LOCAL_VID_FRAME in zip(vid_artifact_list, vid_frames):
+                logging.info(entry)
 
-        # ==================== #
-        # create local PDF file
-        # ==================== #
-        artifact_key = "final_trends_and_creatives_report.pdf"
-        report_filepath = f"{DIR}/{artifact_key}"
+                path_str = (
+                    f"![Thumbnail Image]({os.path.relpath(LOCAL_VID_FRAME, DIR)})\n"
+                )
+                str_1 = f"## {entry["headline"]}\n"
+                str_2 = f"*{os.path.join(GCS_BUCKET, gcs_folder, entry["artifact_key"])}*\n\n"
+                str_3 = f"{path_str}\n\n"
+                str_4 = f"**{entry["caption"]}**\n\n"
+                str_5 = f"**Trend(s):** {entry["trend"]}\n\n"
+                str_6 = f"**Visual Concept:** {entry["concept"]}\n\n"
+                str_7 = (
+                    f"**How it markets target product:** {entry["markets_product"]}\n\n"
+                )
+                str_8 = f"**Target audience appeal:** {entry["audience_appeal"]}\n\n"
+                str_9 = f"**Why this will perform well:** {entry["rationale_perf"]}\n\n"
+                str_10 = f"**Prompt:** {entry["vid_prompt"]}\n\n"
+
+                result = (
+                    str_1
+                    + " "
+                    + str_2
+                    + " "
+                    + str_3
+                    + " "
+                    + str_4
+                    + " "
+                    + str_5
+                    + " "
+                    + str_6
+                    + " "
+                    + str_7
+                    + " "
+                    + str_8
+                    + " "
+                    + str_9
+                    + " "
+                    + str_10
+                )
 
-        # create PDF object
-        pdf = MarkdownPdf(toc_level=4)
-        pdf.add_section(Section(f" {processed_report}\n"))
-        pdf.add_section(
-            Section(f"# Ad Creatives\n\n{IMG_CREATIVE_STRING}\n\n{VID_CREATIVE_STRING}")
-        )
-        pdf.meta["title"] = "[Final] trends-2-creatives Report"
-        pdf.save(report_filepath)
+                VID_CREATIVE_STRING += result
 
-        # open pdf and read bytes for types.Part() object
-        with open(report_filepath, "rb") as f:
-            document_bytes = f.read()
+            # ==================== #
+            # create PDF
+            # ==================== #
+            artifact_key = "final_trends_and_creatives_report.pdf"
 
-        # artifact build
-        document_part = types.Part(
-            inline_data=types.Blob(data=document_bytes, mime_type="application/pdf")
-        )
-        version = await tool_context.save_artifact(
-            filename=artifact_key, artifact=document_part
-        )
-        logging.info(
-            f"\n\nSaved report artifact: '{artifact_key}' as version {version}\n\n"
-        )
-        upload_blob_to_gcs(
-            source_file_name=report_filepath,
-            destination_blob_name=os.path.join(gcs_folder, artifact_key),
-        )
-        logging.info(
-            f"\n\nSaved artifact doc '{artifact_key}', version {version}, to folder '{gcs_folder}'\n\n"
-        )
-        # clean up
-        shutil.rmtree(DIR)
-        logging.info(f"Directory '{DIR}' and its contents removed successfully")
-        return {
-            "status": "ok",
-            "gcs_bucket": GCS_BUCKET,
-            "gcs_folder": gcs_folder,
-            "artifact_key": artifact_key,
-        }
+            # create PDF object; creative paths resolve against the scratch dir
+            pdf = MarkdownPdf(toc_level=4)
+            pdf.add_section(Section(f" {processed_report}\n"))
+            pdf.add_section(
+                Section(
+                    f"# Ad Creatives\n\n{IMG_CREATIVE_STRING}\n\n{VID_CREATIVE_STRING}",
+                    root=DIR,
+                )
+            )
+            pdf.meta["title"] = "[Final] trends-2-creatives Report"
+            buffer = BytesIO()
+            pdf.save_bytes(buffer)
+            document_bytes = buffer.getvalue()
+
+            # artifact build
+            document_part = types.Part(
+                inline_data=types.Blob(data=document_bytes, mime_type="application/pdf")
+            )
+            version = await tool_context.save_artifact(
+                filename=artifact_key, artifact=document_part
+            )
+            logging.info(
+                f"\n\nSaved report artifact: '{artifact_key}' as version {version}\n\n"
+            )
+            await asyncio.to_thread(
+                upload_bytes_to_gcs,
+                data=document_bytes,
+                destination_blob_name=os.path.join(gcs_folder, artifact_key),
+                content_type="application/pdf",
+            )
+            logging.info(
+                f"\n\nSaved artifact doc '{artifact_key}', version {version}, to folder '{gcs_folder}'\n\n"
+            )
+            return {
+                "status": "ok",
+                "gcs_bucket": GCS_BUCKET,
+                "gcs_folder": gcs_folder,
+                "artifact_key": artifact_key,
+            }
     except Exception as e:
         logging.error(f"Error saving artifact: {e}")
         return {"status": "failed", "error": str(e)}
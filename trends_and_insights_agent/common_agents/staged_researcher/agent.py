@@ -1,5 +1,6 @@
 import datetime
 import logging
+from typing import AsyncGenerator
 
 logging.basicConfig(level=logging.INFO)
 
@@ -7,7 +8,11 @@ from google.genai import types
 from google.adk.tools import google_search
 from google.adk.planners import BuiltInPlanner
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.agents import Agent, SequentialAgent, ParallelAgent
+from google.adk.events import Event, EventActions
+from google.adk.agents import Agent, BaseAgent, SequentialAgent, ParallelAgent
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.utils.instructions_utils import inject_session_state
 
 from trends_and_insights_agent.shared_libraries.config import config
 from trends_and_insights_agent.shared_libraries import callbacks, schema_types
@@ -25,31 +30,44 @@ parallel_planner_agent = ParallelAgent(
     description="Runs multiple research planning agents in parallel.",
 )
 
-merge_planners = Agent(
-    name="merge_planners",
-    model=config.worker_model,
-    # include_contents="none",
-    description="Combine results from state keys 'campaign_web_search_insights', 'gs_web_search_insights', and 'yt_web_search_insights'",
-    instruction="""You are an AI Assistant responsible for combining initial research findings into a comprehensive summary.
-    Your primary task is to organize the following research summaries, clearly attributing findings to their source areas. 
-    Structure your response using headings for each topic. Ensure the report is coherent and integrates the key points smoothly.
 
-    ---
-    **Output Format:**
+class StateTemplateAgent(BaseAgent):
+    """Fills `template` from session state and saves the result to `output_key`, without a model call.
 
-    # Summary of Campaign and Trend Research
+    Placeholders follow the `{state_key}` syntax of `Agent` instructions.
+    """
 
-    ## Campaign Guide
-    {campaign_web_search_insights}
+    template: str
+    output_key: str
 
-    ## Search Trend
-    {gs_web_search_insights}
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        text = await inject_session_state(self.template, ReadonlyContext(ctx))
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta={self.output_key: text}),
+        )
 
-    ## YouTube Trends Findings
-    {yt_web_search_insights}
 
-    Output *only* the structured report following this format. Do not include introductory or concluding phrases outside this structure, and strictly adhere to using only the provided input summary content.
-    """,
+# concatenates the parallel findings under fixed headings; no LLM round-trip
+merge_planners = StateTemplateAgent(
+    name="merge_planners",
+    description="Combine results from state keys 'campaign_web_search_insights', 'gs_web_search_insights', and 'yt_web_search_insights'",
+    template="""# Summary of Campaign and Trend Research
+
+## Campaign Guide
+{campaign_web_search_insights}
+
+## Search Trend
+{gs_web_search_insights}
+
+## YouTube Trends Findings
+{yt_web_search_insights}
+""",
     output_key="combined_web_search_insights",
 )
 
@@ -1,6 +1,7 @@
 import os
-import shutil
+import asyncio
 import logging
+from io import BytesIO
 from markdown_pdf import MarkdownPdf, Section
 
 logging.basicConfig(level=logging.INFO)
@@ -8,7 +9,8 @@ logging.basicConfig(level=logging.INFO)
 from google.genai import types
 from google.adk.tools import ToolContext
 
-from ...shared_libraries.utils import upload_blob_to_gcs
+from ...shared_libraries.tracing import traced_tool
+from ...shared_libraries.utils import upload_bytes_to_gcs
 
 # Get the cloud storage bucket from the environment variable
 try:
@@ -18,6 +20,7 @@ except KeyError:
 
 
 # --- Tools ---
+@traced_tool
 async def save_draft_report_artifact(tool_context: ToolContext) -> dict:
     """
     Saves generated PDF report bytes as an artifact.
@@ -30,24 +33,16 @@ async def save_draft_report_artifact(tool_context: ToolContext) -> dict:
     """
     processed_report = tool_context.state["final_report_with_citations"]
 
-    # create local dir to save PDF file
+    # render the PDF in memory; nothing is written to local disk
     try:
-        DIR = "files"
-        SUBDIR = f"{DIR}/research"
-        if not os.path.exists(SUBDIR):
-            os.makedirs(SUBDIR)
-
         artifact_key = "draft_research_report_with_citations.pdf"
-        filepath = f"{SUBDIR}/{artifact_key}"
 
         pdf = MarkdownPdf(toc_level=4)
         pdf.add_section(Section(f" {processed_report}\n"))
         pdf.meta["title"] = "[Draft] Trend & Campaign Research Report"
-        pdf.save(filepath)
-
-        # open pdf and read bytes for types.Part() object
-        with open(filepath, "rb") as f:
-            document_bytes = f.read()
+        buffer = BytesIO()
+        pdf.save_bytes(buffer)
+        document_bytes = buffer.getvalue()
 
         document_part = types.Part(
             inline_data=types.Blob(data=document_bytes, mime_type="application/pdf")
@@ -57,15 +52,16 @@ async def save_draft_report_artifact(tool_context: ToolContext) -> dict:
         )
         gcs_folder = tool_context.state["gcs_folder"]
 
-        upload_blob_to_gcs(
-            source_file_name=filepath,
+        await asyncio.to_thread(
+            upload_bytes_to_gcs,
+            data=document_bytes,
             destination_blob_name=os.path.join(gcs_folder, artifact_key),
+            content_type="application/pdf",
         )
         logging.info(
             f"\n\nSaved artifact doc '{artifact_key}', version {version}, to folder '{gcs_folder}' \n\n"
         )
 
-        shutil.rmtree(DIR)
         return {
             "status": "ok",
             "gcs_bucket": GCS_BUCKET,
@@ -9,6 +9,7 @@ from .tools import (
     memorize,
     get_daily_gtrends,
     get_youtube_trends,
+    get_youtube_trends_by_region,
     save_yt_trends_to_session_state,
     save_search_trends_to_session_state,
 )
@@ -25,6 +26,7 @@ trends_and_insights_agent = Agent(
         memorize,
         get_daily_gtrends,
         get_youtube_trends,
+        get_youtube_trends_by_region,
         save_yt_trends_to_session_state,
         save_search_trends_to_session_state,
     ],
@@ -21,6 +21,7 @@ Your **objective** is to use the **available tools** to complete the **instructi
 ## Available Tools
 *   `get_daily_gtrends`: Use this tool to extract the top trends from Google Search for the current week.
 *   `get_youtube_trends`: Use this tool to query the YouTube Data API for the top trending YouTube videos.
+*   `get_youtube_trends_by_region`: Use this tool instead of `get_youtube_trends` when the user wants to compare trending YouTube videos across several regions.
 *   `save_yt_trends_to_session_state`: Use this tool to update the 'target_yt_trends' state variable with the user-selected video(s) trending on YouTube.
 *   `save_search_trends_to_session_state`: Use this tool to update the 'target_search_trends' state variable with the user-selected Search Trend.
 *   `memorize`: Use this tool to store user selections in the session state.
@@ -1,34 +1,18 @@
-import os
 import logging
+import datetime
 
 logging.basicConfig(level=logging.INFO)
 
-import googleapiclient.discovery
-from google.cloud import bigquery
 from google.adk.tools import ToolContext
 
 from ...shared_libraries.config import config
-from ...shared_libraries.secrets import access_secret_version
-
-
-# ========================
-# clients
-# ========================
-try:
-    yt_secret_id = os.environ["YT_SECRET_MNGR_NAME"]
-except KeyError:
-    raise Exception("YT_SECRET_MNGR_NAME environment variable not set")
-
-# youtube client
-YOUTUBE_DATA_API_KEY = access_secret_version(secret_id=yt_secret_id, version_id="1")
-youtube_client = googleapiclient.discovery.build(
-    serviceName="youtube", version="v3", developerKey=YOUTUBE_DATA_API_KEY
-)
-
-BQ_PROJECT = os.environ["GOOGLE_CLOUD_PROJECT"]
-bq_client = bigquery.Client(project=BQ_PROJECT)
+from ...shared_libraries.cache import TTLCache
+from ...shared_libraries.clients import get_bq_client
+from ...shared_libraries.tracing import add_span_attributes, traced_tool
+from ...shared_libraries.youtube import start_trends_refresh, trending_charts
 
 
+@traced_tool
 def memorize(key: str, value: str, tool_context: ToolContext):
     """
     Memorize pieces of information, one key-value pair at a time.
@@ -46,6 +30,7 @@ def memorize(key: str, value: str, tool_context: ToolContext):
     return {"status": f'Stored "{key}": "{value}"'}
 
 
+@traced_tool
 async def save_yt_trends_to_session_state(
     selected_trends: dict, tool_context: ToolContext
 ) -> dict:
@@ -70,7 +55,22 @@ async def save_yt_trends_to_session_state(
     return {"status": "ok"}
 
 
-def get_youtube_trends(
+def _trend_rows(videos: list) -> dict:
+    # TODO: only return select fields
+    return {
+        f"row_{i}": {
+            "videoId": video["id"],
+            "videoTitle": video["snippet"]["title"],
+            # 'videoDescription': video['snippet']['description'],
+            "duration": video["contentDetails"]["duration"],
+            "videoURL": f"https://www.youtube.com/watch?v={video['id']}",
+        }
+        for i, video in enumerate(videos, start=1)
+    }
+
+
+@traced_tool
+async def get_youtube_trends(
     region_code: str = "US",
     max_results: int = config.max_results_yt_trends,
 ) -> dict:
@@ -86,36 +86,32 @@ def get_youtube_trends(
     Returns:
         dict: The response from the YouTube Data API.
     """
+    # charts are cached per region and revalidated with their ETag; see `shared_libraries/youtube.py`
+    start_trends_refresh()
+    return _trend_rows(await trending_charts.aget(region_code, max_results))
 
-    request = youtube_client.videos().list(
-        part="snippet,contentDetails",  # statistics
-        chart="mostPopular",
-        regionCode=region_code,
-        maxResults=max_results,
-    )
-    trend_response = request.execute()
-    # return trend_response
 
-    # TODO: only return select fields
-    trend_dict = {}
-    i = 1
-    for video in trend_response["items"]:
-        row_name = f"row_{i}"
-        trend_dict.update(
-            {
-                row_name: {
-                    "videoId": video["id"],
-                    "videoTitle": video["snippet"]["title"],
-                    # 'videoDescription': video['snippet']['description'],
-                    "duration": video["contentDetails"]["duration"],
-                    "videoURL": f"https://www.youtube.com/watch?v={video['id']}",
-                }
-            }
-        )
-        i += 1
-    return trend_dict
+@traced_tool
+async def get_youtube_trends_by_region(
+    region_codes: list[str],
+    max_results: int = config.max_results_yt_trends,
+) -> dict:
+    """
+    Gets the most popular YouTube videos for several regions at once.
 
+    Args:
+        region_codes (list[str]): ISO 3166-1 alpha-2 country codes of the regions to compare e.g., ['US', 'GB', 'DE'].
+        max_results (int): The number of video results to return per region.
 
+    Returns:
+        dict: region code -> that region's trending videos, in the same format as `get_youtube_trends`.
+    """
+    start_trends_refresh()
+    charts = await trending_charts.aget_many(region_codes, max_results)
+    return {region: _trend_rows(videos) for region, videos in charts.items()}
+
+
+@traced_tool
 async def save_search_trends_to_session_state(
     new_trends: dict, tool_context: ToolContext
 ) -> dict:
@@ -143,25 +139,106 @@ async def save_search_trends_to_session_state(
 # ==============================
 # Google Search Trends (context)
 # =============================
-def get_gtrends_max_date() -> str:
+GTRENDS_TABLE = "bigquery-public-data.google_trends.top_terms"
+
+# process-wide: results keyed on the table's modified time or a refresh date never go
+# stale; only the "max_date" entry expires, which re-runs the cheap metadata probe
+_gtrends_cache = TTLCache(ttl_seconds=config.gtrends_cache_ttl_seconds, maxsize=16)
+
+
+def _query_gtrends_max_date() -> str:
     query = f"""
         SELECT 
          MAX(refresh_date) as max_date
-        FROM `bigquery-public-data.google_trends.top_terms`
+        FROM `{GTRENDS_TABLE}`
     """
-    max_date = bq_client.query(query).to_dataframe()
-    return max_date.iloc[0][0].strftime("%m/%d/%Y")
+    rows = get_bq_client().query_and_wait(query)
+    return next(iter(rows))["max_date"].strftime("%m/%d/%Y")
 
 
-max_date = get_gtrends_max_date()
+def _lookup_gtrends_max_date() -> str:
+    # table metadata is a free API call; only re-run the aggregate when the table changed
+    modified = get_bq_client().get_table(GTRENDS_TABLE).modified
+    return _gtrends_cache.get_or_compute(
+        ("max_date", modified), _query_gtrends_max_date, ttl=None
+    )
 
 
-def get_daily_gtrends(today_date: str = max_date) -> dict:
+def get_gtrends_max_date() -> str:
+    return _gtrends_cache.get_or_compute("max_date", _lookup_gtrends_max_date)
+
+
+def _markdown_table(headers: list, rows: list) -> str:
+    """Renders rows as a pipe table, laid out like `DataFrame.to_markdown(index=True)`."""
+    rows = [[i, *row] for i, row in enumerate(rows, start=1)]
+    headers = ["", *headers]
+    columns = list(zip(*rows)) if rows else [()] * len(headers)
+    numeric = [
+        bool(col) and all(isinstance(v, (int, float)) for v in col) for col in columns
+    ]
+    widths = [
+        max([len(header) + 2, *(len(str(v)) for v in col)])
+        for header, col in zip(headers, columns)
+    ]
+
+    def line(cells) -> str:
+        padded = (
+            f" {str(cell):>{width}} " if right else f" {str(cell):<{width}} "
+            for cell, width, right in zip(cells, widths, numeric)
+        )
+        return "|" + "|".join(padded) + "|"
+
+    rule = (
+        "-" * (width + 1) + ":" if right else ":" + "-" * (width + 1)
+        for width, right in zip(widths, numeric)
+    )
+    lines = [line(headers), "|" + "|".join(rule) + "|"]
+    return "\n".join(lines + [line(row) for row in rows])
+
+
+def _query_daily_gtrends(max_date: str) -> str:
+    # imported on first use: the BigQuery library loads pandas whenever it is installed
+    from google.cloud import bigquery
+
+    query = f"""
+        SELECT
+          term,
+          refresh_date,
+          ARRAY_AGG(STRUCT(rank,week) ORDER BY week DESC LIMIT 1) x
+        FROM `{GTRENDS_TABLE}`
+        WHERE refresh_date = @refresh_date
+        GROUP BY term, refresh_date
+        ORDER BY (SELECT rank FROM UNNEST(x))
+        """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter(
+                "refresh_date",
+                "DATE",
+                datetime.datetime.strptime(max_date, "%m/%d/%Y").date(),
+            )
+        ]
+    )
+    # runs on the calling thread only on a cache miss
+    add_span_attributes({"cache.hit": False})
+    rows = get_bq_client().query_and_wait(query, job_config=job_config)
+    return _markdown_table(
+        ["term", "rank", "refresh_date"],
+        [
+            (row["term"], rank, row["refresh_date"])
+            for rank, row in enumerate(rows, start=1)
+        ],
+    )
+
+
+@traced_tool
+def get_daily_gtrends(today_date: str = "") -> dict:
     """
     Retrieves the top 25 Google Search Trends (term, rank, refresh_date).
 
     Args:
-        today_date: Today's date in the format 'MM/DD/YYYY'. Use the default value provided.
+        today_date: Today's date in the format 'MM/DD/YYYY'. Use the default value provided;
+            the latest refresh date is looked up when the tool runs.
 
     Returns:
         dict: key is the latest date for the trends, the value is a markdown table containing the Google Search Trends.
@@ -173,24 +250,13 @@ def get_daily_gtrends(today_date: str = max_date) -> dict:
     # max_date = "07/15/2025"
     logging.info(f"\n\nmax_date in trends_assistant: {max_date}\n\n")
 
-    query = f"""
-        SELECT
-          term,
-          refresh_date,
-          ARRAY_AGG(STRUCT(rank,week) ORDER BY week DESC LIMIT 1) x
-        FROM `bigquery-public-data.google_trends.top_terms`
-        WHERE refresh_date = PARSE_DATE('%m/%d/%Y',  '{max_date}')
-        GROUP BY term, refresh_date
-        ORDER BY (SELECT rank FROM UNNEST(x))
-        """
+    add_span_attributes({"gtrends.refresh_date": max_date, "cache.hit": True})
     try:
-        df_t = bq_client.query(query).to_dataframe()
-        df_t.index += 1
-        df_t["rank"] = df_t.index
-        df_t = df_t.drop("x", axis=1)
-        new_order = ["term", "rank", "refresh_date"]
-        df_t = df_t[new_order]
-        markdown_string = df_t.to_markdown(index=True)
+        markdown_string = _gtrends_cache.get_or_compute(
+            ("daily_gtrends", max_date),
+            lambda: _query_daily_gtrends(max_date),
+            ttl=None,
+        )
     except Exception as e:
         return {"status": "error", "error_message": str(e)}
 
@@ -1,9 +1,33 @@
+from . import cache
 from . import callbacks
+from . import clients
 from . import config
+from . import rate_limiter
+from . import retry
+from . import scratch
 from . import secrets
 from . import schema_types
+from . import tracing
 from . import utils
+from . import youtube
+from . import youtube_async
+from . import youtube_quota
 
 
-__all__ = ["callbacks", "config", "secrets", "schema_types", "utils"]
+__all__ = [
+    "cache",
+    "callbacks",
+    "clients",
+    "config",
+    "rate_limiter",
+    "retry",
+    "scratch",
+    "secrets",
+    "schema_types",
+    "tracing",
+    "utils",
+    "youtube",
+    "youtube_async",
+    "youtube_quota",
+]
 
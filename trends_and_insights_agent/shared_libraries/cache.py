@@ -0,0 +1,298 @@
+"""In-process and persistent caches shared by the agent tools."""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class _InFlight:
+    """A computation that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """Thread-safe, size-bounded cache with per-entry expiry and single-flight loading.
+
+    Concurrent `get_or_compute` calls for the same key share one in-flight
+    computation; failed computations are not cached.
+
+    Args:
+        ttl_seconds (float): default lifetime of an entry. `None` never expires.
+        maxsize (int): maximum number of entries; the least recently used entry is evicted.
+    """
+
+    _NO_TTL = object()
+
+    def __init__(self, ttl_seconds: Optional[float] = None, maxsize: int = 128):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[Any, Optional[float]]] = (
+            OrderedDict()
+        )
+        self._in_flight: dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        # caller holds the lock
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        # caller holds the lock
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for `key`, or `default` if missing or expired."""
+        with self._lock:
+            found, value = self._lookup(key)
+        return value if found else default
+
+    def set(self, key: Hashable, value: Any, ttl: Any = _NO_TTL) -> None:
+        """Stores `value` under `key`, using the cache's default TTL unless `ttl` is given."""
+        with self._lock:
+            self._store(key, value, self.ttl_seconds if ttl is self._NO_TTL else ttl)
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Any], ttl: Any = _NO_TTL
+    ) -> Any:
+        """
+        Returns the cached value for `key`, calling `compute` at most once across threads on a miss.
+
+        Args:
+            key: The cache key.
+            compute: Zero-argument callable producing the value.
+            ttl: Lifetime for this entry. Defaults to the cache's `ttl_seconds`; `None` never expires.
+
+        Returns:
+            The cached or freshly computed value.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            in_flight = self._in_flight.get(key)
+            owner = in_flight is None
+            if owner:
+                in_flight = _InFlight()
+                self._in_flight[key] = in_flight
+
+        if not owner:
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.value
+
+        try:
+            in_flight.value = compute()
+        except BaseException as e:
+            in_flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._store(
+                    key,
+                    in_flight.value,
+                    self.ttl_seconds if ttl is self._NO_TTL else ttl,
+                )
+            return in_flight.value
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            in_flight.done.set()
+
+    def clear(self) -> None:
+        """Drops every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# ==============================
+# Persistent result caches
+# ==============================
+def make_cache_key(**parts: Any) -> str:
+    """Returns a content-addressed key (sha256 hex) for the given keyword parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCacheBackend(ABC):
+    """Storage interface for `ResultCache`. Values are text."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Returns the value stored at `key`, or None."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Stores `value` at `key`, replacing any previous value."""
+
+    def evictions(self) -> int:
+        return 0
+
+
+class SQLiteBackend(ResultCacheBackend):
+    """Local SQLite store with size-bounded LRU eviction.
+
+    Args:
+        path (str): location of the database file; parent directories are created.
+        max_bytes (int): total size of stored values above which least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_last_access ON results(last_access)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+            while total > self.max_bytes:
+                oldest = self._conn.execute(
+                    "SELECT key, size FROM results ORDER BY last_access LIMIT 1"
+                ).fetchone()
+                if oldest is None or oldest[0] == key:
+                    break
+                self._conn.execute("DELETE FROM results WHERE key = ?", (oldest[0],))
+                total -= oldest[1]
+                self._evictions += 1
+
+    def evictions(self) -> int:
+        return self._evictions
+
+
+class GCSBackend(ResultCacheBackend):
+    """Stores each entry as a GCS object under `prefix`, shared by every instance.
+
+    Eviction is left to the bucket's lifecycle rules e.g., age-based deletion on `prefix`.
+
+    Args:
+        storage_client: a `google.cloud.storage.Client`.
+        gcs_bucket (str): bucket name, with or without the 'gs://' scheme.
+        prefix (str): object name prefix for cache entries.
+    """
+
+    def __init__(self, storage_client, gcs_bucket: str, prefix: str):
+        self.bucket = storage_client.bucket(gcs_bucket.replace("gs://", ""))
+        self.prefix = prefix.strip("/")
+
+    def get(self, key: str) -> Optional[str]:
+        from google.api_core.exceptions import NotFound
+
+        try:
+            return self.bucket.blob(f"{self.prefix}/{key}").download_as_text()
+        except NotFound:
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        self.bucket.blob(f"{self.prefix}/{key}").upload_from_string(
+            value, content_type="text/plain"
+        )
+
+
+class ResultCache:
+    """Content-addressed result cache with hit/miss metrics over a pluggable backend.
+
+    Backend errors are logged and treated as misses so a broken cache never fails a tool call.
+
+    Args:
+        backend (ResultCacheBackend): where entries are stored.
+        name (str): label used in logs.
+    """
+
+    def __init__(self, backend: ResultCacheBackend, name: str = "results"):
+        self.backend = backend
+        self.name = name
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._counts[metric] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logging.warning(f"`{self.name}` cache read failed: {e}")
+            self._count("errors")
+            value = None
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self.backend.set(key, value)
+            self._count("writes")
+        except Exception as e:
+            logging.warning(f"`{self.name}` cache write failed: {e}")
+            self._count("errors")
+
+    def stats(self) -> dict:
+        """Returns hit/miss/write/error/eviction counters and the hit ratio."""
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        counts["evictions"] = self.backend.evictions()
+        counts["hit_ratio"] = counts["hits"] / lookups if lookups else 0.0
+        return counts
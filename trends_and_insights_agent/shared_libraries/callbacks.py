@@ -1,8 +1,12 @@
 """callbacks - currently exploring how these work by observing log output"""
 
 from typing import Dict, Any, Optional
-import os, re, json, time
-import pandas as pd
+import os, re, json
+import copy
+import time
+import asyncio
+import datetime
+import threading
 import requests
 import logging
 
@@ -13,7 +17,10 @@ from google.adk.sessions.state import State
 from google.adk.models.llm_request import LlmRequest
 from google.adk.agents.callback_context import CallbackContext
 
+from .cache import TTLCache
 from .config import config, setup_config
+from .rate_limiter import get_llm_rate_limiter
+from .tracing import add_span_attributes, traced_callback
 
 
 # Get the cloud storage bucket from the environment variable
@@ -28,12 +35,80 @@ SESSION_STATE_JSON_PATH = os.getenv("SESSION_STATE_JSON_PATH", default=None)
 logging.info(f"\n\n`SESSION_STATE_JSON_PATH`: {SESSION_STATE_JSON_PATH}\n\n")
 
 # TODO: this is a short term fix for deployment to agent space
+PROFILE_PATH = "http://raw.githubusercontent.com/tottenjordan/zghost/refs/heads/deployment-fix-july-25/trends_and_insights_agent/shared_libraries/profiles"
 if SESSION_STATE_JSON_PATH:
-    PROFILE_PATH = "http://raw.githubusercontent.com/tottenjordan/zghost/refs/heads/deployment-fix-july-25/trends_and_insights_agent/shared_libraries/profiles"
     FULL_JSON_PATH = os.path.join(PROFILE_PATH, SESSION_STATE_JSON_PATH)
 else:
     FULL_JSON_PATH = None
 
+# profiles shipped with the package are read from disk, once per process
+PROFILES_DIR = os.path.join(os.path.dirname(__file__), "profiles")
+_local_profiles = TTLCache(ttl_seconds=None, maxsize=32)
+
+# remote profiles: url -> {"etag", "data", "checked_at"}
+_remote_profiles: Dict[str, Dict[str, Any]] = {}
+_remote_profiles_lock = threading.Lock()
+
+
+def _read_local_profile(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _fetch_remote_profile(url: str) -> Dict[str, Any]:
+    """
+    Fetches a remote profile, revalidating it with its ETag once `config.profile_cache_ttl_seconds` pass.
+
+    A failed refresh falls back to the cached copy, if there is one.
+    """
+    with _remote_profiles_lock:
+        entry = _remote_profiles.get(url)
+    if (
+        entry
+        and time.monotonic() - entry["checked_at"] < config.profile_cache_ttl_seconds
+    ):
+        return entry["data"]
+
+    headers = {"If-None-Match": entry["etag"]} if entry and entry["etag"] else {}
+    try:
+        resp = requests.get(url, headers=headers, timeout=10)
+        if resp.status_code == 304 and entry:
+            data, etag = entry["data"], entry["etag"]
+        else:
+            resp.raise_for_status()
+            data, etag = json.loads(resp.text), resp.headers.get("ETag")
+    except (requests.RequestException, ValueError) as e:
+        if entry is None:
+            raise
+        logging.warning(f"Refreshing profile {url} failed, using cached copy: {e}")
+        data, etag = entry["data"], entry["etag"]
+
+    with _remote_profiles_lock:
+        _remote_profiles[url] = {
+            "etag": etag,
+            "data": data,
+            "checked_at": time.monotonic(),
+        }
+    return data
+
+
+def load_profile(name: str) -> Dict[str, Any]:
+    """
+    Returns an initial-state profile, preferring the copy bundled in `shared_libraries/profiles`.
+
+    Args:
+        name: the profile's file name e.g., "example_state_pixel.json".
+
+    Returns:
+        The parsed profile JSON. Shared between callers; copy before mutating.
+    """
+    local_path = os.path.join(PROFILES_DIR, name)
+    if os.path.isfile(local_path):
+        return _local_profiles.get_or_compute(
+            local_path, lambda: _read_local_profile(local_path)
+        )
+    return _fetch_remote_profile(os.path.join(PROFILE_PATH, name))
+
 
 def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
     """
@@ -45,75 +120,89 @@ def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
     """
     if setup_config.state_init not in target:
         target[setup_config.state_init] = True
-        target["gcs_folder"] = pd.Timestamp.utcnow().strftime("%Y_%m_%d_%H_%M")
+        target["gcs_folder"] = datetime.datetime.now(datetime.timezone.utc).strftime(
+            "%Y_%m_%d_%H_%M"
+        )
 
         target.update(source)
 
 
-def _load_session_state(callback_context: CallbackContext):
+@traced_callback
+async def _load_session_state(callback_context: CallbackContext):
     """
     Sets up the initial state.
     Set this as a callback as before_agent_call of the `root_agent`.
     This gets called before the system instruction is constructed.
 
+    Does nothing once the session's state is initialized, so only a session's first turn loads a profile.
+
     Args:
         callback_context: The callback context.
     """
-    data = {}
-    if FULL_JSON_PATH:
-        resp = requests.get(FULL_JSON_PATH)
-        data = json.loads(resp.text)
+    if setup_config.state_init in callback_context.state:
+        return
+
+    if SESSION_STATE_JSON_PATH:
+        data = await asyncio.to_thread(load_profile, SESSION_STATE_JSON_PATH)
         logging.info(f"\n\nLoading Initial State: {data}\n\n")
     else:
         data = setup_config.empty_session_state
         logging.info(f"\n\nLoading Initial State (empty): {data}\n\n")
 
-    _set_initial_states(data["state"], callback_context.state)
+    # profiles are shared across sessions; tools append to the lists inside them
+    _set_initial_states(copy.deepcopy(data["state"]), callback_context.state)
 
 
-def rate_limit_callback(
+def _estimate_request_tokens(llm_request: LlmRequest) -> int:
+    # ~4 characters per token; good enough for budgeting before the call is made
+    chars = 0
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+    system_instruction = llm_request.config and llm_request.config.system_instruction
+    if isinstance(system_instruction, str):
+        chars += len(system_instruction)
+    return chars // 4 + 1
+
+
+@traced_callback
+async def rate_limit_callback(
     callback_context: CallbackContext, llm_request: LlmRequest
 ) -> None:
     # pylint: disable=unused-argument
     """Callback function that implements a query rate limit.
 
+    A thin adapter over the shared limiter: waits for room in the request's
+    model budget (`rpm_quota` / `tpm_quota`) without blocking the event loop.
+
     Args:
       callback_context: A CallbackContext object representing the active
               callback context.
       llm_request: A LlmRequest object representing the active LLM request.
     """
-    now = time.time()
-    if "timer_start" not in callback_context.state:
-        callback_context.state["timer_start"] = now
-        callback_context.state["request_count"] = 1
+    model = llm_request.model or callback_context.agent_name
+    tokens = _estimate_request_tokens(llm_request)
+    waited = await get_llm_rate_limiter().acquire(model, tokens=tokens)
+    add_span_attributes(
+        {
+            "gen_ai.request.model": model,
+            "rate_limiter.estimated_tokens": tokens,
+            "rate_limiter.wait_seconds": waited,
+        }
+    )
+    if waited:
         logging.debug(
-            "rate_limit_callback [timestamp: %i, req_count: 1, " "elapsed_secs: 0]",
-            now,
+            "rate_limit_callback [agent: %s, model: %s, waited_secs: %.2f]",
+            callback_context.agent_name,
+            model,
+            waited,
         )
-        return
-
-    request_count = callback_context.state["request_count"] + 1
-    elapsed_secs = now - callback_context.state["timer_start"]
-    logging.debug(
-        "rate_limit_callback [timestamp: %i, request_count: %i," " elapsed_secs: %i]",
-        now,
-        request_count,
-        elapsed_secs,
-    )
-
-    if request_count > config.rpm_quota:
-        delay = config.rate_limit_seconds - elapsed_secs + 1
-        if delay > 0:
-            logging.debug("Sleeping for %i seconds", delay)
-            time.sleep(delay)
-        callback_context.state["timer_start"] = now
-        callback_context.state["request_count"] = 1
-    else:
-        callback_context.state["request_count"] = request_count
 
     return
 
 
+@traced_callback
 def campaign_callback_function(
     callback_context: CallbackContext,
 ) -> Optional[types.Content]:
@@ -234,23 +323,88 @@ def campaign_callback_function(
         return None
 
 
+def _add_supported_claim(source: Dict[str, Any], text_segment: str, confidence: float):
+    # one claim per text segment, keeping its highest confidence
+    confidence = round(confidence, 3)
+    for claim in source["supported_claims"]:
+        if claim["text_segment"] == text_segment:
+            claim["confidence"] = max(claim["confidence"], confidence)
+            return
+    source["supported_claims"].append(
+        {
+            "text_segment": text_segment,
+            "confidence": confidence,
+        }
+    )
+
+
+def _compact_sources(sources: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bounds the size of the `sources` state.
+
+    Keeps each source's `config.sources_max_claims` most confident claims, then drops the
+    least confident claims overall until the JSON payload fits `config.sources_state_max_kb`.
+    Sources themselves are never dropped, so every issued `src-N` id stays citable.
+
+    Args:
+        sources: source info keyed by short id; modified in place.
+
+    Returns:
+        The compacted `sources`.
+    """
+    for source in sources.values():
+        source["supported_claims"].sort(key=lambda c: c["confidence"], reverse=True)
+        del source["supported_claims"][config.sources_max_claims :]
+
+    budget = config.sources_state_max_kb * 1024
+    size = len(json.dumps(sources))
+    if size <= budget:
+        return sources
+    ranked = sorted(
+        (claim["confidence"], short_id)
+        for short_id, source in sources.items()
+        for claim in source["supported_claims"]
+    )
+    for _, short_id in ranked:
+        if size <= budget:
+            break
+        # claims are sorted most confident first, so the last is this source's weakest
+        claim = sources[short_id]["supported_claims"].pop()
+        size -= len(json.dumps(claim)) + 2
+    return sources
+
+
+@traced_callback
 def collect_research_sources_callback(callback_context: CallbackContext) -> None:
     """Collects and organizes web-based research sources and their supported claims from agent events.
 
     This function processes the agent's `session.events` to extract web source details (URLs,
     titles, domains from `grounding_chunks`) and associated text segments with confidence scores
-    (from `grounding_supports`). The aggregated source information and a mapping of URLs to short
-    IDs are cumulatively stored in `callback_context.state`.
+    (from `grounding_supports`). The aggregated source information is cumulatively stored in the
+    'sources' state key, keyed by short ID; each URL is stored once, and its short ID is looked up
+    from there. Claim counts and the overall size are bounded by `_compact_sources`.
+
+    Only events added since the previous call are processed: a cursor of the form
+    `{"session_id": ..., "index": ...}` is kept in the 'sources_event_cursor' state key. The
+    cursor restarts when the session changes e.g., inside an `AgentTool`, which runs its agent
+    in a new session. Claims are de-duplicated per source by text segment.
 
     Args:
         callback_context (CallbackContext): The context object providing access to the agent's
             session events and persistent state.
     """
     session = callback_context._invocation_context.session
-    url_to_short_id = callback_context.state.get("url_to_short_id", {})
     sources = callback_context.state.get("sources", {})
-    id_counter = len(url_to_short_id) + 1
-    for event in session.events:
+    url_to_short_id = {source["url"]: short_id for short_id, source in sources.items()}
+    id_counter = len(sources) + 1
+
+    cursor = callback_context.state.get("sources_event_cursor") or {}
+    start = cursor.get("index", 0) if cursor.get("session_id") == session.id else 0
+    if start > len(session.events):
+        # events were truncated e.g., by compaction; rescan what is left
+        start = 0
+
+    for event in session.events[start:]:
         if not (event.grounding_metadata and event.grounding_metadata.grounding_chunks):
             continue
         chunks_info = {}
@@ -267,7 +421,6 @@ def collect_research_sources_callback(callback_context: CallbackContext) -> None
                 short_id = f"src-{id_counter}"
                 url_to_short_id[url] = short_id
                 sources[short_id] = {
-                    "short_id": short_id,
                     "title": title,
                     "url": url,
                     "domain": chunk.web.domain,
@@ -286,16 +439,23 @@ def collect_research_sources_callback(callback_context: CallbackContext) -> None
                             confidence_scores[i] if i < len(confidence_scores) else 0.5
                         )
                         text_segment = support.segment.text if support.segment else ""
-                        sources[short_id]["supported_claims"].append(
-                            {
-                                "text_segment": text_segment,
-                                "confidence": confidence,
-                            }
+                        _add_supported_claim(
+                            sources[short_id], text_segment, confidence
                         )
-    callback_context.state["url_to_short_id"] = url_to_short_id
-    callback_context.state["sources"] = sources
+    callback_context.state["sources"] = _compact_sources(sources)
+    add_span_attributes(
+        {
+            "research.events_scanned": len(session.events) - start,
+            "research.sources": len(sources),
+        }
+    )
+    callback_context.state["sources_event_cursor"] = {
+        "session_id": session.id,
+        "index": len(session.events),
+    }
 
 
+@traced_callback
 def citation_replacement_callback(
     callback_context: CallbackContext,
 ) -> Optional[types.Content]:
@@ -335,6 +495,7 @@ def citation_replacement_callback(
 
 
 # TODO: add logic for processing PDF contents for session state
+@traced_callback
 async def before_agent_get_user_file(
     callback_context: CallbackContext,
 ) -> Optional[types.Content]:
@@ -0,0 +1,193 @@
+"""Process-wide registry of lazily constructed clients.
+
+Nothing in this module talks to the network at import time. Each client is
+built on first use, then shared by every tool module in the process.
+"""
+
+import os
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+logging.basicConfig(level=logging.INFO)
+
+
+# re-entrant so a factory can depend on another registered client
+_lock = threading.RLock()
+_factories: dict[str, Callable[[], Any]] = {}
+_instances: dict[str, Any] = {}
+
+
+def register(name: str, factory: Callable[[], Any]) -> None:
+    """
+    Registers a zero-argument factory for a named client.
+
+    Args:
+        name (str): The registry key e.g., "youtube".
+        factory (Callable): Builds the client. Called at most once per process.
+    """
+    with _lock:
+        _factories[name] = factory
+
+
+def get(name: str) -> Any:
+    """
+    Returns the shared client for `name`, building it on first use.
+
+    Args:
+        name (str): The registry key of the client.
+
+    Returns:
+        The shared client instance.
+    """
+    if name in _instances:
+        return _instances[name]
+
+    with _lock:
+        # another thread may have won the race while we waited on the lock
+        if name in _instances:
+            instance = _instances[name]
+        else:
+            try:
+                factory = _factories[name]
+            except KeyError:
+                raise KeyError(f"No client factory registered for '{name}'")
+            logging.info(f"Initializing shared `{name}` client")
+            instance = factory()
+            _instances[name] = instance
+    return instance
+
+
+def override(name: str, instance: Any) -> None:
+    """
+    Replaces the shared client for `name` e.g., with a local fake in tests.
+
+    Args:
+        name (str): The registry key of the client.
+        instance: The object to hand out instead of the real client.
+    """
+    with _lock:
+        _instances[name] = instance
+
+
+def reset(name: Optional[str] = None) -> None:
+    """
+    Drops cached client(s) so the next `get` rebuilds them.
+
+    Args:
+        name (Optional[str]): The registry key to drop. Drops all clients if None.
+    """
+    with _lock:
+        if name is None:
+            _instances.clear()
+        else:
+            _instances.pop(name, None)
+
+
+# ========================
+# factories
+# ========================
+def _youtube_api_key() -> str:
+    from .secrets import access_secret_version
+
+    try:
+        yt_secret_id = os.environ["YT_SECRET_MNGR_NAME"]
+    except KeyError:
+        raise Exception("YT_SECRET_MNGR_NAME environment variable not set")
+
+    return access_secret_version(secret_id=yt_secret_id, version_id="1")
+
+
+def _build_youtube_client():
+    import googleapiclient.discovery
+    from .youtube_quota import QuotaTrackedYouTube
+
+    return QuotaTrackedYouTube(
+        googleapiclient.discovery.build(
+            serviceName="youtube",
+            version="v3",
+            developerKey=_youtube_api_key(),
+            cache_discovery=False,
+        )
+    )
+
+
+def _build_async_youtube_client():
+    from .config import config
+    from .youtube_async import AsyncYouTubeClient
+
+    # the API key is looked up on the first request, off the event loop
+    return AsyncYouTubeClient(
+        api_key=_youtube_api_key,
+        timeout_seconds=config.yt_http_timeout_seconds,
+        pool_size=config.yt_http_pool_size,
+    )
+
+
+def _build_bq_client():
+    from google.cloud import bigquery
+
+    return bigquery.Client(project=os.environ["GOOGLE_CLOUD_PROJECT"])
+
+
+def _build_genai_client():
+    from google.genai import Client
+    from .retry import BackoffClient
+
+    return BackoffClient(Client())
+
+
+def _build_storage_client():
+    import google.auth
+    from google.cloud import storage
+    from requests.adapters import HTTPAdapter
+    from google.auth.transport.requests import AuthorizedSession
+    from .config import config
+
+    credentials, _ = google.auth.default(scopes=storage.Client.SCOPE)
+    # one keep-alive pool sized for concurrent uploads/downloads; requests' default keeps only 10
+    session = AuthorizedSession(credentials)
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=config.gcs_http_pool_hosts,
+            pool_maxsize=config.gcs_http_pool_size,
+        ),
+    )
+    return storage.Client(
+        project=os.environ.get("GOOGLE_CLOUD_PROJECT"),
+        credentials=credentials,
+        _http=session,
+    )
+
+
+register("youtube", _build_youtube_client)
+register("youtube_async", _build_async_youtube_client)
+register("bigquery", _build_bq_client)
+register("genai", _build_genai_client)
+register("storage", _build_storage_client)
+
+
+def get_youtube_client():
+    """Returns the shared YouTube Data API client; its requests are charged to the daily quota ledger."""
+    return get("youtube")
+
+
+def get_async_youtube_client():
+    """Returns the shared async YouTube Data API client for `search.list` and `videos.list`."""
+    return get("youtube_async")
+
+
+def get_bq_client():
+    """Returns the shared BigQuery client."""
+    return get("bigquery")
+
+
+def get_genai_client():
+    """Returns the shared `google.genai` client; its model calls retry on quota errors."""
+    return get("genai")
+
+
+def get_storage_client():
+    """Returns the shared Cloud Storage client; its HTTP session pools connections across threads."""
+    return get("storage")
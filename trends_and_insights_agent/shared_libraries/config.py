@@ -1,3 +1,5 @@
+import os
+import tempfile
 from dataclasses import dataclass
 
 
@@ -14,7 +16,63 @@ class ResearchConfiguration:
         max_results_yt_trends (int): The value to set for `max_results` with the YouTube API
                                 i.e., the number of video results to return.
         rate_limit_seconds (int): total duration to calculate the rate at which the agent queries the LLM API.
-        rpm_quota (int): requests per minute threshold for agent LLM API rate limiter
+        rpm_quota (int): requests per minute threshold for agent LLM API rate limiter.
+                                Shared by all sessions using the same `rate_limit_backend` and applied per model.
+        tpm_quota (int): tokens per `rate_limit_seconds` threshold, per model (estimated from the request). 0 disables it.
+        rate_limit_backend (str): where the rate limiter keeps its accounting. One of "local" (this process),
+                                "sqlite" (every process on the host), or "redis" (every instance).
+        rate_limit_sqlite_path (str): SQLite file used by the "sqlite" backend.
+        rate_limit_redis_url (str): server used by the "redis" backend. Reads `RATE_LIMIT_REDIS_URL` if set.
+        genai_max_attempts (int): attempts (including the first) for `google.genai` model calls
+                                that fail with 429 / RESOURCE_EXHAUSTED or 503 / UNAVAILABLE.
+        genai_retry_initial_seconds (float): base of the exponential backoff between attempts.
+        genai_retry_max_seconds (float): cap on any single wait between attempts.
+        video_gen_timeout_seconds (int): how long `generate_video` waits for a render before giving up.
+        video_poll_initial_seconds (float): first interval between video operation polls; grows 1.5x per poll.
+        video_poll_max_seconds (float): longest interval between video operation polls.
+        image_gen_concurrency (int): images `generate_selected_visuals` renders at once.
+        video_gen_concurrency (int): videos `generate_selected_visuals` renders at once.
+        gtrends_cache_ttl_seconds (int): how long Google Search Trends results are reused before
+                                checking the BigQuery table for a new refresh.
+        yt_trends_cache_ttl_seconds (int): how long a YouTube trending chart is reused before
+                                revalidating it with its ETag.
+        yt_trends_refresh_seconds (int): interval of the background revalidation of `yt_trends_regions`. 0 disables it.
+                                The loop starts with the first trend tool call, not at import.
+        yt_trends_refresh_idle_seconds (int): the background revalidation stops after this long without
+                                a trend tool call, and starts again with the next one.
+        yt_trends_regions (tuple): region codes whose trending charts are kept warm.
+        yt_max_workers (int): YouTube Data API requests a tool makes at once.
+        yt_http_timeout_seconds (float): total timeout of one request of the async YouTube client.
+        yt_http_pool_size (int): keep-alive connections the async YouTube client holds.
+        yt_daily_quota_units (int): the project's daily YouTube Data API quota, in units.
+        yt_quota_reserve_units (int): units searches (100 units each) may not dip into, kept for
+                                the 1-unit `list` calls of the trend tools.
+        yt_quota_low_fraction (float): share of the daily quota remaining below which trending charts
+                                are served from cache and searches return fewer results.
+        video_analysis_cache_backend (str): where `analyze_youtube_videos` results are cached.
+                                One of "sqlite" (local file), "gcs" (objects in the `BUCKET`), or "none".
+        video_analysis_cache_path (str): SQLite file used by the "sqlite" backend.
+        video_analysis_cache_max_mb (int): size budget of the "sqlite" backend; least recently used results are evicted.
+        video_analysis_cache_gcs_prefix (str): object prefix used by the "gcs" backend.
+        gcs_http_pool_size (int): keep-alive connections the shared storage client holds per host.
+        gcs_http_pool_hosts (int): hosts the shared storage client keeps connection pools for.
+        report_download_workers (int): creatives the final report downloads at once.
+        video_thumbnail_range_kb (int): leading bytes of a video read to extract its report thumbnail
+                                when no thumbnail was stored at creation time.
+        video_artifact_storage (str): how generated videos are saved as artifacts. One of "reference"
+                                (a `file_data` URI of the GCS object), "inline" (the video's bytes), or "auto"
+                                ("inline" for `GcsArtifactService`, which only stores inline data, else "reference").
+        sources_max_claims (int): supported claims kept per research source, most confident first.
+        sources_state_max_kb (int): size budget of the 'sources' state; the least confident claims are dropped to fit.
+        profile_cache_ttl_seconds (int): how long a remote initial-state profile is used before
+                                revalidating it with its ETag. Bundled profiles are read once per process.
+        scratch_root (str): parent of the per-invocation scratch directories. Empty picks tmpfs
+                                (`/dev/shm`) when it has `scratch_tmpfs_min_free_mb` free, else the system temp dir.
+        scratch_tmpfs_min_free_mb (int): free space `/dev/shm` needs before it is used for scratch files.
+        trace_exporter (str): where OpenTelemetry spans are exported. One of "jsonl" (`trace_jsonl_path`),
+                                "otlp" (collector in `OTEL_EXPORTER_OTLP_ENDPOINT`), "console", or "" (off).
+                                Reads `TRACE_EXPORTER` if set.
+        trace_jsonl_path (str): file the "jsonl" exporter appends spans to. Reads `TRACE_JSONL_PATH` if set.
 
     """
 
@@ -34,6 +92,80 @@ class ResearchConfiguration:
     # Adjust these values to limit the rate at which the agent queries the LLM API.
     rate_limit_seconds: int = 60
     rpm_quota: int = 1000
+    tpm_quota: int = 0
+    rate_limit_backend: str = "local"  # "local" | "sqlite" | "redis"
+    rate_limit_sqlite_path: str = os.path.join(
+        tempfile.gettempdir(), "trends_and_insights_agent", "rate_limit.sqlite3"
+    )
+    rate_limit_redis_url: str = os.getenv(
+        "RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"
+    )
+
+    # Backoff for tool-level genai calls (image, video, and video analysis models).
+    genai_max_attempts: int = 5
+    genai_retry_initial_seconds: float = 2.0
+    genai_retry_max_seconds: float = 60.0
+
+    # Polling of long-running video generation operations.
+    video_gen_timeout_seconds: int = 600
+    video_poll_initial_seconds: float = 5.0
+    video_poll_max_seconds: float = 20.0
+
+    # Concurrent renders per model when generating all selected visual concepts.
+    image_gen_concurrency: int = 4
+    video_gen_concurrency: int = 2
+
+    # The public Google Trends table refreshes daily; results are cached per refresh date.
+    gtrends_cache_ttl_seconds: int = 3600
+
+    # YouTube trending charts are cached per (region, max_results, parts) and revalidated with ETags.
+    yt_trends_cache_ttl_seconds: int = 900
+    yt_trends_refresh_seconds: int = 600
+    yt_trends_refresh_idle_seconds: int = 3600
+    yt_trends_regions: tuple[str, ...] = ("US",)
+    yt_max_workers: int = 8
+    yt_http_timeout_seconds: float = 30.0
+    yt_http_pool_size: int = 16
+
+    # YouTube Data API quota; resets at midnight Pacific Time.
+    yt_daily_quota_units: int = 10000
+    yt_quota_reserve_units: int = 500
+    yt_quota_low_fraction: float = 0.2
+
+    # Video analysis results are reused across sessions for the same (url, prompt, model, temperature).
+    video_analysis_cache_backend: str = "sqlite"  # "sqlite" | "gcs" | "none"
+    video_analysis_cache_path: str = os.path.join(
+        tempfile.gettempdir(), "trends_and_insights_agent", "video_analysis.sqlite3"
+    )
+    video_analysis_cache_max_mb: int = 256
+    video_analysis_cache_gcs_prefix: str = "cache/video_analysis"
+
+    # Connection pool of the shared Cloud Storage client.
+    gcs_http_pool_size: int = 32
+    gcs_http_pool_hosts: int = 4
+    report_download_workers: int = 8
+    video_thumbnail_range_kb: int = 1024
+    video_artifact_storage: str = "auto"  # "auto" | "reference" | "inline"
+
+    # Bounds on the research `sources` state, which is persisted with every state write.
+    sources_max_claims: int = 5
+    sources_state_max_kb: int = 64
+
+    # Initial-state profiles (`SESSION_STATE_JSON_PATH`) not bundled in `shared_libraries/profiles`.
+    profile_cache_ttl_seconds: int = 300
+
+    # Local files tools need (downloaded creatives, extracted frames) live in per-invocation scratch dirs.
+    scratch_root: str = os.getenv("SCRATCH_ROOT", "")
+    scratch_tmpfs_min_free_mb: int = 512
+
+    # Spans for agents, tools, callbacks and backend calls; see `tracing.py`.
+    trace_exporter: str = os.getenv("TRACE_EXPORTER", "")  # "jsonl" | "otlp" | "console"
+    trace_jsonl_path: str = os.getenv(
+        "TRACE_JSONL_PATH",
+        os.path.join(
+            tempfile.gettempdir(), "trends_and_insights_agent", "traces.jsonl"
+        ),
+    )
 
 
 config = ResearchConfiguration()
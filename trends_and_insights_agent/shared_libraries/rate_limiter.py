@@ -0,0 +1,338 @@
+"""Shared request and token rate limiting for LLM API calls.
+
+The limiter enforces per-model requests-per-window and tokens-per-window
+budgets. Accounting lives in a pluggable backend:
+    *   "local": process memory; shared by every session in the process.
+    *   "sqlite": a SQLite file; shared by every process on one host.
+    *   "redis": a Redis(-compatible) server; shared by every instance.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO)
+
+from . import clients
+from .config import config
+
+
+@dataclass
+class Budget:
+    """A quota to draw from: at most `limit` units of `key` per window; this call costs `cost`."""
+
+    key: str
+    limit: int
+    cost: int = 1
+
+
+class QuotaBackend(ABC):
+    """Stores sliding-window usage; `reserve` must be atomic across all callers sharing the backend."""
+
+    # whether `reserve` does I/O and should run off the event loop
+    blocking_io: bool = True
+
+    @abstractmethod
+    def reserve(self, budgets: list[Budget], window_seconds: float) -> float:
+        """
+        Records every budget's cost if all of them have room in the window, otherwise none.
+
+        A single call larger than its limit is let through once the window is empty.
+
+        Args:
+            budgets (list[Budget]): the quotas to draw from.
+            window_seconds (float): length of the sliding window.
+
+        Returns:
+            float: 0 if reserved, otherwise the seconds to wait before retrying.
+        """
+
+
+class LocalQuotaBackend(QuotaBackend):
+    """In-memory usage, shared by every session in this process."""
+
+    blocking_io = False
+
+    def __init__(self):
+        self._events: dict[str, deque[tuple[float, int]]] = {}
+        # a thread lock (not asyncio.Lock) so one backend can serve several event loops
+        self._lock = threading.Lock()
+
+    def reserve(self, budgets: list[Budget], window_seconds: float) -> float:
+        now = time.monotonic()
+        wait = 0.0
+        with self._lock:
+            for budget in budgets:
+                events = self._events.setdefault(budget.key, deque())
+                while events and events[0][0] <= now - window_seconds:
+                    events.popleft()
+                used = sum(cost for _, cost in events)
+                if used and used + budget.cost > budget.limit:
+                    wait = max(wait, events[0][0] + window_seconds - now)
+            if wait > 0:
+                return wait
+            for budget in budgets:
+                self._events[budget.key].append((now, budget.cost))
+        return 0.0
+
+
+class SQLiteQuotaBackend(QuotaBackend):
+    """Usage in a SQLite file, shared by every process on the host (and handy in tests).
+
+    Args:
+        path (str): location of the database file; parent directories are created.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS quota_events (
+                    key TEXT NOT NULL,
+                    ts REAL NOT NULL,
+                    cost INTEGER NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS quota_events_key_ts ON quota_events(key, ts)"
+            )
+
+    def reserve(self, budgets: list[Budget], window_seconds: float) -> float:
+        with self._lock:
+            # take the database write lock up front so the check-and-record is atomic across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                wait = 0.0
+                for budget in budgets:
+                    self._conn.execute(
+                        "DELETE FROM quota_events WHERE key = ? AND ts <= ?",
+                        (budget.key, now - window_seconds),
+                    )
+                    used, oldest = self._conn.execute(
+                        "SELECT COALESCE(SUM(cost), 0), MIN(ts) FROM quota_events WHERE key = ?",
+                        (budget.key,),
+                    ).fetchone()
+                    if used and used + budget.cost > budget.limit:
+                        wait = max(wait, oldest + window_seconds - now)
+                if wait <= 0:
+                    self._conn.executemany(
+                        "INSERT INTO quota_events (key, ts, cost) VALUES (?, ?, ?)",
+                        [(budget.key, now, budget.cost) for budget in budgets],
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return max(wait, 0.0)
+
+
+# Sorted set per budget; members are "<id>:<cost>" scored by server time in ms.
+_REDIS_RESERVE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[1])
+local wait = 0
+for i, key in ipairs(KEYS) do
+  local limit = tonumber(ARGV[2 * i])
+  local cost = tonumber(ARGV[2 * i + 1])
+  redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+  local entries = redis.call('ZRANGE', key, 0, -1, 'WITHSCORES')
+  local used = 0
+  for j = 1, #entries, 2 do
+    used = used + tonumber(string.match(entries[j], ':(%d+)$'))
+  end
+  if used > 0 and used + cost > limit then
+    wait = math.max(wait, tonumber(entries[2]) + window - now)
+  end
+end
+if wait > 0 then
+  return wait
+end
+local id = ARGV[2 * #KEYS + 2]
+for i, key in ipairs(KEYS) do
+  redis.call('ZADD', key, now, id .. ':' .. ARGV[2 * i + 1])
+  redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
+
+class RedisQuotaBackend(QuotaBackend):
+    """Usage in Redis (or a compatible server e.g., Memorystore), shared by every instance.
+
+    Requires the optional `redis` package.
+
+    Args:
+        url (str): connection URL e.g., "redis://10.0.0.3:6379/0".
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError(
+                "The 'redis' rate limit backend requires the `redis` package: pip install redis"
+            )
+        self._redis = redis.Redis.from_url(url, socket_timeout=5)
+        self._reserve = self._redis.register_script(_REDIS_RESERVE_SCRIPT)
+
+    def reserve(self, budgets: list[Budget], window_seconds: float) -> float:
+        args: list = [int(window_seconds * 1000)]
+        for budget in budgets:
+            args += [budget.limit, budget.cost]
+        args.append(uuid.uuid4().hex)
+        wait_ms = self._reserve(keys=[budget.key for budget in budgets], args=args)
+        return int(wait_ms) / 1000
+
+
+class SlidingWindowLimiter:
+    """Allows at most `limit` requests (and optionally `token_limit` tokens) per key within any `window_seconds`.
+
+    `acquire` awaits instead of sleeping, leaving the event loop free for other
+    sessions while a caller waits.
+
+    Args:
+        limit (int): requests allowed per window, per key.
+        window_seconds (float): length of the sliding window.
+        token_limit (Optional[int]): tokens allowed per window, per key. Disabled if falsy.
+        backend (Optional[QuotaBackend]): where usage is recorded. Defaults to process memory.
+        namespace (str): prefix for backend keys, so several apps can share one backend.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: float,
+        token_limit: Optional[int] = None,
+        backend: Optional[QuotaBackend] = None,
+        namespace: str = "",
+    ):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.token_limit = token_limit
+        self.backend = backend or LocalQuotaBackend()
+        self.namespace = namespace
+        # per-key fraction of the configured limits this process admits (AIMD)
+        self._scale: dict[str, float] = {}
+        self._scale_lock = threading.Lock()
+
+    def scale(self, key: str) -> float:
+        """Returns the fraction of the configured limits currently admitted for `key`."""
+        return self._scale.get(key, 1.0)
+
+    def decrease(self, key: str, factor: float = 0.5) -> float:
+        """Multiplicatively lowers the admitted rate for `key` e.g., after a 429. Returns the new scale."""
+        with self._scale_lock:
+            floor = 1 / max(self.limit, 1)
+            scale = max(self.scale(key) * factor, floor)
+            self._scale[key] = scale
+        return scale
+
+    def increase(self, key: str, step: float = 0.05) -> float:
+        """Additively raises the admitted rate for `key` back towards the configured limits."""
+        with self._scale_lock:
+            scale = self._scale.get(key)
+            if scale is None:
+                return 1.0
+            scale = min(scale + step, 1.0)
+            if scale >= 1.0:
+                del self._scale[key]
+            else:
+                self._scale[key] = scale
+        return scale
+
+    def _budgets(self, key: str, tokens: int) -> list[Budget]:
+        scale = self.scale(key)
+        # `{key}` is a Redis Cluster hash tag keeping a model's budgets in one slot
+        budgets = [
+            Budget(
+                f"{self.namespace}{{{key}}}:requests", max(int(self.limit * scale), 1)
+            )
+        ]
+        if self.token_limit and tokens:
+            budgets.append(
+                Budget(
+                    f"{self.namespace}{{{key}}}:tokens",
+                    max(int(self.token_limit * scale), 1),
+                    tokens,
+                )
+            )
+        return budgets
+
+    def try_acquire(self, key: str, tokens: int = 0) -> float:
+        """
+        Records a request (and its tokens) for `key` if the window has room.
+
+        Args:
+            key (str): the budget to draw from e.g., a model name.
+            tokens (int): estimated tokens for the request.
+
+        Returns:
+            float: 0 if acquired, otherwise the seconds until there may be room.
+        """
+        return self.backend.reserve(self._budgets(key, tokens), self.window_seconds)
+
+    async def acquire(self, key: str, tokens: int = 0) -> float:
+        """
+        Waits until `key` has room in its window, then records the request.
+
+        Args:
+            key (str): the budget to draw from e.g., a model name.
+            tokens (int): estimated tokens for the request.
+
+        Returns:
+            float: total seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            if self.backend.blocking_io:
+                delay = await asyncio.to_thread(self.try_acquire, key, tokens)
+            else:
+                delay = self.try_acquire(key, tokens)
+            if delay <= 0:
+                return waited
+            logging.debug("rate limiter waiting %.2f seconds for '%s'", delay, key)
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+def _build_quota_backend() -> QuotaBackend:
+    backend = config.rate_limit_backend
+    if backend == "sqlite":
+        return SQLiteQuotaBackend(config.rate_limit_sqlite_path)
+    if backend == "redis":
+        return RedisQuotaBackend(config.rate_limit_redis_url)
+    return LocalQuotaBackend()
+
+
+def _build_llm_rate_limiter() -> SlidingWindowLimiter:
+    return SlidingWindowLimiter(
+        limit=config.rpm_quota,
+        window_seconds=config.rate_limit_seconds,
+        token_limit=config.tpm_quota,
+        backend=_build_quota_backend(),
+        namespace="trends_and_insights_agent:llm:",
+    )
+
+
+clients.register("llm_rate_limiter", _build_llm_rate_limiter)
+
+
+def get_llm_rate_limiter() -> SlidingWindowLimiter:
+    """Returns the limiter shared by every agent's `rate_limit_callback`; keyed by model name."""
+    return clients.get("llm_rate_limiter")
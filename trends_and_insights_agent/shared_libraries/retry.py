@@ -0,0 +1,263 @@
+"""Retry with backoff for `google.genai` calls that hit quota (429 / RESOURCE_EXHAUSTED).
+
+`BackoffClient` wraps a `google.genai.Client` so that model calls made through
+`client.models.*` or `client.aio.models.*`:
+    *   retry on 429 / RESOURCE_EXHAUSTED and 503 / UNAVAILABLE with exponential backoff and full jitter,
+    *   honor server retry hints (`Retry-After` header or `google.rpc.RetryInfo`),
+    *   adjust the shared LLM rate limiter per model (AIMD): halve on 429, creep back up on success,
+    *   record a `genai <method>` span with the model, attempts, waits and token usage.
+"""
+
+import time
+import random
+import asyncio
+import logging
+import functools
+import threading
+from typing import Any, Callable, Optional
+
+logging.basicConfig(level=logging.INFO)
+
+from google.genai import errors
+
+from .config import config
+from .rate_limiter import get_llm_rate_limiter
+from .tracing import tracer
+
+
+# model methods that make a single billable request
+_RETRIED_METHODS = {
+    "generate_content",
+    "generate_images",
+    "generate_videos",
+    "edit_image",
+    "upscale_image",
+    "embed_content",
+}
+
+
+class RetryMetrics:
+    """Thread-safe counters for monitoring retry behavior, overall and per model."""
+
+    _FIELDS = ("calls", "retries", "throttled", "unavailable", "gave_up")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: dict[str, dict[str, float]] = {}
+
+    def record(self, model: str, field: str, value: float = 1) -> None:
+        with self._lock:
+            for key in ("_all", model):
+                counts = self._totals.setdefault(
+                    key, {name: 0 for name in self._FIELDS + ("wait_seconds",)}
+                )
+                counts[field] += value
+
+    def snapshot(self) -> dict:
+        """Returns a copy of the counters keyed by model, plus "_all" for the totals."""
+        with self._lock:
+            return {key: dict(counts) for key, counts in self._totals.items()}
+
+
+retry_metrics = RetryMetrics()
+
+
+def get_retry_metrics() -> dict:
+    """Returns the genai retry counters, keyed by model name ("_all" holds the totals)."""
+    return retry_metrics.snapshot()
+
+
+def _classify(e: BaseException) -> Optional[str]:
+    if not isinstance(e, errors.APIError):
+        return None
+    if e.code == 429 or e.status == "RESOURCE_EXHAUSTED":
+        return "throttled"
+    if e.code == 503 or e.status == "UNAVAILABLE":
+        return "unavailable"
+    return None
+
+
+def _parse_duration(value: Any) -> Optional[float]:
+    # "30s", "1.5s" or a bare number of seconds
+    try:
+        return float(str(value).strip().rstrip("s"))
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(e: BaseException) -> Optional[float]:
+    """Returns the server's suggested wait from a `Retry-After` header or a `RetryInfo` detail, if any."""
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        retry_after = headers.get("retry-after")
+        if retry_after is not None and (
+            seconds := _parse_duration(retry_after)
+        ) is not None:
+            return seconds
+
+    details = getattr(e, "details", None)
+    if isinstance(details, dict):
+        for detail in details.get("error", details).get("details", []) or []:
+            if isinstance(detail, dict) and str(detail.get("@type", "")).endswith(
+                "google.rpc.RetryInfo"
+            ):
+                return _parse_duration(detail.get("retryDelay", ""))
+    return None
+
+
+def _backoff_delay(attempt: int, hint: Optional[float]) -> float:
+    if hint is not None:
+        # small jitter keeps callers that got the same hint from retrying in lockstep
+        return min(hint, config.genai_retry_max_seconds) * random.uniform(1.0, 1.1)
+    cap = min(
+        config.genai_retry_max_seconds,
+        config.genai_retry_initial_seconds * 2**attempt,
+    )
+    return random.uniform(0, cap)
+
+
+def _on_error(model: str, attempt: int, e: BaseException) -> Optional[float]:
+    # returns the delay before the next attempt, or None to give up
+    kind = _classify(e)
+    if kind is None:
+        return None
+    retry_metrics.record(model, kind)
+    if kind == "throttled":
+        scale = get_llm_rate_limiter().decrease(model)
+        logging.warning(f"genai 429 for '{model}'; limiter scale now {scale:.2f}")
+    if attempt + 1 >= config.genai_max_attempts:
+        retry_metrics.record(model, "gave_up")
+        return None
+    delay = _backoff_delay(attempt, retry_after_seconds(e))
+    retry_metrics.record(model, "retries")
+    retry_metrics.record(model, "wait_seconds", delay)
+    logging.info(
+        f"Retrying '{model}' in {delay:.1f}s (attempt {attempt + 2}/{config.genai_max_attempts}): {e}"
+    )
+    return delay
+
+
+def _span_name(fn: Callable) -> str:
+    return f"genai {getattr(fn, '__name__', 'call')}"
+
+
+def _record_usage(span, result: Any) -> None:
+    # only `generate_content` responses carry usage; image and video responses don't
+    usage = getattr(result, "usage_metadata", None)
+    if usage is None:
+        return
+    for key, value in (
+        ("gen_ai.usage.input_tokens", usage.prompt_token_count),
+        ("gen_ai.usage.output_tokens", usage.candidates_token_count),
+        ("gen_ai.usage.cached_tokens", usage.cached_content_token_count),
+    ):
+        if value is not None:
+            span.set_attribute(key, value)
+
+
+def call_with_backoff(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Calls a synchronous genai method, retrying throttled requests.
+
+    Prefer `acall_with_backoff` inside async tools: this one sleeps the calling thread.
+    """
+    model = str(kwargs.get("model", "unknown"))
+    attempt = 0
+    backoff_seconds = 0.0
+    with tracer.start_as_current_span(
+        _span_name(fn), attributes={"gen_ai.request.model": model}
+    ) as span:
+        try:
+            while True:
+                retry_metrics.record(model, "calls")
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    delay = _on_error(model, attempt, e)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    backoff_seconds += delay
+                    attempt += 1
+                    continue
+                get_llm_rate_limiter().increase(model)
+                _record_usage(span, result)
+                return result
+        finally:
+            span.set_attribute("genai.attempts", attempt + 1)
+            span.set_attribute("genai.backoff_seconds", backoff_seconds)
+
+
+async def acall_with_backoff(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Awaits an async genai method, retrying throttled requests.
+
+    Each attempt first waits on the shared LLM rate limiter for the call's model.
+    """
+    model = str(kwargs.get("model", "unknown"))
+    attempt = 0
+    backoff_seconds = 0.0
+    limiter_seconds = 0.0
+    with tracer.start_as_current_span(
+        _span_name(fn), attributes={"gen_ai.request.model": model}
+    ) as span:
+        try:
+            while True:
+                limiter_seconds += await get_llm_rate_limiter().acquire(model)
+                retry_metrics.record(model, "calls")
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    delay = _on_error(model, attempt, e)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    backoff_seconds += delay
+                    attempt += 1
+                    continue
+                get_llm_rate_limiter().increase(model)
+                _record_usage(span, result)
+                return result
+        finally:
+            span.set_attribute("genai.attempts", attempt + 1)
+            span.set_attribute("genai.backoff_seconds", backoff_seconds)
+            span.set_attribute("rate_limiter.wait_seconds", limiter_seconds)
+
+
+class _BackoffModels:
+    def __init__(self, models, is_async: bool):
+        self._models = models
+        self._is_async = is_async
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._models, name)
+        if name not in _RETRIED_METHODS:
+            return attr
+        wrapper = acall_with_backoff if self._is_async else call_with_backoff
+        return functools.partial(wrapper, attr)
+
+
+class _BackoffAsyncClient:
+    def __init__(self, aio):
+        self._aio = aio
+        self.models = _BackoffModels(aio.models, is_async=True)
+
+    def __getattr__(self, name: str):
+        return getattr(self._aio, name)
+
+
+class BackoffClient:
+    """Wraps a `google.genai.Client`; model calls retry on quota errors, everything else passes through.
+
+    Args:
+        client: the `google.genai.Client` to wrap.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.models = _BackoffModels(client.models, is_async=False)
+        self.aio = _BackoffAsyncClient(client.aio)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
@@ -0,0 +1,64 @@
+"""Per-invocation scratch directories for tools that need local files.
+
+Each `scratch_dir()` is a fresh, uniquely named directory removed when the
+block exits, so concurrent sessions in one process never share or delete
+each other's files. Scratch lives on tmpfs (`/dev/shm`) when it has room,
+which keeps short-lived media off the container's disk; note tmpfs pages
+count against the process' memory limit.
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+import contextlib
+from typing import Iterator, Optional
+
+logging.basicConfig(level=logging.INFO)
+
+from .config import config
+
+_TMPFS = "/dev/shm"
+_root: Optional[str] = None
+
+
+def _tmpfs_has_room() -> bool:
+    try:
+        stats = os.statvfs(_TMPFS)
+    except (AttributeError, OSError):
+        # no statvfs (Windows) or no /dev/shm
+        return False
+    free_mb = stats.f_bavail * stats.f_frsize / (1024 * 1024)
+    return os.access(_TMPFS, os.W_OK) and free_mb >= config.scratch_tmpfs_min_free_mb
+
+
+def scratch_root() -> str:
+    """Returns (and creates) the directory that holds every scratch directory in this process."""
+    global _root
+    if _root is None:
+        base = config.scratch_root or (
+            _TMPFS if _tmpfs_has_room() else tempfile.gettempdir()
+        )
+        _root = os.path.join(base, "trends_and_insights_agent", "scratch")
+        os.makedirs(_root, exist_ok=True)
+        logging.info(f"Using scratch root: {_root}")
+    return _root
+
+
+@contextlib.contextmanager
+def scratch_dir(prefix: str = "") -> Iterator[str]:
+    """
+    Creates a private scratch directory and removes it, with its contents, on exit.
+
+    Args:
+        prefix (str): readable prefix for the directory name e.g., "report_creatives_".
+
+    Yields:
+        str: absolute path of the scratch directory.
+    """
+    path = tempfile.mkdtemp(prefix=prefix, dir=scratch_root())
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+        logging.info(f"Removed scratch directory '{path}'")
@@ -0,0 +1,215 @@
+"""OpenTelemetry tracing for the package's tools, callbacks and backend calls.
+
+ADK already opens spans for each invocation, agent run (`agent_run [<name>]`),
+model call (`call_llm`, with the model and token counts) and tool execution
+(`execute_tool <name>`). This module adds what ADK can't see:
+    *   `tool <name>` and `callback <name>` spans for the package's functions,
+    *   `genai <method>` spans for tool-level model calls, with model, tokens, attempts and rate-limiter wait,
+    *   `gcs <operation>` spans with the bytes transferred,
+    *   `cache.hit` on tools that consult a cache, and `rate_limiter.wait_seconds` on `rate_limit_callback`.
+
+Nothing is exported unless `config.trace_exporter` is set:
+    *   "jsonl": one JSON object per span, appended to `config.trace_jsonl_path`.
+    *   "otlp": OTLP/HTTP to the collector in `OTEL_EXPORTER_OTLP_ENDPOINT` (default localhost:4318).
+    *   "console": spans printed to stdout.
+"""
+
+import os
+import json
+import inspect
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+logging.basicConfig(level=logging.INFO)
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from .config import config
+
+
+tracer = trace.get_tracer("trends_and_insights_agent")
+
+
+def add_span_attributes(attributes: dict[str, Any]) -> None:
+    """Sets `attributes` on the current span, skipping `None` values. A no-op when tracing is off."""
+    span = trace.get_current_span()
+    for key, value in attributes.items():
+        if value is not None:
+            span.set_attribute(key, value)
+
+
+def _context_attributes(args: tuple, kwargs: dict) -> dict[str, Any]:
+    # ADK passes tools a `tool_context` and callbacks a `callback_context`
+    for value in (*kwargs.values(), *args):
+        if hasattr(value, "agent_name") and hasattr(value, "invocation_id"):
+            return {
+                "agent.name": value.agent_name,
+                "invocation.id": value.invocation_id,
+            }
+    return {}
+
+
+def _traced(kind: str) -> Callable[[Callable], Callable]:
+    def decorator(fn: Callable) -> Callable:
+        span_name = f"{kind} {fn.__name__}"
+
+        # `functools.wraps` keeps the signature and docstring ADK builds the tool declaration from
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(
+                    span_name, attributes=_context_attributes(args, kwargs)
+                ):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(
+                span_name, attributes=_context_attributes(args, kwargs)
+            ):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# e.g., `@traced_tool` above a tool function; async functions stay async
+traced_tool = _traced("tool")
+traced_callback = _traced("callback")
+
+
+@contextmanager
+def gcs_span(operation: str, bucket: str, blob_name: str) -> Iterator[trace.Span]:
+    """
+    Opens a span for one Cloud Storage operation; the caller records `gcs.bytes` on it.
+
+    Args:
+        operation (str): e.g., "upload", "download" or "copy".
+        bucket (str): bucket name, with or without the 'gs://' scheme.
+        blob_name (str): the object's name.
+    """
+    with tracer.start_as_current_span(
+        f"gcs {operation}",
+        attributes={
+            "gcs.bucket": bucket.replace("gs://", ""),
+            "gcs.object": blob_name,
+        },
+    ) as span:
+        yield span
+
+
+# ==============================
+# export
+# ==============================
+def _span_to_dict(span: ReadableSpan) -> dict[str, Any]:
+    parent = span.parent
+    return {
+        "name": span.name,
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(parent.span_id, "016x") if parent else None,
+        "start_time_ns": span.start_time,
+        "end_time_ns": span.end_time,
+        "duration_ms": (span.end_time - span.start_time) / 1e6,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends each finished span to a file as one JSON object per line.
+
+    Args:
+        path (str): the file to append to; parent directories are created.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(
+            json.dumps(_span_to_dict(span), default=str) + "\n" for span in spans
+        )
+        try:
+            with self._lock, open(self.path, "a") as f:
+                f.write(lines)
+        except OSError as e:
+            logging.warning(f"Writing spans to {self.path} failed: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _build_exporter(kind: str) -> SpanExporter:
+    if kind == "jsonl":
+        return JsonlSpanExporter(config.trace_jsonl_path)
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            raise ImportError(
+                "The 'otlp' trace exporter requires `opentelemetry-exporter-otlp-proto-http`: "
+                "pip install opentelemetry-exporter-otlp-proto-http"
+            )
+        return OTLPSpanExporter()
+    raise ValueError(f"Unknown trace exporter: '{kind}'")
+
+
+_setup_lock = threading.Lock()
+_processors: dict[str, BatchSpanProcessor] = {}
+
+
+def setup_tracing(exporter: Optional[str] = None) -> Optional[TracerProvider]:
+    """
+    Exports spans with `exporter`, once per process and exporter.
+
+    Reuses the process's SDK `TracerProvider` if one is installed (e.g., by `adk web --trace_to_cloud`),
+    otherwise installs one.
+
+    Args:
+        exporter (Optional[str]): "jsonl", "otlp" or "console". Defaults to `config.trace_exporter`;
+            empty or "none" disables export.
+
+    Returns:
+        The `TracerProvider` spans are exported from, or None if export is disabled.
+    """
+    kind = config.trace_exporter if exporter is None else exporter
+    if not kind or kind == "none":
+        return None
+
+    with _setup_lock:
+        provider = trace.get_tracer_provider()
+        if not isinstance(provider, TracerProvider):
+            provider = TracerProvider(
+                resource=Resource.create({"service.name": "trends_and_insights_agent"})
+            )
+            trace.set_tracer_provider(provider)
+        if kind not in _processors:
+            processor = BatchSpanProcessor(_build_exporter(kind))
+            provider.add_span_processor(processor)
+            _processors[kind] = processor
+            logging.info(f"Exporting traces with the '{kind}' exporter")
+    return provider
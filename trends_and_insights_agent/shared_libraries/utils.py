@@ -3,7 +3,8 @@ import logging
 
 logging.basicConfig(level=logging.INFO)
 
-from google.cloud import storage
+from .clients import get_storage_client
+from .tracing import gcs_span
 
 
 def download_image_from_gcs(
@@ -20,11 +21,13 @@ def download_image_from_gcs(
     Returns:
         str: Message indicating local path to file
     """
-    storage_client = storage.Client()
+    storage_client = get_storage_client()
     gcs_bucket = gcs_bucket.replace("gs://", "")
     bucket = storage_client.bucket(gcs_bucket)
     blob = bucket.blob(source_blob_name)
-    blob.download_to_filename(destination_file_name)
+    with gcs_span("download", gcs_bucket, source_blob_name) as span:
+        blob.download_to_filename(destination_file_name)
+        span.set_attribute("gcs.bytes", os.path.getsize(destination_file_name))
     return f"Downloaded gcs object {source_blob_name} from {gcs_bucket} to (local) {destination_file_name}."
 
 
@@ -37,7 +40,7 @@ def download_blob(bucket_name, source_blob_name):
     Returns:
         Blob content as bytes.
     """
-    storage_client = storage.Client()
+    storage_client = get_storage_client()
     bucket = storage_client.bucket(bucket_name)
 
     # Construct a client side representation of a blob.
@@ -45,7 +48,10 @@ def download_blob(bucket_name, source_blob_name):
     # any content from Google Cloud Storage. As we don't need additional data,
     # using `Bucket.blob` is preferred here.
     blob = bucket.blob(source_blob_name)
-    return blob.download_as_bytes()
+    with gcs_span("download", bucket_name, source_blob_name) as span:
+        data = blob.download_as_bytes()
+        span.set_attribute("gcs.bytes", len(data))
+    return data
 
 
 def upload_file_to_gcs(
@@ -65,10 +71,12 @@ def upload_file_to_gcs(
         str: The GCS URI of the uploaded file.
     """
     gcs_bucket = gcs_bucket.replace("gs://", "")
-    storage_client = storage.Client()
+    storage_client = get_storage_client()
     bucket = storage_client.bucket(gcs_bucket)
     blob = bucket.blob(os.path.basename(file_path))
-    blob.upload_from_string(file_data, content_type=content_type)
+    with gcs_span("upload", gcs_bucket, blob.name) as span:
+        blob.upload_from_string(file_data, content_type=content_type)
+        span.set_attribute("gcs.bytes", len(file_data))
     return f"gs://{gcs_bucket}/{os.path.basename(file_path)}"
 
 
@@ -89,9 +97,36 @@ def upload_blob_to_gcs(
     # bucket_name = "your-bucket-name" (no 'gs://')
     # source_file_name = "local/path/to/file" (file to upload)
     # destination_blob_name = "folder/paths-to/storage-object-name"
-    storage_client = storage.Client(project=os.environ.get("GOOGLE_CLOUD_PROJECT"))
+    storage_client = get_storage_client()
     gcs_bucket = gcs_bucket.replace("gs://", "")
     bucket = storage_client.bucket(gcs_bucket)
     blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_file_name)
+    with gcs_span("upload", gcs_bucket, destination_blob_name) as span:
+        blob.upload_from_filename(source_file_name)
+        span.set_attribute("gcs.bytes", os.path.getsize(source_file_name))
     return f"File {source_file_name} uploaded to {destination_blob_name}."
+
+
+def upload_bytes_to_gcs(
+    data: bytes,
+    destination_blob_name: str,
+    content_type: str = "application/octet-stream",
+    gcs_bucket: str = os.environ.get("BUCKET", "tmp"),
+) -> str:
+    """
+    Uploads in-memory bytes to a GCS bucket without writing a local file.
+    Args:
+        data (bytes): The object's content.
+        destination_blob_name (str): The desired folder path in gcs e.g., "folder/paths-to/storage-object-name"
+        content_type (str): The object's mime type.
+        gcs_bucket (str): The name of the GCS bucket.
+    Returns:
+        str: The GCS URI of the uploaded object.
+    """
+    gcs_bucket = gcs_bucket.replace("gs://", "")
+    bucket = get_storage_client().bucket(gcs_bucket)
+    blob = bucket.blob(destination_blob_name)
+    with gcs_span("upload", gcs_bucket, destination_blob_name) as span:
+        blob.upload_from_string(data, content_type=content_type)
+        span.set_attribute("gcs.bytes", len(data))
+    return f"gs://{gcs_bucket}/{destination_blob_name}"
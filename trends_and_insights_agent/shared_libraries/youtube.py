@@ -0,0 +1,512 @@
+"""YouTube Data API helpers shared by the trend and research tools.
+
+Most-popular charts change slowly, so `TrendingChartCache` keeps each chart in memory and
+revalidates it with its ETag: an unchanged chart comes back as 304 Not Modified with no payload.
+While the daily quota is low (see `youtube_quota.py`), cached charts are served as they are.
+Async tools revalidate through the `aiohttp` client in `youtube_async.py`; the refresh loop
+and the thread-pool helpers use the shared `googleapiclient` client.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+
+import aiohttp
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+
+from .config import config
+from .clients import get_async_youtube_client, get_youtube_client
+from .tracing import add_span_attributes
+from .youtube_async import YouTubeApiError
+from .youtube_quota import QuotaExceeded, get_youtube_quota
+
+
+TRENDS_PARTS = "snippet,contentDetails"
+
+# httplib2 connections are not thread-safe; each worker thread executes requests on its own
+_thread_local = threading.local()
+
+
+def thread_http():
+    """Returns this thread's `httplib2.Http`, for `request.execute(http=...)` off the event loop."""
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = _thread_local.http = build_http()
+    return http
+
+
+ChartKey = Tuple[str, int, str]
+
+
+class TrendingChartCache:
+    """Most-popular video charts keyed on (region_code, max_results, parts).
+
+    A chart checked less than `ttl_seconds` ago is served from memory. An older one is
+    re-requested with `If-None-Match`; a 304 keeps the cached items. A failed or refused
+    refresh falls back to the cached copy, if there is one, as does any lookup while the
+    daily quota is low.
+
+    Args:
+        ttl_seconds (float): how long a chart is served before it is revalidated.
+        max_workers (int): regions `get_many` requests at once.
+    """
+
+    def __init__(self, ttl_seconds: float, max_workers: int = 8):
+        self.ttl_seconds = ttl_seconds
+        self.max_workers = max_workers
+        # key -> {"etag", "items", "checked_at"}
+        self._entries: Dict[ChartKey, Dict[str, Any]] = {}
+        # one lock per key, so concurrent callers of a stale chart share one request
+        self._key_locks: Dict[ChartKey, threading.Lock] = {}
+        # the async equivalent: one in-flight revalidation per (event loop, key)
+        self._async_revalidations: Dict[
+            Tuple[asyncio.AbstractEventLoop, ChartKey], asyncio.Task
+        ] = {}
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "not_modified": 0, "fetched": 0, "stale": 0}
+        self._stop: Optional[threading.Event] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        # when `get` or `aget` last ran, so an idle refresh loop can stop
+        self._last_lookup = time.monotonic()
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._counts[metric] += 1
+
+    def _key_lock(self, key: ChartKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _fresh_entry(self, key: ChartKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and (
+            time.monotonic() - entry["checked_at"] < self.ttl_seconds
+            # any cached chart is fresh enough while quota is scarce
+            or get_youtube_quota().is_low()
+        ):
+            return entry
+        return None
+
+    def _entry(self, key: ChartKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def _store(self, key: ChartKey, items: List[dict], etag: Optional[str]) -> List[dict]:
+        with self._lock:
+            self._entries[key] = {
+                "etag": etag,
+                "items": items,
+                "checked_at": time.monotonic(),
+            }
+        return items
+
+    def _keep(
+        self,
+        key: ChartKey,
+        entry: Optional[Dict[str, Any]],
+        error: Optional[Exception] = None,
+    ) -> List[dict]:
+        # the chart is unchanged (no `error`), or its refresh failed or was refused
+        if error is None:
+            self._count("not_modified")
+        else:
+            if entry is None:
+                raise error
+            logging.warning(
+                f"Refreshing the {key[0]} trending chart failed, using cached copy: {error}"
+            )
+            self._count("stale")
+        return self._store(key, entry["items"], entry["etag"])
+
+    def _revalidate(self, key: ChartKey) -> List[dict]:
+        region_code, max_results, parts = key
+        entry = self._entry(key)
+
+        request = get_youtube_client().videos().list(
+            part=parts,
+            chart="mostPopular",
+            regionCode=region_code,
+            maxResults=max_results,
+        )
+        if entry and entry["etag"]:
+            request.headers["If-None-Match"] = entry["etag"]
+        try:
+            response = request.execute(http=thread_http())
+        except (HttpError, QuotaExceeded) as e:
+            not_modified = isinstance(e, HttpError) and e.resp.status == 304
+            return self._keep(key, entry, None if not_modified else e)
+        self._count("fetched")
+        return self._store(key, response.get("items", []), response.get("etag"))
+
+    async def _arevalidate(self, key: ChartKey) -> List[dict]:
+        region_code, max_results, parts = key
+        entry = self._entry(key)
+        try:
+            response = await get_async_youtube_client().videos_list(
+                etag=entry["etag"] if entry else None,
+                part=parts,
+                chart="mostPopular",
+                regionCode=region_code,
+                maxResults=max_results,
+            )
+        except (
+            YouTubeApiError,
+            QuotaExceeded,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as e:
+            return self._keep(key, entry, e)
+        if response is None:
+            return self._keep(key, entry)
+        self._count("fetched")
+        return self._store(key, response.get("items", []), response.get("etag"))
+
+    async def _arevalidate_once(self, key: ChartKey) -> List[dict]:
+        # concurrent callers of a stale chart await one shared request
+        flight = (asyncio.get_running_loop(), key)
+        task = self._async_revalidations.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(self._arevalidate(key))
+            self._async_revalidations[flight] = task
+            task.add_done_callback(
+                lambda _: self._async_revalidations.pop(flight, None)
+            )
+        # a cancelled caller does not cancel the request the others wait on
+        return await asyncio.shield(task)
+
+    def get(
+        self,
+        region_code: str,
+        max_results: int = config.max_results_yt_trends,
+        parts: str = TRENDS_PARTS,
+    ) -> List[dict]:
+        """
+        Returns the chart's video resources, requesting it only when the cached copy is stale.
+
+        Args:
+            region_code (str): ISO 3166-1 alpha-2 country code e.g., "US".
+            max_results (int): number of videos in the chart.
+            parts (str): comma-separated `part` parameter of `videos.list`.
+
+        Returns:
+            list: the chart's `items`.
+        """
+        key = (region_code.upper(), max_results, parts)
+        self._last_lookup = time.monotonic()
+        entry = self._fresh_entry(key)
+        if entry is None:
+            with self._key_lock(key):
+                # another thread may have refreshed the chart while we waited
+                entry = self._fresh_entry(key)
+                if entry is None:
+                    add_span_attributes({"cache.hit": False})
+                    return self._revalidate(key)
+        self._count("hits")
+        add_span_attributes({"cache.hit": True})
+        return entry["items"]
+
+    async def aget(
+        self,
+        region_code: str,
+        max_results: int = config.max_results_yt_trends,
+        parts: str = TRENDS_PARTS,
+    ) -> List[dict]:
+        """Like `get`, but a stale chart is revalidated with the async client, without blocking the event loop."""
+        key = (region_code.upper(), max_results, parts)
+        self._last_lookup = time.monotonic()
+        entry = self._fresh_entry(key)
+        add_span_attributes({"cache.hit": entry is not None})
+        if entry is None:
+            return await self._arevalidate_once(key)
+        self._count("hits")
+        return entry["items"]
+
+    async def aget_many(
+        self,
+        region_codes: Iterable[str],
+        max_results: int = config.max_results_yt_trends,
+        parts: str = TRENDS_PARTS,
+    ) -> Dict[str, List[dict]]:
+        """Like `get_many`, with the stale charts revalidated concurrently on the event loop."""
+        regions = list(dict.fromkeys(code.upper() for code in region_codes))
+        charts = await asyncio.gather(
+            *(self.aget(code, max_results, parts) for code in regions)
+        )
+        return dict(zip(regions, charts))
+
+    def get_many(
+        self,
+        region_codes: Iterable[str],
+        max_results: int = config.max_results_yt_trends,
+        parts: str = TRENDS_PARTS,
+    ) -> Dict[str, List[dict]]:
+        """
+        Returns the charts of several regions, requesting the stale ones concurrently.
+
+        Args:
+            region_codes (Iterable[str]): ISO 3166-1 alpha-2 country codes.
+            max_results (int): number of videos in each chart.
+            parts (str): comma-separated `part` parameter of `videos.list`.
+
+        Returns:
+            dict: region code -> the chart's `items`.
+        """
+        regions = list(dict.fromkeys(code.upper() for code in region_codes))
+        if not regions:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(regions))
+        ) as pool:
+            charts = pool.map(lambda code: self.get(code, max_results, parts), regions)
+            return dict(zip(regions, charts))
+
+    def refresh_loop_running(self) -> bool:
+        """Whether a refresh loop started by `start_refresh_loop` is still running."""
+        thread = self._refresh_thread
+        return thread is not None and thread.is_alive() and self._stop is not None
+
+    def refresh(self, keys: Iterable[ChartKey]) -> None:
+        """Revalidates the given charts now, whatever their age. Errors are logged.
+
+        Skipped while the daily quota is low; cached charts are served as they are until it resets.
+        """
+        if get_youtube_quota().is_low():
+            logging.info("YouTube quota is low, skipping the trending chart refresh")
+            return
+        for key in keys:
+            try:
+                with self._key_lock(key):
+                    self._revalidate(key)
+            except Exception as e:
+                logging.warning(f"Refreshing trending chart {key} failed: {e}")
+
+    def start_refresh_loop(
+        self,
+        region_codes: Iterable[str],
+        interval_seconds: float,
+        max_results: int = config.max_results_yt_trends,
+        parts: str = TRENDS_PARTS,
+        idle_seconds: Optional[float] = None,
+    ) -> threading.Thread:
+        """
+        Revalidates the regions' charts every `interval_seconds` on a daemon thread.
+
+        Keep `interval_seconds` below `ttl_seconds` so tool calls for these regions never wait on the API.
+
+        Args:
+            idle_seconds (Optional[float]): the loop stops once no chart was looked up for this long.
+                                None keeps it running until `stop_refresh_loop`.
+
+        Returns:
+            The refresh thread. `stop_refresh_loop` ends it.
+        """
+        keys = [(code.upper(), max_results, parts) for code in region_codes]
+        self.stop_refresh_loop()
+        stop = self._stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval_seconds):
+                if (
+                    idle_seconds is not None
+                    and time.monotonic() - self._last_lookup > idle_seconds
+                ):
+                    logging.info("No trending chart lookups, stopping the refresh loop")
+                    break
+                self.refresh(keys)
+
+        thread = self._refresh_thread = threading.Thread(
+            target=loop, name="yt-trends-refresh", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def stop_refresh_loop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def stats(self) -> dict:
+        """Returns hit, 304, fetch and stale-fallback counters."""
+        with self._lock:
+            return dict(self._counts)
+
+    def clear(self) -> None:
+        """Drops every cached chart."""
+        with self._lock:
+            self._entries.clear()
+
+
+trending_charts = TrendingChartCache(
+    ttl_seconds=config.yt_trends_cache_ttl_seconds,
+    max_workers=config.yt_max_workers,
+)
+
+
+_refresh_start_lock = threading.Lock()
+
+
+def start_trends_refresh() -> Optional[threading.Thread]:
+    """
+    Keeps the charts of `config.yt_trends_regions` warm, unless `config.yt_trends_refresh_seconds` is 0.
+
+    Called by the trend tools on each lookup rather than at import, so processes that never
+    look up a chart (e.g., tests, deployment scripts) spend no quota on it. A running loop is
+    left as it is; one that stopped after `config.yt_trends_refresh_idle_seconds` without
+    lookups is started again.
+
+    Returns:
+        The refresh thread, or None if it was already running or is disabled.
+    """
+    if config.yt_trends_refresh_seconds <= 0 or not config.yt_trends_regions:
+        return None
+    with _refresh_start_lock:
+        if trending_charts.refresh_loop_running():
+            return None
+        return trending_charts.start_refresh_loop(
+            config.yt_trends_regions,
+            config.yt_trends_refresh_seconds,
+            idle_seconds=config.yt_trends_refresh_idle_seconds,
+        )
+
+
+# ==============================
+# batched search
+# ==============================
+# most results `search.list` returns per page, and most ids `videos.list` accepts per request
+MAX_PAGE_SIZE = 50
+VIDEO_DETAIL_PARTS = "snippet,statistics,contentDetails"
+
+
+def search_videos(query: str, max_results: int, **params) -> List[dict]:
+    """
+    Runs one `search.list` query, following `nextPageToken` until `max_results` results.
+
+    Each page costs 100 quota units; while the daily quota is low, the budget shrinks to part of one page.
+
+    Args:
+        query (str): the search query.
+        max_results (int): result budget across pages.
+        **params: other `search.list` parameters e.g., `videoDuration`, `order`.
+
+    Returns:
+        list: the search results, in rank order.
+    """
+    max_results = get_youtube_quota().max_search_results(max_results, MAX_PAGE_SIZE)
+    results: List[dict] = []
+    page_token = None
+    while len(results) < max_results:
+        request = get_youtube_client().search().list(
+            part="id,snippet",
+            q=query,
+            maxResults=min(MAX_PAGE_SIZE, max_results - len(results)),
+            pageToken=page_token,
+            **params,
+        )
+        try:
+            response = request.execute(http=thread_http())
+        except QuotaExceeded:
+            # keep the pages already paid for
+            if not results:
+                raise
+            logging.warning(f"Quota too low for more results of '{query}'")
+            break
+        results.extend(response.get("items", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+    return results[:max_results]
+
+
+def _list_videos(video_ids: List[str], parts: str) -> List[dict]:
+    request = get_youtube_client().videos().list(
+        part=parts, id=",".join(video_ids), maxResults=len(video_ids)
+    )
+    try:
+        return request.execute(http=thread_http()).get("items", [])
+    except Exception as e:
+        # the search snippets are still worth returning
+        logging.warning(f"Fetching details of {len(video_ids)} videos failed: {e}")
+        return []
+
+
+def batch_search_videos(
+    queries: Iterable[str],
+    max_results: int,
+    parts: str = VIDEO_DETAIL_PARTS,
+    **params,
+) -> Tuple[Dict[str, List[dict]], Dict[str, str]]:
+    """
+    Runs many `search.list` queries concurrently, then fetches the found videos' details in
+    `videos.list` requests of up to 50 ids each.
+
+    Args:
+        queries (Iterable[str]): the search queries; duplicates are searched once.
+        max_results (int): result budget per query, across pages.
+        parts (str): `part` parameter of the `videos.list` enrichment.
+        **params: other `search.list` parameters, applied to every query.
+
+    Returns:
+        tuple: query -> its videos as `videos.list` resources in rank order, and
+            query -> error message for the queries that failed. A video missing from the
+            enrichment (e.g., made private since the search) keeps its search snippet.
+    """
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+        return {}, {}
+
+    def search(query: str) -> Tuple[List[dict], Optional[str]]:
+        try:
+            return search_videos(query, max_results, **params), None
+        except Exception as e:
+            logging.warning(f"YouTube search for '{query}' failed: {e}")
+            return [], str(e)
+
+    with ThreadPoolExecutor(
+        max_workers=min(config.yt_max_workers, len(queries))
+    ) as pool:
+        searches = dict(zip(queries, pool.map(search, queries)))
+        video_ids = list(
+            dict.fromkeys(
+                item["id"]["videoId"]
+                for items, _ in searches.values()
+                for item in items
+                if item["id"].get("videoId")
+            )
+        )
+        chunks = [
+            video_ids[i : i + MAX_PAGE_SIZE]
+            for i in range(0, len(video_ids), MAX_PAGE_SIZE)
+        ]
+        details = {
+            video["id"]: video
+            for items in pool.map(lambda chunk: _list_videos(chunk, parts), chunks)
+            for video in items
+        }
+
+    results = {
+        query: [
+            details.get(
+                item["id"]["videoId"],
+                {"id": item["id"]["videoId"], "snippet": item.get("snippet", {})},
+            )
+            for item in items
+            if item["id"].get("videoId")
+        ]
+        for query, (items, _) in searches.items()
+    }
+    errors = {query: error for query, (_, error) in searches.items() if error}
+    add_span_attributes(
+        {
+            "youtube.queries": len(queries),
+            "youtube.videos": len(video_ids),
+            "youtube.requests.videos_list": len(chunks),
+        }
+    )
+    return results, errors
@@ -0,0 +1,172 @@
+"""Async client for the YouTube Data API endpoints the tools use: `search.list` and `videos.list`.
+
+Requests go straight to the REST endpoints over a keep-alive `aiohttp` connection pool, so
+there is no discovery document to load and no event-loop thread blocked on httplib2. Responses
+are the same JSON the `googleapiclient` client returns. Like the shared sync client, every
+request is charged to the daily quota ledger (see `youtube_quota.py`).
+"""
+
+import json
+import atexit
+import asyncio
+import logging
+import weakref
+from typing import Callable, Optional
+
+logging.basicConfig(level=logging.INFO)
+
+import aiohttp
+
+from .youtube_quota import get_youtube_quota
+
+
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+
+# clients with sessions still open, closed at interpreter exit
+_open_clients: "weakref.WeakSet[AsyncYouTubeClient]" = weakref.WeakSet()
+
+
+class YouTubeApiError(Exception):
+    """An error response from the YouTube Data API.
+
+    Args:
+        status (int): the HTTP status.
+        reason (str): the first error's `reason` e.g., "quotaExceeded", if the body has one.
+        message (str): the error message.
+    """
+
+    def __init__(self, status: int, reason: str, message: str):
+        super().__init__(f"YouTube Data API error {status} ({reason}): {message}")
+        self.status = status
+        self.reason = reason
+
+
+def _raise_for_error(status: int, body: dict) -> None:
+    error = body.get("error", {}) if isinstance(body, dict) else {}
+    errors = error.get("errors") or [{}]
+    reason = errors[0].get("reason", "")
+    if status == 403 and reason == "quotaExceeded":
+        logging.warning("YouTube Data API reported the daily quota exceeded")
+        get_youtube_quota().mark_exhausted()
+    raise YouTubeApiError(status, reason, error.get("message", ""))
+
+
+class AsyncYouTubeClient:
+    """Pooled, keep-alive `aiohttp` client for `search.list` and `videos.list`.
+
+    A session is bound to the event loop that created it, so one is opened per running loop.
+
+    Args:
+        api_key (Callable[[], str]): returns the API key; called once, off the event loop.
+        timeout_seconds (float): total timeout of one request, including reading the body.
+        pool_size (int): keep-alive connections held per event loop.
+        base_url (str): the API root.
+    """
+
+    def __init__(
+        self,
+        api_key: Callable[[], str],
+        timeout_seconds: float = 30,
+        pool_size: int = 16,
+        base_url: str = YOUTUBE_API_URL,
+    ):
+        self._api_key_factory = api_key
+        self._api_key: Optional[str] = None
+        self.timeout_seconds = timeout_seconds
+        self.pool_size = pool_size
+        self.base_url = base_url.rstrip("/")
+        self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+    async def _key(self) -> str:
+        if self._api_key is None:
+            # e.g., a Secret Manager lookup
+            self._api_key = await asyncio.to_thread(self._api_key_factory)
+        return self._api_key
+
+    async def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        # close sessions of loops that are gone e.g., one `asyncio.run` per test; their
+        # connectors skip transports of a closed loop, so this never touches that loop
+        for stale in [other for other in self._sessions if other.is_closed()]:
+            await self._sessions.pop(stale).close()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+            )
+            _open_clients.add(self)
+        return session
+
+    async def _get(
+        self, resource: str, params: dict, etag: Optional[str] = None
+    ) -> Optional[dict]:
+        get_youtube_quota().charge(f"{resource}.list")
+        # like `googleapiclient`, parameters set to None are left out
+        query = {key: value for key, value in params.items() if value is not None}
+        query["key"] = await self._key()
+        headers = {"If-None-Match": etag} if etag else {}
+        session = await self._session()
+        async with session.get(
+            f"{self.base_url}/{resource}", params=query, headers=headers
+        ) as resp:
+            if resp.status == 304:
+                return None
+            if resp.status >= 400:
+                # error bodies are not always JSON e.g., an HTML 502 from a proxy
+                text = await resp.text()
+                try:
+                    body = json.loads(text)
+                except ValueError:
+                    body = {"error": {"message": text[:500]}}
+                _raise_for_error(resp.status, body)
+            return await resp.json(content_type=None)
+
+    async def search_list(self, **params) -> dict:
+        """
+        Calls `search.list` (100 quota units).
+
+        Args:
+            **params: the endpoint's parameters e.g., `part`, `q`, `maxResults`, `pageToken`.
+
+        Returns:
+            dict: the response, as returned by `query_youtube_api`.
+        """
+        return await self._get("search", params)
+
+    async def videos_list(self, etag: Optional[str] = None, **params) -> Optional[dict]:
+        """
+        Calls `videos.list` (1 quota unit).
+
+        Args:
+            etag (Optional[str]): the ETag of a previous response, sent as `If-None-Match`.
+            **params: the endpoint's parameters e.g., `part`, `chart`, `regionCode`, `id`.
+
+        Returns:
+            dict: the response, or None if `etag` is still current (304 Not Modified).
+        """
+        return await self._get("videos", params, etag=etag)
+
+    async def close(self) -> None:
+        """Closes the current event loop's session."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def close_all(self) -> None:
+        """Closes the sessions of event loops that are not running, e.g., at interpreter exit."""
+        for loop, session in list(self._sessions.items()):
+            if loop.is_running():
+                continue
+            del self._sessions[loop]
+            if loop.is_closed():
+                # the connector skips a closed loop's transports, so any loop can close it
+                asyncio.run(session.close())
+            else:
+                loop.run_until_complete(session.close())
+
+
+@atexit.register
+def _close_open_clients() -> None:
+    for client in list(_open_clients):
+        client.close_all()
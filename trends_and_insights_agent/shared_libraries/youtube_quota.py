@@ -0,0 +1,225 @@
+"""Daily quota accounting for the YouTube Data API.
+
+Every request made through the shared YouTube client is charged to a `QuotaLedger`
+at its documented unit cost (https://developers.google.com/youtube/v3/determine_quota_cost),
+so tools can see the remaining daily budget and degrade before the API starts failing:
+    *   below `config.yt_quota_low_fraction` of the budget, cached trending charts are served
+        without revalidation and searches return fewer results,
+    *   searches that would dip into `config.yt_quota_reserve_units` are refused, keeping the
+        reserve for the cheap `list` calls behind the trend tools.
+
+The ledger lives in process memory; each process sharing an API key should be given its share
+of the daily budget.
+"""
+
+import logging
+import datetime
+import threading
+from collections import Counter
+from zoneinfo import ZoneInfo
+
+logging.basicConfig(level=logging.INFO)
+
+from googleapiclient.errors import HttpError
+
+from . import clients
+from .config import config
+from .tracing import add_span_attributes
+
+
+# units per request; anything not listed costs 1
+UNIT_COSTS = {
+    "search.list": 100,
+    "videos.list": 1,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+}
+
+# the daily quota resets at midnight Pacific Time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+class QuotaExceeded(Exception):
+    """Raised instead of sending a request the remaining daily quota can't afford."""
+
+
+def _quota_day() -> datetime.date:
+    return datetime.datetime.now(QUOTA_TIMEZONE).date()
+
+
+class QuotaLedger:
+    """Thread-safe record of the units spent today, per endpoint.
+
+    Args:
+        daily_units (int): the project's daily quota.
+        reserve_units (int): units expensive requests may not dip into.
+        low_fraction (float): share of `daily_units` remaining below which the budget is low.
+    """
+
+    def __init__(
+        self, daily_units: int, reserve_units: int = 0, low_fraction: float = 0.0
+    ):
+        self.daily_units = daily_units
+        self.reserve_units = reserve_units
+        self.low_fraction = low_fraction
+        self._lock = threading.Lock()
+        self._day = _quota_day()
+        self._spent: Counter = Counter()
+        self._refused: Counter = Counter()
+        self._exhausted = False
+
+    def _roll_over(self) -> None:
+        # caller holds the lock
+        today = _quota_day()
+        if today != self._day:
+            self._day = today
+            self._spent.clear()
+            self._refused.clear()
+            self._exhausted = False
+
+    def _remaining(self) -> int:
+        # caller holds the lock
+        if self._exhausted:
+            return 0
+        return max(0, self.daily_units - sum(self._spent.values()))
+
+    def remaining(self) -> int:
+        """Returns the units left in today's budget."""
+        with self._lock:
+            self._roll_over()
+            return self._remaining()
+
+    def is_low(self) -> bool:
+        """Whether less than `low_fraction` of the daily budget remains."""
+        return self.remaining() < self.daily_units * self.low_fraction
+
+    def charge(self, endpoint: str) -> None:
+        """
+        Records one request to `endpoint`, or raises if today's budget can't afford it.
+
+        Requests costing more than 1 unit (searches) are refused once they would dip into
+        `reserve_units`; 1-unit requests are refused only when the budget is spent.
+
+        Args:
+            endpoint (str): e.g., "search.list".
+
+        Raises:
+            QuotaExceeded: if the request is refused. Nothing is charged.
+        """
+        cost = UNIT_COSTS.get(endpoint, 1)
+        with self._lock:
+            self._roll_over()
+            floor = self.reserve_units if cost > 1 else 0
+            remaining = self._remaining()
+            if remaining - cost < floor:
+                self._refused[endpoint] += 1
+                raise QuotaExceeded(
+                    f"YouTube Data API quota too low for {endpoint} ({cost} units): "
+                    f"{remaining} of {self.daily_units} units left today"
+                )
+            self._spent[endpoint] += cost
+            remaining -= cost
+        add_span_attributes(
+            {"youtube.quota.cost": cost, "youtube.quota.remaining": remaining}
+        )
+
+    def mark_exhausted(self) -> None:
+        """Zeroes today's budget e.g., after the API reported `quotaExceeded`."""
+        with self._lock:
+            self._roll_over()
+            self._exhausted = True
+
+    def max_search_results(self, requested: int, page_size: int = 50) -> int:
+        """Caps a search's result budget while the daily budget is low: one page, half the results."""
+        if not self.is_low():
+            return requested
+        return max(1, min(requested, page_size) // 2)
+
+    def stats(self) -> dict:
+        """Returns today's spent units per endpoint, refused requests and the remaining budget."""
+        with self._lock:
+            self._roll_over()
+            return {
+                "day": self._day.isoformat(),
+                "daily_units": self.daily_units,
+                "remaining": self._remaining(),
+                "spent": dict(self._spent),
+                "refused": dict(self._refused),
+            }
+
+
+def _is_quota_exceeded(e: HttpError) -> bool:
+    return e.resp.status == 403 and "quotaExceeded" in str(e.content)
+
+
+class _QuotaRequest:
+    def __init__(self, request, endpoint: str):
+        self._request = request
+        self._endpoint = endpoint
+
+    def __getattr__(self, name: str):
+        # e.g., `headers`, `uri`
+        return getattr(self._request, name)
+
+    def execute(self, *args, **kwargs):
+        ledger = get_youtube_quota()
+        ledger.charge(self._endpoint)
+        try:
+            return self._request.execute(*args, **kwargs)
+        except HttpError as e:
+            if _is_quota_exceeded(e):
+                logging.warning("YouTube Data API reported the daily quota exceeded")
+                ledger.mark_exhausted()
+            raise
+
+
+class _QuotaMethods:
+    def __init__(self, resource, name: str):
+        self._resource = resource
+        self._name = name
+
+    def __getattr__(self, method: str):
+        attr = getattr(self._resource, method)
+        if not callable(attr) or method.endswith("_next"):
+            return attr
+
+        def build_request(*args, **kwargs):
+            request = attr(*args, **kwargs)
+            if not hasattr(request, "execute"):
+                return request
+            return _QuotaRequest(request, f"{self._name}.{method}")
+
+        return build_request
+
+
+class QuotaTrackedYouTube:
+    """Wraps a YouTube Data API `Resource`; each executed request is charged to the shared ledger.
+
+    Args:
+        client: the `googleapiclient.discovery.Resource` to wrap.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        return lambda *args, **kwargs: _QuotaMethods(attr(*args, **kwargs), name)
+
+
+def _build_youtube_quota() -> QuotaLedger:
+    return QuotaLedger(
+        daily_units=config.yt_daily_quota_units,
+        reserve_units=config.yt_quota_reserve_units,
+        low_fraction=config.yt_quota_low_fraction,
+    )
+
+
+clients.register("youtube_quota", _build_youtube_quota)
+
+
+def get_youtube_quota() -> QuotaLedger:
+    """Returns the ledger charged by the shared YouTube client."""
+    return clients.get("youtube_quota")
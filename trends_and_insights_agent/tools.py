@@ -1,38 +1,92 @@
 import os
+import asyncio
+import hashlib
 import logging
-import pandas as pd
+import datetime
 from typing import Optional
 
 logging.basicConfig(level=logging.INFO)
 
-import googleapiclient.discovery
-from google.genai import types, Client
+from google.genai import types
 
+from .shared_libraries import clients, youtube
 from .shared_libraries.config import config
-from .shared_libraries.secrets import access_secret_version
+from .shared_libraries.cache import (
+    GCSBackend,
+    ResultCache,
+    SQLiteBackend,
+    make_cache_key,
+)
+from .shared_libraries.clients import (
+    get_async_youtube_client,
+    get_genai_client,
+    get_youtube_client,
+)
+from .shared_libraries.tracing import add_span_attributes, traced_tool
+from .shared_libraries.youtube_quota import QuotaExceeded, get_youtube_quota
 
 
-# ========================
-# clients
-# ========================
-try:
-    yt_secret_id = os.environ["YT_SECRET_MNGR_NAME"]
-except KeyError:
-    raise Exception("YT_SECRET_MNGR_NAME environment variable not set")
-
-# youtube client
-YOUTUBE_DATA_API_KEY = access_secret_version(secret_id=yt_secret_id, version_id="1")
-youtube_client = googleapiclient.discovery.build(
-    serviceName="youtube", version="v3", developerKey=YOUTUBE_DATA_API_KEY
-)
+VIDEO_ANALYSIS_TEMPERATURE = 0.1
 
-# google genai client
-client = Client()
+
+def _build_video_analysis_cache() -> Optional[ResultCache]:
+    backend = config.video_analysis_cache_backend
+    if backend == "sqlite":
+        return ResultCache(
+            SQLiteBackend(
+                path=config.video_analysis_cache_path,
+                max_bytes=config.video_analysis_cache_max_mb * 1024 * 1024,
+            ),
+            name="video_analysis",
+        )
+    if backend == "gcs":
+        return ResultCache(
+            GCSBackend(
+                storage_client=clients.get_storage_client(),
+                gcs_bucket=os.environ["BUCKET"],
+                prefix=config.video_analysis_cache_gcs_prefix,
+            ),
+            name="video_analysis",
+        )
+    return None
+
+
+clients.register("video_analysis_cache", _build_video_analysis_cache)
 
 
 # ========================
 # YouTube tools
 # ========================
+def _search_params(
+    video_duration: str,
+    video_order: str,
+    max_num_days_ago: int,
+    video_caption: str,
+    channel_type: Optional[str],
+    channel_id: Optional[str],
+    event_type: Optional[str],
+) -> dict:
+    # `search.list` filters shared by the single and batched YouTube search tools
+    published_after_timestamp = (
+        (datetime.datetime.now() - datetime.timedelta(days=max_num_days_ago))
+        .replace(tzinfo=datetime.timezone.utc)
+        .isoformat()
+    )
+    return dict(
+        type="video",
+        relevanceLanguage="en",
+        regionCode="US",
+        videoDuration=video_duration,
+        order=video_order,
+        videoCaption=video_caption,
+        channelType=channel_type,
+        channelId=channel_id,
+        eventType=event_type,
+        publishedAfter=published_after_timestamp,
+    )
+
+
+@traced_tool
 def query_youtube_api(
     query: str,
     video_duration: str,
@@ -72,42 +126,150 @@ def query_youtube_api(
             "upcoming" = Only include upcoming broadcasts.
 
     Returns:
-        dict: The response from the YouTube Data API.
+        dict: The response from the YouTube Data API, or an error status if the daily quota can't afford the search.
     """
 
-    published_after_timestamp = (
-        (pd.Timestamp.now() - pd.DateOffset(days=max_num_days_ago))
-        .tz_localize("UTC")
-        .isoformat()
-    )
-
     # Using Search:list - https://developers.google.com/youtube/v3/docs/search/list
-    yt_data_api_request = youtube_client.search().list(
-        type="video",
+    yt_data_api_request = get_youtube_client().search().list(
         part="id,snippet",
-        relevanceLanguage="en",
-        regionCode="US",
         q=query,
-        videoDuration=video_duration,
-        order=video_order,
-        maxResults=num_video_results,
-        videoCaption=video_caption,
-        channelType=channel_type,
-        channelId=channel_id,
-        eventType=event_type,
-        publishedAfter=published_after_timestamp,
+        maxResults=get_youtube_quota().max_search_results(num_video_results),
+        **_search_params(
+            video_duration=video_duration,
+            video_order=video_order,
+            max_num_days_ago=max_num_days_ago,
+            video_caption=video_caption,
+            channel_type=channel_type,
+            channel_id=channel_id,
+            event_type=event_type,
+        ),
     )
-    yt_data_api_response = yt_data_api_request.execute()
+    try:
+        yt_data_api_response = yt_data_api_request.execute()
+    except QuotaExceeded as e:
+        return {"status": "error", "error_message": str(e)}
     return yt_data_api_response
 
 
+@traced_tool
+async def aquery_youtube_api(
+    query: str,
+    video_duration: str,
+    video_order: str = "relevance",
+    num_video_results: int = 5,
+    max_num_days_ago: int = 30,
+    video_caption: str = "closedCaption",
+    channel_type: Optional[str] = "any",
+    channel_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+) -> dict:
+    """
+    Gets a response from the YouTube Data API for a given search query, without blocking other work.
+
+    Args:
+        query (str): The search query.
+        video_duration (str): The duration (minutes) of the videos to search for.
+            Must be one of: 'any', 'long', 'medium', 'short', where short=(-inf, 4),
+            medium=[4, 20], long=(20, inf)
+        video_order (str): The order in which the videos should be returned.
+            Must be one of 'date', 'rating', 'relevance', 'title', 'viewCount'
+        num_video_results (int): The number of video results to return.
+        max_num_days_ago (int): The maximum number of days ago the videos should have been published.
+        video_caption (str): whether API should filter video search results based on whether they have captions.
+            Must be one of "any", "closedCaption", "none"
+        channel_type (Optional[str]): The type of channel to search within.
+            Must be one of "show", "any", or "channelTypeUnspecified".
+        channel_id (Optional[str]): The ID of the channel to search within.
+        event_type (Optional[str]): restricts a search to broadcast events. Must be one of "upcoming", "live", "completed", None
+
+    Returns:
+        dict: The response from the YouTube Data API, or an error status if the daily quota can't afford the search.
+    """
+    try:
+        return await get_async_youtube_client().search_list(
+            part="id,snippet",
+            q=query,
+            maxResults=get_youtube_quota().max_search_results(num_video_results),
+            **_search_params(
+                video_duration=video_duration,
+                video_order=video_order,
+                max_num_days_ago=max_num_days_ago,
+                video_caption=video_caption,
+                channel_type=channel_type,
+                channel_id=channel_id,
+                event_type=event_type,
+            ),
+        )
+    except QuotaExceeded as e:
+        return {"status": "error", "error_message": str(e)}
+
+
+@traced_tool
+async def batch_query_youtube_api(
+    queries: list[str],
+    video_duration: str,
+    video_order: str = "relevance",
+    num_video_results: int = 5,
+    max_num_days_ago: int = 30,
+    video_caption: str = "closedCaption",
+    channel_type: Optional[str] = "any",
+    channel_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+) -> dict:
+    """
+    Searches the YouTube Data API for several queries at once and returns each video's
+    snippet, statistics (e.g., views, likes) and contentDetails (e.g., duration).
+
+    Args:
+        queries (list[str]): The search queries.
+        video_duration (str): The duration (minutes) of the videos to search for.
+            Must be one of: 'any', 'long', 'medium', 'short', where short=(-inf, 4),
+            medium=[4, 20], long=(20, inf)
+        video_order (str): The order in which the videos should be returned.
+            Must be one of 'date', 'rating', 'relevance', 'title', 'viewCount'
+        num_video_results (int): The number of video results to return per query. May exceed 50.
+        max_num_days_ago (int): The maximum number of days ago the videos should have been published.
+        video_caption (str): whether API should filter video search results based on whether they have captions.
+            Must be one of "any", "closedCaption", "none"
+        channel_type (Optional[str]): The type of channel to search within.
+            Must be one of "show", "any", or "channelTypeUnspecified".
+        channel_id (Optional[str]): The ID of the channel to search within.
+        event_type (Optional[str]): restricts a search to broadcast events. Must be one of "upcoming", "live", "completed", None
+
+    Returns:
+        dict: 'results' maps each query to its videos (YouTube Data API video resources) in rank order;
+            'errors' maps the queries that failed to an error message.
+    """
+    # the searches run on a thread pool; wait for it off the event loop
+    results, errors = await asyncio.to_thread(
+        youtube.batch_search_videos,
+        queries,
+        max_results=num_video_results,
+        **_search_params(
+            video_duration=video_duration,
+            video_order=video_order,
+            max_num_days_ago=max_num_days_ago,
+            video_caption=video_caption,
+            channel_type=channel_type,
+            channel_id=channel_id,
+            event_type=event_type,
+        ),
+    )
+    return {
+        "status": "error" if errors and len(errors) == len(results) else "ok",
+        "results": results,
+        "errors": errors,
+    }
+
+
 # region_code: str = "US",
 # region_code (str): selects a video chart available in the specified region.
 #     Values are ISO 3166-1 alpha-2 country codes. For example, the region_code for the United Kingdom would be 'GB',
 #     whereas 'US' would represent The United States.
 
 
-def analyze_youtube_videos(
+@traced_tool
+async def analyze_youtube_videos(
     prompt: str,
     youtube_url: str,
 ) -> Optional[str]:
@@ -124,22 +286,38 @@ def analyze_youtube_videos(
 
     if "youtube.com" not in youtube_url:
         return "Not a valid youtube URL"
-    else:
-        video = types.Part.from_uri(
-            file_uri=youtube_url,
-            mime_type="video/*",
-        )
-        contents = types.Content(
-            role="user",
-            parts=[types.Part.from_text(text=prompt), video],
-        )
-        result = client.models.generate_content(
-            model=config.video_analysis_model,
-            contents=contents,
-            config=types.GenerateContentConfig(
-                temperature=0.1,
-            ),
-        )
-        if result and result.text is not None:
 
-            return result.text
+    cache = clients.get("video_analysis_cache")
+    cache_key = make_cache_key(
+        youtube_url=youtube_url,
+        prompt_sha256=hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        model=config.video_analysis_model,
+        temperature=VIDEO_ANALYSIS_TEMPERATURE,
+    )
+    if cache is not None:
+        # SQLite and GCS lookups block; keep them off the event loop
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        add_span_attributes({"cache.hit": cached is not None})
+        if cached is not None:
+            logging.info(f"video analysis cache hit for {youtube_url}: {cache.stats()}")
+            return cached
+
+    video = types.Part.from_uri(
+        file_uri=youtube_url,
+        mime_type="video/*",
+    )
+    contents = types.Content(
+        role="user",
+        parts=[types.Part.from_text(text=prompt), video],
+    )
+    result = await get_genai_client().aio.models.generate_content(
+        model=config.video_analysis_model,
+        contents=contents,
+        config=types.GenerateContentConfig(
+            temperature=VIDEO_ANALYSIS_TEMPERATURE,
+        ),
+    )
+    if result and result.text is not None:
+        if cache is not None:
+            await asyncio.to_thread(cache.set, cache_key, result.text)
+        return result.text